@@ -0,0 +1,3 @@
+"""
+ee2pw benchmark suite
+"""
@@ -0,0 +1,68 @@
+import argparse, sys
+
+from .suite import DEFAULT_THRESHOLD, compare, load_results, run, save_results
+
+
+def format_time(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:9.2f} us"
+    return f"{seconds * 1e3:9.2f} ms"
+
+
+def main(argv: list[str] | None = None) -> int:
+    argparser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark the ee2pw conversion pipeline.",
+    )
+
+    argparser.add_argument(
+        "-k", "--filter", type=str, help="Only run benchmarks containing this text."
+    )
+    argparser.add_argument(
+        "-o", "--output", type=str, help="Write the results to this JSON file."
+    )
+    argparser.add_argument(
+        "-b",
+        "--baseline",
+        type=str,
+        help="Compare with a baseline JSON file and fail on regressions.",
+    )
+    argparser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown before a benchmark counts as a regression "
+        f"(default: {DEFAULT_THRESHOLD}).",
+    )
+    argparser.add_argument(
+        "-r", "--repeat", type=int, default=5, help="Timing runs per benchmark."
+    )
+
+    args = argparser.parse_args(argv)
+
+    results = run(
+        args.filter,
+        args.repeat,
+        report=lambda name, seconds: print(f"{format_time(seconds)}  {name}"),
+    )
+
+    if args.output:
+        save_results(results, args.output)
+
+    if not args.baseline:
+        return 0
+
+    regressions = compare(results, load_results(args.baseline), args.threshold)
+
+    for name, before, after, ratio in regressions:
+        print(
+            f"REGRESSION {name}: {format_time(before).strip()} -> "
+            f"{format_time(after).strip()} ({ratio:.2f}x)",
+            file=sys.stderr,
+        )
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
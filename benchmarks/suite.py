@@ -0,0 +1,253 @@
+import copy, glob, io, json, os, platform, sys, timeit
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from ee2pw import __version__
+from ee2pw.bass_enhancer import parse_bass_enhancer
+from ee2pw.convert import dump
+from ee2pw.bulk import parse_presets
+from ee2pw.core import build, parse_chain
+from ee2pw.filter import parse_filter
+from ee2pw.ir import FilterChain, Node
+from ee2pw.limiter import parse_limiter
+from ee2pw.links import create_inputs, create_links, create_outputs
+from ee2pw.multiband_compressor import (
+    MULTIBAND_COMPRESSOR_BANDS,
+    parse_multiband_compressor,
+)
+from ee2pw.registry import Parser
+from ee2pw.stereo_tools import parse_stereo_tools
+from ee2pw.util import load_config
+
+PRESETS_DIR = Path(__file__).resolve().parent.parent / "extras" / "presets"
+
+LONG_CHAIN_LENGTH = 500
+DEFAULT_THRESHOLD = 0.10
+BULK_REPEAT = 20
+
+PARSERS: dict[str, Parser] = {
+    "bass_enhancer": parse_bass_enhancer,
+    "filter": parse_filter,
+    "limiter": parse_limiter,
+    "multiband_compressor": parse_multiband_compressor,
+    "stereo_tools": parse_stereo_tools,
+}
+
+Benchmark = tuple[str, Callable[[], Any]]
+
+
+def load_presets(directory: Path = PRESETS_DIR) -> dict[str, dict[Any, Any]]:
+    return {
+        Path(path).stem: load_config(path)
+        for path in sorted(glob.glob(str(directory / "*.json")))
+    }
+
+
+def plugin_configs(presets: dict[str, dict[Any, Any]]) -> dict[str, dict[Any, Any]]:
+    """
+    Pick the first configuration of every supported plugin from the presets.
+    """
+    configs: dict[str, dict[Any, Any]] = {}
+
+    for preset in presets.values():
+        ee_output = preset.get("output", {})
+        for ee_plugin in ee_output.get("plugins_order", []):
+            base = str(ee_plugin).partition("#")[0]
+            configs.setdefault(base, ee_output.get(ee_plugin, {}))
+
+    return configs
+
+
+def all_bands_compressor(presets: dict[str, dict[Any, Any]]) -> dict[Any, Any]:
+    """
+    Generate a multiband compressor with all 8 bands enabled.
+    """
+    config = copy.deepcopy(plugin_configs(presets)["multiband_compressor"])
+    band = config.get("band1", {})
+
+    for i in range(1, MULTIBAND_COMPRESSOR_BANDS):
+        config[f"band{i}"] = {
+            **band,
+            "enable-band": True,
+            "split-frequency": 20.0 * 2 ** (i + 1),
+        }
+
+    return config
+
+
+def long_chain_preset(
+    presets: dict[str, dict[Any, Any]], length: int = LONG_CHAIN_LENGTH
+) -> dict[Any, Any]:
+    """
+    Generate a preset chaining ``length`` plugins, cycling through every
+    supported plugin type.
+    """
+    configs = plugin_configs(presets)
+    configs["multiband_compressor"] = all_bands_compressor(presets)
+    bases = sorted(configs)
+
+    ee_output: dict[str, Any] = {"blocklist": [], "plugins_order": []}
+
+    for i in range(length):
+        base = bases[i % len(bases)]
+        ee_plugin = f"{base}#{i // len(bases)}"
+        ee_output["plugins_order"].append(ee_plugin)
+        ee_output[ee_plugin] = configs[base]
+
+    return {"output": ee_output}
+
+
+def serialize(result: dict, output_format: str) -> None:
+    dump(result, io.StringIO(), output_format)
+
+
+def benchmarks(presets: dict[str, dict[Any, Any]]) -> list[Benchmark]:
+    """
+    Collect every benchmark case, named ``<stage>/<case>``.
+    """
+    cases: list[Benchmark] = []
+    configs = plugin_configs(presets)
+
+    for name in presets:
+        path = str(PRESETS_DIR / f"{name}.json")
+        cases.append((f"load_config/{name}", lambda path=path: load_config(path)))
+
+    for base, parser in PARSERS.items():
+        if base in configs:
+            cases.append(
+                (
+                    f"parse/{base}",
+                    lambda parser=parser, config=configs[base]: parser(config, "x_0"),
+                )
+            )
+
+    mb_all_bands = all_bands_compressor(presets)
+    cases.append(
+        (
+            "parse/multiband_compressor_8_bands",
+            lambda: parse_multiband_compressor(mb_all_bands, "x_0"),
+        )
+    )
+
+    chain = [f"plugin_{i}" for i in range(LONG_CHAIN_LENGTH)]
+    cases.append((f"links/create_links_{len(chain)}", lambda: create_links(chain)))
+    cases.append(
+        (
+            f"links/create_inputs_outputs_{len(chain)}",
+            lambda: (create_inputs(chain), create_outputs(chain)),
+        )
+    )
+
+    chain_nodes = [Node("lv2", name, "urn:x") for name in chain]
+    graph = FilterChain.serial(chain_nodes)
+    cases.append((f"ir/serial_{len(chain)}", lambda: FilterChain.serial(chain_nodes)))
+    cases.append((f"ir/to_dict_{len(chain)}", graph.to_dict))
+
+    generated = {**presets, f"chain_{LONG_CHAIN_LENGTH}": long_chain_preset(presets)}
+
+    for name, preset in generated.items():
+        if not preset.get("output", {}).get("plugins_order"):
+            continue
+
+        result = build(preset, name)
+        cases.append((f"build/{name}", lambda preset=preset: build(preset, "x")))
+        for output_format in ("json", "conf"):
+            cases.append(
+                (
+                    f"serialize_{output_format}/{name}",
+                    lambda result=result, fmt=output_format: serialize(result, fmt),
+                )
+            )
+
+    # Every bundled preset, as one bulk conversion and preset by preset.
+    configs = list(presets.values()) * BULK_REPEAT
+    cases.append((f"bulk/parse_presets_{len(configs)}", lambda: parse_presets(configs)))
+    cases.append(
+        (
+            f"bulk/parse_chain_{len(configs)}",
+            lambda: [parse_chain(config) for config in configs],
+        )
+    )
+
+    return cases
+
+
+def measure(func: Callable[[], Any], repeat: int = 5, min_time: float = 0.05) -> float:
+    """
+    Time a function, returning the best seconds per call over ``repeat`` runs.
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run(
+    name_filter: str | None = None,
+    repeat: int = 5,
+    min_time: float = 0.05,
+    report: Callable[[str, float], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Run the benchmark suite.
+
+    :return: machine-readable results, seconds per call keyed by benchmark
+    :rtype: dict[str, Any]
+    """
+    results: dict[str, float] = {}
+
+    for name, func in benchmarks(load_presets()):
+        if name_filter and name_filter not in name:
+            continue
+        results[name] = measure(func, repeat, min_time)
+        if report:
+            report(name, results[name])
+
+    return {
+        "meta": {
+            "ee2pw": __version__,
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[tuple[str, float, float, float]]:
+    """
+    Compare results with a baseline.
+
+    :return: (name, baseline seconds, current seconds, ratio) for every
+        benchmark slower than the baseline by more than ``threshold``
+    :rtype: list[tuple[str, float, float, float]]
+    """
+    regressions = []
+
+    for name, seconds in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            continue
+        ratio = seconds / before
+        if ratio > 1.0 + threshold:
+            regressions.append((name, before, seconds, ratio))
+
+    return regressions
+
+
+def load_results(filepath: str) -> dict[str, Any]:
+    with open(filepath, "r") as f:
+        return json.load(f)
+
+
+def save_results(results: dict[str, Any], filepath: str) -> None:
+    with open(filepath, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
@@ -4,4 +4,4 @@ ee2pw package
 
 __version__ = "0.1.0"
 __author__ = "Tamado Sitohang"
-__license__ = "MIT"
\ No newline at end of file
+__license__ = "MIT"
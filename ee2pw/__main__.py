@@ -1,20 +1,49 @@
-import argparse, json
+import argparse, sys
 
+# Subcommands are looked up before the conversion arguments are parsed and
+# imported only when used.
+SUBCOMMANDS: dict[str, str] = {
+    "apply": "ee2pw.apply",
+    "catalog": "ee2pw.catalog",
+    "client": "ee2pw.client",
+    "control": "ee2pw.control",
+    "daemon": "ee2pw.daemon",
+    "lv2": "ee2pw.lv2_index",
+    "profile": "ee2pw.profile",
+    "pw": "ee2pw.pipewire",
+    "serve": "ee2pw.server",
+}
 
-def main():
-    try:
-        from ee2pw.core import builder
 
+def main(argv: list[str] | None = None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    if argv and argv[0] in SUBCOMMANDS:
+        from importlib import import_module
+
+        return import_module(SUBCOMMANDS[argv[0]]).main(argv[1:])
+
+    try:
         argparser = argparse.ArgumentParser(
-            description="Parse EasyEffects configuration file."
+            description="Parse EasyEffects configuration file.",
+            fromfile_prefix_chars="@",
+            epilog=f"subcommands: {', '.join(SUBCOMMANDS)} "
+            "(see python -m ee2pw <subcommand> --help)",
         )
 
         argparser.add_argument(
-            "filename", type=str, help="Path to the EasyEffects configuration file."
+            "filename",
+            type=str,
+            nargs="+",
+            help="Path to the EasyEffects configuration file. "
+            "Several files, globs or directories start a batch conversion.",
         )
 
         argparser.add_argument(
-            "-n", "--filter-chain-name", type=str, help="Filter chain name."
+            "-n",
+            "--filter-chain-name",
+            type=str,
+            help="Filter chain name (single preset only, defaults to the preset name).",
         )
 
         argparser.add_argument(
@@ -31,21 +60,359 @@ def main():
             help="File output.",
         )
 
-        args = argparser.parse_args()
+        argparser.add_argument(
+            "-d",
+            "--output-dir",
+            type=str,
+            help="Output directory for batch conversion.",
+        )
+
+        argparser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            help="Number of worker processes for batch conversion "
+            "(default: CPU count).",
+        )
+
+        argparser.add_argument(
+            "--cache",
+            type=str,
+            nargs="?",
+            const="",
+            metavar="CACHE_DIR",
+            help="Skip presets converted before with the same options "
+            "(default directory: $XDG_CACHE_HOME/ee2pw).",
+        )
+
+        argparser.add_argument(
+            "-w",
+            "--watch",
+            action="store_true",
+            help="Keep running and reconvert presets whenever they change.",
+        )
+
+        argparser.add_argument(
+            "-f",
+            "--format",
+            type=str,
+            choices=["json", "conf"],
+            default="json",
+            help="Output format: strict JSON, or PipeWire SPA-JSON .conf "
+            "(default: json).",
+        )
+
+        argparser.add_argument(
+            "--compact",
+            action="store_true",
+            help="Write the output on a single line.",
+        )
+
+        argparser.add_argument(
+            "-O",
+            "--optimize",
+            action="store_true",
+            help="Remove bypassed and gain-only plugins and report what was removed.",
+        )
+
+        argparser.add_argument(
+            "--fuse-filters",
+            action="store_true",
+            help="Merge consecutive filters into LSP parametric equalizers.",
+        )
+
+        argparser.add_argument(
+            "--latency",
+            action="store_true",
+            help="Report the estimated latency of the chain.",
+        )
+
+        argparser.add_argument(
+            "--sample-rate",
+            type=int,
+            metavar="HZ",
+            help="Sample rate of the latency estimate (default: 48000).",
+        )
+
+        argparser.add_argument(
+            "--max-latency",
+            type=float,
+            metavar="MS",
+            help="Latency budget in milliseconds, implies --latency.",
+        )
+
+        argparser.add_argument(
+            "--latency-policy",
+            type=str,
+            choices=["fail", "downgrade"],
+            default="fail",
+            help="Fail, or switch plugins to lower-latency settings, when the "
+            "budget is exceeded (default: fail).",
+        )
+
+        argparser.add_argument(
+            "--sparse",
+            action="store_true",
+            help="Omit the controls equal to their LV2 default.",
+        )
+
+        argparser.add_argument(
+            "--split",
+            type=int,
+            metavar="N",
+            help="Spread the chain over up to N cascaded filter chains, cut by "
+            "estimated CPU cost.",
+        )
+
+        argparser.add_argument(
+            "--data-loops",
+            type=int,
+            metavar="N",
+            help="Pin the filter chains of --split to data-loop.0 to N-1, as "
+            "created by context.num-data-loops (default: let PipeWire place them).",
+        )
+
+        argparser.add_argument(
+            "--validate",
+            action="store_true",
+            help="Check the plugins and ports of the output against the LV2 "
+            "bundles of LV2_PATH before writing it.",
+        )
+
+        argparser.add_argument(
+            "--cost-report",
+            action="store_true",
+            help="Print the estimated CPU cost of the presets, most expensive "
+            "first, instead of converting them.",
+        )
+
+        argparser.add_argument(
+            "--timings",
+            action="store_true",
+            help="Print the time spent in every stage and plugin parser.",
+        )
 
-        result: dict = builder(
-            args.filename, args.filter_chain_name, args.smart_filter_target
+        argparser.add_argument(
+            "--timings-json",
+            type=str,
+            metavar="FILE",
+            help="Write the stage timings as JSON to FILE (- for stdout).",
         )
 
-        with open(args.output, "w") as out:
-            json.dump(result, out, indent=2)
+        args = argparser.parse_args(argv)
+
+        if args.cost_report:
+            return run_cost_report(args)
 
-        return 0
+        if args.watch:
+            if args.timings or args.timings_json:
+                argparser.error("--timings cannot be combined with --watch")
+            return run_watch(args, argparser)
+
+        if args.timings or args.timings_json:
+            return run_timed(args, argparser)
+
+        return run_convert(args, argparser)
     except Exception as e:
         raise e
 
 
-if __name__ == "__main__":
-    import sys
+def run_convert(args: argparse.Namespace, argparser: argparse.ArgumentParser) -> int:
+    from ee2pw.batch import is_batch
+
+    if is_batch(args.filename) or (args.output_dir and not args.output):
+        return run_batch(args, argparser)
+
+    if not args.output:
+        argparser.error("the following arguments are required: -o/--output")
+
+    from ee2pw.convert import convert_file
+
+    report: dict = {}
+
+    convert_file(
+        args.filename[0],
+        args.output,
+        conversion_options(args),
+        open_cache(args),
+        report,
+    )
+
+    print_report(report)
+
+    return 0
+
+
+def run_timed(args: argparse.Namespace, argparser: argparse.ArgumentParser) -> int:
+    import json
+
+    from ee2pw.trace import Timings, hooked, span
+
+    # Hooks only see the current process, so batches are converted serially.
+    args.jobs = 1
+    timings = Timings()
+
+    with hooked(timings), span("convert"):
+        status = run_convert(args, argparser)
+
+    if args.timings:
+        print(timings.format(), file=sys.stderr)
+
+    if args.timings_json == "-":
+        json.dump(timings.to_json(), sys.stdout, indent=2)
+        print()
+    elif args.timings_json:
+        with open(args.timings_json, "w") as f:
+            json.dump(timings.to_json(), f, indent=2)
+
+    return status
+
+
+def conversion_options(args: argparse.Namespace):
+    from ee2pw.convert import ConversionOptions
+
+    return ConversionOptions(
+        args.filter_chain_name,
+        args.smart_filter_target,
+        args.format,
+        args.compact,
+        args.optimize,
+        args.fuse_filters,
+        args.latency,
+        args.sample_rate,
+        args.max_latency,
+        args.latency_policy,
+        args.sparse,
+        args.split,
+        args.validate,
+        args.data_loops,
+    )
+
+
+def print_report(report: dict) -> None:
+    for item in report.values():
+        print(item.format(), file=sys.stderr)
+
+
+def open_cache(args: argparse.Namespace):
+    if args.cache is None:
+        return None
+
+    from ee2pw.cache import ConversionCache
+
+    return ConversionCache(args.cache or None)
+
 
+def run_cost_report(args: argparse.Namespace) -> int:
+    from ee2pw.batch import collect_presets
+    from ee2pw.cost import format_ranking, rank_presets
+
+    errors: dict[str, str] = {}
+    costs = rank_presets(
+        collect_presets(args.filename),
+        errors,
+        optimize=args.optimize,
+        fuse_filters=args.fuse_filters,
+    )
+
+    if len(costs) == 1:
+        print(costs[0].format())
+    elif costs:
+        print(format_ranking(costs))
+
+    for preset, error in errors.items():
+        print(f"[FAIL] {preset}: {error}")
+
+    return 1 if errors else 0
+
+
+def run_batch(args: argparse.Namespace, argparser: argparse.ArgumentParser) -> int:
+    import time
+
+    from ee2pw.batch import (
+        collect_presets,
+        convert_batch,
+        format_result,
+        format_summary,
+    )
+
+    if not args.output_dir:
+        argparser.error("batch conversion requires -d/--output-dir")
+
+    presets = collect_presets(args.filename)
+    if args.filter_chain_name and len(presets) > 1:
+        argparser.error(
+            "-n/--filter-chain-name cannot name several presets, "
+            "each filter chain is named after its preset"
+        )
+
+    results = []
+    start = time.perf_counter()
+
+    for result in convert_batch(
+        presets,
+        args.output_dir,
+        conversion_options(args),
+        args.jobs,
+        open_cache(args),
+    ):
+        results.append(result)
+        print(format_result(result))
+
+    print(format_summary(results, time.perf_counter() - start))
+
+    return 0 if all(result.ok for result in results) else 1
+
+
+def run_watch(args: argparse.Namespace, argparser: argparse.ArgumentParser) -> int:
+    import os
+
+    from ee2pw.batch import format_result
+    from ee2pw.convert import OUTPUT_SUFFIXES
+    from ee2pw.watch import directory_outputs, file_outputs, watch
+
+    if len(args.filename) != 1:
+        argparser.error("--watch takes a single preset file or directory")
+
+    source = args.filename[0]
+
+    if os.path.isdir(source):
+        if not args.output_dir:
+            argparser.error("watching a directory requires -d/--output-dir")
+        if os.path.realpath(source) == os.path.realpath(args.output_dir):
+            argparser.error("-d/--output-dir must differ from the watched directory")
+        if args.filter_chain_name:
+            argparser.error(
+                "-n/--filter-chain-name cannot name several presets, "
+                "each filter chain is named after its preset"
+            )
+
+        os.makedirs(args.output_dir, exist_ok=True)
+        directory, outputs = source, directory_outputs(
+            args.output_dir, OUTPUT_SUFFIXES[args.format]
+        )
+    else:
+        if not args.output:
+            argparser.error("the following arguments are required: -o/--output")
+
+        directory, outputs = (
+            os.path.dirname(source) or ".",
+            file_outputs(source, args.output),
+        )
+
+    try:
+        watch(
+            directory,
+            outputs,
+            conversion_options(args),
+            open_cache(args),
+            on_result=lambda result: print(format_result(result), flush=True),
+        )
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+if __name__ == "__main__":
     sys.exit(main())
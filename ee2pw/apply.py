@@ -0,0 +1,378 @@
+import argparse, json, math, shlex, subprocess, sys
+from typing import Any, NamedTuple
+
+from .control import set_param_args
+from .pipewire import PwDumpIndex
+from .split import stage_name
+from .util import load_config
+
+# PipeWire stores control values as 32-bit floats.
+CONTROL_REL_TOLERANCE = 1e-6
+CONTROL_ABS_TOLERANCE = 1e-7
+
+DEFAULT_RELOAD_COMMAND = "systemctl --user restart pipewire.service"
+
+
+class ApplyPlan(NamedTuple):
+    # Changed controls of every running filter chain node, one per stage of
+    # chains split with --split.
+    updates: dict[int, dict[str, float]]
+    reload_reasons: list[str]
+
+    @property
+    def node_id(self) -> int | None:
+        return next(iter(self.updates), None)
+
+    @property
+    def changes(self) -> dict[str, float]:
+        return {
+            key: value
+            for changes in self.updates.values()
+            for key, value in changes.items()
+        }
+
+    @property
+    def needs_reload(self) -> bool:
+        return bool(self.reload_reasons)
+
+
+def node_controls(node: dict[str, Any]) -> dict[str, float]:
+    """
+    Get the filter-chain control values of a node from its Props params.
+
+    :param node: PipeWire node object from ``pw-dump``
+    :type node: dict[str, Any]
+    :return: control values keyed by ``<plugin node>:<port>``
+    :rtype: dict[str, float]
+    """
+    controls: dict[str, float] = {}
+    props = ((node.get("info") or {}).get("params") or {}).get("Props") or []
+
+    for prop in props:
+        params = prop.get("params") if isinstance(prop, dict) else None
+        if isinstance(params, list):
+            controls.update(zip(params[::2], params[1::2]))
+
+    return controls
+
+
+def find_filter_chain(
+    objects: PwDumpIndex | list[dict[str, Any]], filter_chain_name: str
+) -> tuple[int, dict[str, float]] | None:
+    """
+    Find the running filter chain node that holds the plugin controls.
+
+    :param objects: PipeWire objects from ``pw-dump``, or their index
+    :param filter_chain_name: filter chain name
+    :type objects: PwDumpIndex | list[dict[str, Any]]
+    :type filter_chain_name: str
+    :return: node id and its control values, or None if it is not running
+    :rtype: tuple[int, dict[str, float]] | None
+    """
+    index = objects if isinstance(objects, PwDumpIndex) else PwDumpIndex(objects)
+
+    for node in index.filter_chain(filter_chain_name):
+        controls = node_controls(node)
+        if controls:
+            return node["id"], controls
+
+    return None
+
+
+def graph_structure(result: dict) -> list[tuple[Any, ...]]:
+    """
+    Get everything in a filter chain config that a param update cannot change.
+    """
+    structure: list[tuple[Any, ...]] = []
+
+    for module in result.get("context.modules", []):
+        args = module.get("args", {})
+        graph = args.get("filter.graph", {})
+
+        structure.append(
+            (
+                tuple(
+                    (node.get("name"), node.get("plugin")) for node in graph["nodes"]
+                ),
+                tuple((link["output"], link["input"]) for link in graph["links"]),
+                tuple(graph.get("inputs", [])),
+                tuple(graph.get("outputs", [])),
+                json.dumps(
+                    {k: v for k, v in args.items() if k != "filter.graph"},
+                    sort_keys=True,
+                ),
+            )
+        )
+
+    return structure
+
+
+def graph_controls(module: dict[str, Any]) -> dict[str, float]:
+    return {
+        f"{node['name']}:{port}": value
+        for node in module["args"]["filter.graph"]["nodes"]
+        for port, value in node.get("control", {}).items()
+    }
+
+
+def same_value(a: float, b: float) -> bool:
+    return math.isclose(
+        a, b, rel_tol=CONTROL_REL_TOLERANCE, abs_tol=CONTROL_ABS_TOLERANCE
+    )
+
+
+def plan_apply(
+    result: dict,
+    filter_chain_name: str,
+    objects: PwDumpIndex | list[dict[str, Any]],
+    previous: dict | None = None,
+) -> ApplyPlan:
+    """
+    Compare a new filter chain config with the running one.
+
+    Control values come from the ``pw-dump`` snapshot. The node list and links
+    cannot be read back from PipeWire, so they are compared against the
+    previously deployed config when one is given. Every stage of a chain
+    split with ``--split`` is compared with its own running node.
+
+    :param result: new filter chain config, with every control written
+    :param filter_chain_name: filter chain name
+    :param objects: PipeWire objects from ``pw-dump``, or their index
+    :param previous: previously deployed filter chain config (if any)
+    :type result: dict
+    :type filter_chain_name: str
+    :type objects: PwDumpIndex | list[dict[str, Any]]
+    :type previous: dict | None
+    :return: control changes to push, or the reasons a reload is needed
+    :rtype: ApplyPlan
+    """
+    index = objects if isinstance(objects, PwDumpIndex) else PwDumpIndex(objects)
+    modules = result.get("context.modules", [])
+    updates: dict[int, dict[str, float]] = {}
+    reasons: list[str] = []
+
+    if previous is not None and graph_structure(previous) != graph_structure(result):
+        reasons.append("nodes, links or module properties changed")
+
+    for stage, module in enumerate(modules):
+        name = stage_name(filter_chain_name, stage)
+        running = find_filter_chain(index, name)
+        if running is None:
+            reasons.append(f"filter chain {name} is not running")
+            continue
+
+        node_id, current = running
+
+        wanted = graph_controls(module)
+
+        current_nodes = {key.rpartition(":")[0] for key in current}
+        wanted_nodes = {key.rpartition(":")[0] for key in wanted}
+        if current_nodes != wanted_nodes:
+            reasons.append(
+                f"node list changed: {sorted(current_nodes)} -> {sorted(wanted_nodes)}"
+            )
+
+        missing = sorted(key for key in wanted if key not in current)
+        if missing:
+            reasons.append(f"controls not in the running graph: {', '.join(missing)}")
+
+        updates[node_id] = {
+            key: value
+            for key, value in wanted.items()
+            if key in current and not same_value(value, current[key])
+        }
+
+    extra = stage_name(filter_chain_name, len(modules))
+    if find_filter_chain(index, extra) is not None:
+        reasons.append(f"filter chain {extra} is running but no longer deployed")
+
+    return ApplyPlan(updates, reasons)
+
+
+def set_param_command(
+    node_id: int, changes: dict[str, float], pw_cli: str = "pw-cli"
+) -> list[str]:
+    """
+    Build a single ``pw-cli set-param`` call that updates all changed controls.
+    """
+    return [pw_cli, *set_param_args(node_id, changes)]
+
+
+def main(argv: list[str] | None = None) -> int:
+    from .convert import (
+        ConversionOptions,
+        convert_config,
+        default_filter_chain_name,
+        dump,
+    )
+    from .util import AtomicWriter
+
+    argparser = argparse.ArgumentParser(
+        prog="python -m ee2pw apply",
+        description="Apply an EasyEffects preset to a running filter chain, "
+        "updating controls in place when possible.",
+    )
+
+    argparser.add_argument(
+        "filename", type=str, help="Path to the EasyEffects configuration file."
+    )
+    argparser.add_argument(
+        "-n", "--filter-chain-name", type=str, help="Filter chain name."
+    )
+    argparser.add_argument(
+        "-t",
+        "--smart-filter-target",
+        type=str,
+        help="Smart filter target (if any).",
+    )
+    argparser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        help="Deployed config file. It is compared against to detect graph "
+        "changes, and rewritten with the new config.",
+    )
+    argparser.add_argument(
+        "-f",
+        "--format",
+        type=str,
+        choices=["json", "conf"],
+        default="json",
+        help="Format of the deployed config file (default: json).",
+    )
+    argparser.add_argument(
+        "--compact", action="store_true", help="Write the output on a single line."
+    )
+    argparser.add_argument(
+        "-O", "--optimize", action="store_true", help="Remove no-op plugins."
+    )
+    argparser.add_argument(
+        "--fuse-filters", action="store_true", help="Merge consecutive filters."
+    )
+    argparser.add_argument(
+        "--latency", action="store_true", help="Estimate the chain latency."
+    )
+    argparser.add_argument(
+        "--sample-rate", type=int, metavar="HZ", help="Sample rate of the estimate."
+    )
+    argparser.add_argument(
+        "--max-latency", type=float, metavar="MS", help="Latency budget in ms."
+    )
+    argparser.add_argument(
+        "--latency-policy",
+        type=str,
+        choices=["fail", "downgrade"],
+        default="fail",
+        help="What to do over the latency budget (default: fail).",
+    )
+    argparser.add_argument(
+        "--sparse", action="store_true", help="Omit the LV2 default controls."
+    )
+    argparser.add_argument(
+        "--split", type=int, metavar="N", help="Spread over up to N filter chains."
+    )
+    argparser.add_argument(
+        "--data-loops", type=int, metavar="N", help="Pin split chains to N loops."
+    )
+    argparser.add_argument(
+        "--validate", action="store_true", help="Check the output against LV2_PATH."
+    )
+    argparser.add_argument(
+        "--pw-dump",
+        type=str,
+        help="Saved pw-dump JSON to read instead of running pw-dump.",
+    )
+    argparser.add_argument(
+        "--pw-cli", type=str, default="pw-cli", help="pw-cli executable."
+    )
+    argparser.add_argument(
+        "--reload-command",
+        type=str,
+        default=DEFAULT_RELOAD_COMMAND,
+        help="Command run when the graph changed and must be reloaded "
+        f"(default: {DEFAULT_RELOAD_COMMAND!r}, empty to skip).",
+    )
+    argparser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only print what would be done.",
+    )
+
+    args = argparser.parse_args(argv)
+
+    filter_chain_name = args.filter_chain_name or default_filter_chain_name(
+        args.filename
+    )
+    # The same options as the deployed config was written with, so that the
+    # plan compares against the graph that is actually running.
+    options = ConversionOptions(
+        filter_chain_name,
+        args.smart_filter_target,
+        args.format,
+        args.compact,
+        args.optimize,
+        args.fuse_filters,
+        args.latency,
+        args.sample_rate,
+        args.max_latency,
+        args.latency_policy,
+        args.sparse,
+        args.split,
+        args.validate,
+        args.data_loops,
+    )
+    config = load_config(args.filename)
+    report: dict[str, Any] = {}
+
+    try:
+        result = convert_config(config, options, report)
+        # Controls left out of a sparse config are back to their default, which
+        # the running graph may not be at.
+        planned = (
+            convert_config(config, options._replace(sparse=False, validate=False))
+            if options.sparse
+            else result
+        )
+    except ValueError as e:
+        argparser.error(str(e))
+
+    for item in report.values():
+        print(item.format(), file=sys.stderr)
+
+    previous = None
+    if args.output and args.format == "json":
+        try:
+            previous = load_config(args.output)
+        except FileNotFoundError:
+            pass
+
+    plan = plan_apply(
+        planned, filter_chain_name, PwDumpIndex.load(args.pw_dump), previous
+    )
+
+    if plan.needs_reload:
+        for reason in plan.reload_reasons:
+            print(f"reload required: {reason}")
+    elif plan.changes:
+        for node_id, changes in plan.updates.items():
+            if not changes:
+                continue
+            command = set_param_command(node_id, changes, args.pw_cli)
+            print(shlex.join(command))
+            if not args.dry_run:
+                subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+    else:
+        print("controls are up to date")
+
+    if args.dry_run:
+        return 0
+
+    if args.output:
+        with AtomicWriter(args.output) as out:
+            dump(result, out, args.format, args.compact)
+
+    if plan.needs_reload and args.reload_command:
+        print(args.reload_command)
+        subprocess.run(shlex.split(args.reload_command), check=True)
+
+    return 0
@@ -1,13 +1,27 @@
 from typing import Any
-from .lv2_wrapper import parse_bool, parse_float, parse_float_db
+from .ir import Node
+from .lv2_wrapper import BOOL, FLOAT, FLOAT_DB, Control, compile_controls
 
 PLUGIN_TYPE = "lv2"
 PLUGIN_URI = "http://calf.sourceforge.net/plugins/BassEnhancer"
 
+BASS_ENHANCER_CONTROLS: tuple[Control, ...] = (
+    Control("bypass", "bypass", BOOL, False),
+    Control("level_in", "input-gain", FLOAT_DB, 0.0),
+    Control("level_out", "output-gain", FLOAT_DB, 0.0),
+    Control("amount", "amount", FLOAT_DB, 0.0),
+    Control("drive", "harmonics", FLOAT, 8.5),
+    Control("freq", "scope", FLOAT, 100.0),
+    Control("floor", "floor", FLOAT, 20.0),
+    Control("blend", "blend", FLOAT, 0.0),
+    Control("floor_active", "floor-active", BOOL, False),
+    Control("listen", "listen", BOOL, False),
+)
 
-def parse_bass_enhancer(
-    ee_config: dict[Any, Any], pw_node_name: str
-) -> dict[str, str | dict[str, float]]:
+convert_bass_enhancer = compile_controls(BASS_ENHANCER_CONTROLS)
+
+
+def parse_bass_enhancer(ee_config: dict[Any, Any], pw_node_name: str) -> Node:
     """
     Parse bass enhancer settings.
 
@@ -16,22 +30,8 @@ def parse_bass_enhancer(
     :type data: dict[Any, Any]
     :type pw_node_name: str
     :return: parsed bass enhancer settings
-    :rtype: dict
+    :rtype: Node
     """
-    return {
-        "type": PLUGIN_TYPE,
-        "name": pw_node_name,
-        "plugin": PLUGIN_URI,
-        "control": {
-            "bypass": parse_bool(ee_config, "bypass", False),
-            "level_in": parse_float_db(ee_config, "input-gain", 0.0),
-            "level_out": parse_float_db(ee_config, "output-gain", 0.0),
-            "amount": parse_float_db(ee_config, "amount", 0.0),
-            "drive": parse_float(ee_config, "harmonics", 8.5),
-            "freq": parse_float(ee_config, "scope", 100.0),
-            "floor": parse_float(ee_config, "floor", 20.0),
-            "blend": parse_float(ee_config, "blend", 0.0),
-            "floor_active": parse_bool(ee_config, "floor-active", False),
-            "listen": parse_bool(ee_config, "listen", False),
-        },
-    }
+    return Node(
+        PLUGIN_TYPE, pw_node_name, PLUGIN_URI, control=convert_bass_enhancer(ee_config)
+    )
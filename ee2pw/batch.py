@@ -0,0 +1,194 @@
+import glob, os, time
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .convert import OUTPUT_SUFFIXES, ConversionOptions, convert_file
+
+if TYPE_CHECKING:
+    from .cache import ConversionCache
+
+PRESET_SUFFIX = ".json"
+OUTPUT_SUFFIX = ".json"
+
+
+class ConversionResult(NamedTuple):
+    preset: str
+    output: str
+    seconds: float
+    error: str | None = None
+    changed: bool = False
+    # Formatted reports of the optional passes.
+    reports: tuple[str, ...] = ()
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def is_batch(inputs: list[str]) -> bool:
+    """
+    Check whether the given inputs need batch conversion.
+
+    :param inputs: preset files, globs or directories
+    :type inputs: list[str]
+    :return: True if there is more than one preset to convert
+    :rtype: bool
+    """
+    return len(inputs) > 1 or any(
+        os.path.isdir(item) or glob.has_magic(item) for item in inputs
+    )
+
+
+def collect_presets(inputs: list[str]) -> list[str]:
+    """
+    Expand preset files, globs and directories into a list of presets.
+
+    :param inputs: preset files, globs or directories
+    :type inputs: list[str]
+    :return: preset paths, in input order and without duplicates
+    :rtype: list[str]
+    """
+    presets: dict[str, None] = {}
+
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = sorted(
+                glob.glob(os.path.join(glob.escape(item), "*" + PRESET_SUFFIX))
+            )
+        elif glob.has_magic(item):
+            matches = sorted(glob.glob(item))
+        else:
+            matches = [item]
+
+        presets.update(dict.fromkeys(matches))
+
+    return list(presets)
+
+
+def output_path(preset: str, output_dir: str, suffix: str = OUTPUT_SUFFIX) -> str:
+    """
+    Get the output path for a preset inside the output directory.
+
+    :param preset: path to the EasyEffects preset
+    :param output_dir: output directory
+    :param suffix: output file suffix
+    :type preset: str
+    :type output_dir: str
+    :type suffix: str
+    :return: output path
+    :rtype: str
+    """
+    stem = os.path.splitext(os.path.basename(preset))[0]
+    return os.path.join(output_dir, stem + suffix)
+
+
+def convert_one(
+    preset: str,
+    output: str,
+    options: ConversionOptions = ConversionOptions(),
+    cache: "ConversionCache | None" = None,
+) -> ConversionResult:
+    """
+    Convert one preset, capturing the error instead of raising it.
+    """
+    start = time.perf_counter()
+    report: dict[str, Any] = {}
+
+    try:
+        changed = convert_file(preset, output, options, cache, report)
+    except Exception as e:
+        return ConversionResult(
+            preset, output, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+        )
+
+    return ConversionResult(
+        preset,
+        output,
+        time.perf_counter() - start,
+        changed=changed,
+        reports=tuple(item.format() for item in report.values()),
+    )
+
+
+def convert_batch(
+    presets: list[str],
+    output_dir: str,
+    options: ConversionOptions = ConversionOptions(),
+    jobs: int | None = None,
+    cache: "ConversionCache | None" = None,
+) -> Iterator[ConversionResult]:
+    """
+    Convert presets in parallel, one output file per preset.
+
+    Results are yielded as soon as each conversion finishes.
+
+    :param presets: paths to the EasyEffects presets
+    :param output_dir: directory to write the outputs to
+    :param options: conversion options, the filter chain name defaults to each
+        preset name and can only be set for a single preset
+    :param jobs: number of worker processes, defaults to the CPU count
+    :param cache: conversion cache (if any)
+    :type presets: list[str]
+    :type output_dir: str
+    :type options: ConversionOptions
+    :type jobs: int | None
+    :type cache: ConversionCache | None
+    :raises ValueError: if a filter chain name is set for several presets, or
+        two presets would be written to the same output
+    :return: conversion results
+    :rtype: Iterator[ConversionResult]
+    """
+    if options.filter_chain_name and len(presets) > 1:
+        # Their input and output node names would collide in PipeWire.
+        raise ValueError("a filter chain name can only be set for a single preset")
+
+    outputs: dict[str, str] = {}
+
+    for preset in presets:
+        output = output_path(preset, output_dir, OUTPUT_SUFFIXES[options.output_format])
+        if output in outputs:
+            raise ValueError(
+                f"{preset} and {outputs[output]} would both be written to {output}"
+            )
+        outputs[output] = preset
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    if jobs == 1 or len(presets) <= 1:
+        for output, preset in outputs.items():
+            yield convert_one(preset, output, options, cache)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [
+            pool.submit(convert_one, preset, output, options, cache)
+            for output, preset in outputs.items()
+        ]
+
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def format_result(result: ConversionResult) -> str:
+    if result.ok:
+        status = "" if result.changed else ", unchanged"
+        return "\n".join(
+            [
+                f"[OK]   {result.preset} -> {result.output} "
+                f"({result.seconds * 1000:.1f} ms{status})",
+                *result.reports,
+            ]
+        )
+    return f"[FAIL] {result.preset}: {result.error}"
+
+
+def format_summary(results: list[ConversionResult], seconds: float) -> str:
+    failed = sum(1 for result in results if not result.ok)
+    throughput = len(results) / seconds if seconds > 0 else 0.0
+
+    return (
+        f"{len(results) - failed} converted, {failed} failed "
+        f"in {seconds:.2f} s ({throughput:.1f} presets/s)"
+    )
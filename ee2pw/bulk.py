@@ -0,0 +1,141 @@
+from collections.abc import Iterable
+from typing import Any
+
+from .core import assemble, parse_chain, run_passes
+from .ir import FilterChain, Node
+from .lv2_wrapper import Deferred, Pending, deferred
+from .trace import span
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, presets are then converted one by one
+    np = None
+
+DB_FLOOR = -100.0
+
+# Values within this many ulps of a rounding boundary are converted by the
+# scalar path, as NumPy's power may differ from the C library's by an ulp.
+BOUNDARY_ULPS = 16
+
+
+def has_numpy() -> bool:
+    return np is not None
+
+
+def convert_values(pending: Deferred) -> list[float]:
+    """
+    Convert deferred ``float`` and ``float_db`` values.
+
+    With NumPy, values are converted in one vectorized step. Rounding to 6
+    decimals is exact there, except close to a half-way point, where values
+    are converted again by the scalar path. The result is identical to
+    converting every value with :func:`ee2pw.util.format_6f`.
+
+    :param pending: values gathered by :func:`ee2pw.lv2_wrapper.deferred`
+    :type pending: Deferred
+    :return: converted values, in placeholder order
+    :rtype: list[float]
+    """
+    if np is None or not pending.values:
+        return [pending.convert_scalar(i) for i in range(len(pending.values))]
+
+    values = np.array(pending.values, dtype=np.float64)
+    is_db = np.array(pending.is_db, dtype=bool)
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        linear = np.where(
+            is_db,
+            np.where(values <= DB_FLOOR, 0.0, np.power(10.0, values / 20)),
+            values,
+        )
+        scaled = linear * 1e6
+        converted = np.rint(scaled) / 1e6
+        distance = np.abs(scaled - np.floor(scaled) - 0.5)
+        boundary = ~np.isfinite(scaled) | (
+            distance <= BOUNDARY_ULPS * np.spacing(np.abs(scaled))
+        )
+
+    result: list[float] = converted.tolist()
+    for index in np.flatnonzero(boundary).tolist():
+        result[index] = pending.convert_scalar(index)
+
+    return result
+
+
+def scatter(chains: Iterable[list[Node]], converted: list[float]) -> None:
+    """
+    Replace the :class:`~ee2pw.lv2_wrapper.Pending` placeholders of parsed
+    nodes with their converted values.
+    """
+    for nodes in chains:
+        for node in nodes:
+            control = node.control
+            for port, value in control.items():
+                if type(value) is Pending:
+                    control[port] = converted[value.index]
+
+
+def parse_presets(configs: list[dict[Any, Any]]) -> list[list[Node]]:
+    """
+    Parse many EasyEffects presets, converting their float and dB settings
+    together.
+
+    Without NumPy, presets are parsed one by one by the scalar path.
+
+    :param configs: EasyEffects presets
+    :type configs: list[dict[Any, Any]]
+    :return: plugin nodes of every preset
+    :rtype: list[list[Node]]
+    """
+    if np is None:
+        return [parse_chain(config) for config in configs]
+
+    with span("parse_presets", presets=len(configs)), deferred() as pending:
+        chains = [parse_chain(config) for config in configs]
+
+    with span("convert_values", values=len(pending.values)):
+        scatter(chains, convert_values(pending))
+
+    return chains
+
+
+def build_chains(
+    configs: list[dict[Any, Any]], **build_options: Any
+) -> list[FilterChain]:
+    """
+    Build the filter graphs of many presets.
+
+    :param configs: EasyEffects presets
+    :param build_options: keyword arguments of :func:`ee2pw.core.run_passes`
+    :type configs: list[dict[Any, Any]]
+    :return: filter graph of every preset, not serialized yet
+    :rtype: list[FilterChain]
+    """
+    return [run_passes(nodes, **build_options) for nodes in parse_presets(configs)]
+
+
+def build_presets(
+    configs: list[dict[Any, Any]],
+    filter_chain_names: list[str],
+    smart_filter_target: str | None = None,
+    **build_options: Any,
+) -> list[dict]:
+    """
+    Build the filter chain configs of many presets, like :func:`ee2pw.core.build`.
+
+    :param configs: EasyEffects presets
+    :param filter_chain_names: filter chain name of every preset
+    :param smart_filter_target: smart filter target (if any)
+    :param build_options: keyword arguments of :func:`ee2pw.core.run_passes`
+    :type configs: list[dict[Any, Any]]
+    :type filter_chain_names: list[str]
+    :type smart_filter_target: str | None
+    :return: filter chain config of every preset
+    :rtype: list[dict]
+    """
+    return [
+        assemble(chain, name, smart_filter_target)
+        for chain, name in zip(
+            build_chains(configs, **build_options), filter_chain_names, strict=True
+        )
+    ]
@@ -0,0 +1,92 @@
+import hashlib, os, shutil
+from functools import lru_cache
+
+from . import __version__
+from .util import AtomicWriter, atomic_write
+
+
+def default_cache_dir() -> str:
+    """
+    Get the default cache directory, following the XDG base directory spec.
+
+    :return: cache directory path
+    :rtype: str
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "ee2pw")
+
+
+@lru_cache(maxsize=None)
+def source_digest() -> bytes:
+    """
+    Hash the ee2pw sources, so that cached outputs do not outlive the code
+    that wrote them, whether or not the version was bumped.
+
+    :return: digest of every module of the package
+    :rtype: bytes
+    """
+    package = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256(__version__.encode())
+
+    for name in sorted(os.listdir(package)):
+        if name.endswith(".py"):
+            digest.update(name.encode() + b"\x00")
+            with open(os.path.join(package, name), "rb") as f:
+                digest.update(f.read())
+
+    return digest.digest()
+
+
+def cache_key(preset: bytes, *options: str | None) -> str:
+    """
+    Hash preset content, conversion options and the ee2pw sources.
+
+    :param preset: raw preset file content
+    :param options: conversion options that affect the output
+    :type preset: bytes
+    :type options: str | None
+    :return: hex digest identifying the conversion
+    :rtype: str
+    """
+    digest = hashlib.sha256(source_digest())
+
+    for option in options:
+        # Keep None and "" apart so they do not share a cache entry.
+        digest.update(b"\x00" if option is None else b"\x01" + option.encode())
+        digest.update(b"\x1f")
+
+    digest.update(preset)
+    return digest.hexdigest()
+
+
+class ConversionCache:
+    """
+    On-disk cache of converted outputs, keyed by :func:`cache_key`.
+    """
+
+    def __init__(self, directory: str | None = None):
+        self.directory = directory or default_cache_dir()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key[2:])
+
+    def get(self, key: str) -> str | None:
+        try:
+            with open(self._path(key), "r") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key: str, data: str) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atomic_write(path, data)
+
+    def put_file(self, key: str, filepath: str) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(filepath, "r") as src, AtomicWriter(path, False) as dst:
+            shutil.copyfileobj(src, dst)
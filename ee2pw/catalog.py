@@ -0,0 +1,361 @@
+import argparse, hashlib, os, re, sqlite3, sys, warnings
+from typing import NamedTuple
+
+from . import __version__
+
+SCHEMA_VERSION = 1
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS presets (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT NOT NULL,
+    version TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS controls (
+    preset_id INTEGER NOT NULL REFERENCES presets (id) ON DELETE CASCADE,
+    node TEXT NOT NULL,
+    plugin TEXT NOT NULL,
+    port TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (preset_id, node, port)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS controls_by_port ON controls (plugin, port, value);
+"""
+
+AGGREGATES = ("sum", "count", "min", "max")
+OPERATORS = {
+    "<": "<",
+    "<=": "<=",
+    ">": ">",
+    ">=": ">=",
+    "=": "=",
+    "==": "=",
+    "!=": "!=",
+}
+
+CONDITION_PATTERN = re.compile(
+    r"""
+    ^\s*
+    (?:
+        (?P<aggregate>[a-z]+)\(\s*(?P<agg_plugin>[^:()\s]+):(?P<agg_port>[^()\s]+?)\s*\)
+      | (?P<plugin>[^:()\s]+):(?P<port>[^<>=!\s]+)
+    )
+    \s*(?P<op><=|>=|!=|==|=|<|>)\s*
+    (?P<value>\S+)
+    \s*$
+    """,
+    re.VERBOSE,
+)
+
+
+def default_catalog_path() -> str:
+    from .cache import default_cache_dir
+
+    return os.path.join(default_cache_dir(), "catalog.sqlite")
+
+
+class Condition(NamedTuple):
+    """
+    Filter on the control values of a plugin, such as ``limiter:lk>5``.
+
+    ``plugin`` and ``port`` are glob patterns. Without ``aggregate``, a preset
+    matches when one matching control satisfies the comparison. With one,
+    the aggregate of the matching controls of one plugin node is compared,
+    as in ``sum(multiband_compressor:cbe_*)>3``.
+    """
+
+    plugin: str
+    port: str
+    op: str
+    value: float
+    aggregate: str | None = None
+
+    def sql(self) -> tuple[str, tuple[str | float, ...]]:
+        params: tuple[str | float, ...] = (self.plugin, self.port, self.value)
+        op = OPERATORS[self.op]
+
+        if self.aggregate is None:
+            return (
+                "SELECT preset_id FROM controls "
+                f"WHERE plugin GLOB ? AND port GLOB ? AND value {op} ?",
+                params,
+            )
+
+        return (
+            "SELECT preset_id FROM controls WHERE plugin GLOB ? AND port GLOB ? "
+            f"GROUP BY preset_id, node HAVING {self.aggregate.upper()}(value) {op} ?",
+            params,
+        )
+
+
+def parse_condition(expression: str) -> Condition:
+    """
+    Parse a ``[aggregate(]plugin:port[)] <op> value`` filter.
+
+    :raises ValueError: if the expression is invalid
+    """
+    match = CONDITION_PATTERN.match(expression)
+    if match is None:
+        raise ValueError(
+            f"expected plugin:port<op>value or aggregate(plugin:port)<op>value, "
+            f"got {expression!r}"
+        )
+
+    aggregate = match["aggregate"]
+    if aggregate is not None and aggregate not in AGGREGATES:
+        raise ValueError(
+            f"unknown aggregate {aggregate}, expected one of {', '.join(AGGREGATES)}"
+        )
+
+    try:
+        value = float(match["value"])
+    except ValueError:
+        raise ValueError(f"invalid value in {expression!r}") from None
+
+    if aggregate is None:
+        return Condition(match["plugin"], match["port"], match["op"], value)
+    return Condition(
+        match["agg_plugin"], match["agg_port"], match["op"], value, aggregate
+    )
+
+
+class UpdateStats(NamedTuple):
+    indexed: int
+    unchanged: int
+    removed: int
+    failed: list[tuple[str, str]]
+
+    def format(self) -> str:
+        lines = [f"[FAIL] {path}: {error}" for path, error in self.failed]
+        lines.append(
+            f"{self.indexed} indexed, {self.unchanged} unchanged, "
+            f"{self.removed} removed, {len(self.failed)} failed"
+        )
+        return "\n".join(lines)
+
+
+def preset_controls(data: bytes) -> list[tuple[str, str, str, float]]:
+    """
+    Parse a preset into the normalized LV2 control values of its plugins.
+
+    :param data: raw preset file content
+    :type data: bytes
+    :return: node name, plugin base name, port and value of every control
+    :rtype: list[tuple[str, str, str, float]]
+    """
+    import json
+
+    from .core import parse_chain
+    from .registry import plugin_base_name
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        nodes = parse_chain(json.loads(data))
+
+    return [
+        (node.name, plugin_base_name(node.name), port, value)
+        for node in nodes
+        for port, value in node.control.items()
+    ]
+
+
+class Catalog:
+    """
+    SQLite index of the control values of parsed presets.
+
+    Presets are reparsed only when their mtime or size changed and their
+    content hash did too, or when they were indexed by another ee2pw version.
+    """
+
+    def __init__(self, path: str | None = None):
+        self.path = path or default_catalog_path()
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self.db = sqlite3.connect(self.path)
+        self.db.execute("PRAGMA foreign_keys = ON")
+
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.db.executescript(
+                "DROP TABLE IF EXISTS controls; DROP TABLE IF EXISTS presets;"
+            )
+            self.db.executescript(SCHEMA)
+            self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def __enter__(self) -> "Catalog":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.db.close()
+
+    def update(self, presets: list[str], prune: bool = True) -> UpdateStats:
+        """
+        Index presets, skipping those that did not change.
+
+        :param presets: paths to EasyEffects presets
+        :param prune: remove indexed presets whose file no longer exists
+        :type presets: list[str]
+        :type prune: bool
+        :return: what was indexed
+        :rtype: UpdateStats
+        """
+        indexed = unchanged = removed = 0
+        failed: list[tuple[str, str]] = []
+
+        with self.db:
+            for preset in presets:
+                path = os.path.abspath(preset)
+                try:
+                    if self._update_one(path):
+                        indexed += 1
+                    else:
+                        unchanged += 1
+                except FileNotFoundError:
+                    removed += self.db.execute(
+                        "DELETE FROM presets WHERE path = ?", (path,)
+                    ).rowcount
+                except Exception as e:
+                    self.db.execute("DELETE FROM presets WHERE path = ?", (path,))
+                    failed.append((preset, f"{type(e).__name__}: {e}"))
+
+            if prune:
+                for (path,) in self.db.execute("SELECT path FROM presets").fetchall():
+                    if not os.path.exists(path):
+                        self.db.execute("DELETE FROM presets WHERE path = ?", (path,))
+                        removed += 1
+
+        return UpdateStats(indexed, unchanged, removed, failed)
+
+    def _update_one(self, path: str) -> bool:
+        stat = os.stat(path)
+        row = self.db.execute(
+            "SELECT id, mtime_ns, size, hash, version FROM presets WHERE path = ?",
+            (path,),
+        ).fetchone()
+
+        if row is not None and row[1:3] == (stat.st_mtime_ns, stat.st_size):
+            if row[4] == __version__:
+                return False
+
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+
+        if row is not None and row[3] == digest and row[4] == __version__:
+            self.db.execute(
+                "UPDATE presets SET mtime_ns = ?, size = ? WHERE id = ?",
+                (stat.st_mtime_ns, stat.st_size, row[0]),
+            )
+            return False
+
+        controls = preset_controls(data)
+
+        if row is not None:
+            self.db.execute("DELETE FROM presets WHERE id = ?", (row[0],))
+        preset_id = self.db.execute(
+            "INSERT INTO presets (path, mtime_ns, size, hash, version) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (path, stat.st_mtime_ns, stat.st_size, digest, __version__),
+        ).lastrowid
+        self.db.executemany(
+            "INSERT INTO controls (preset_id, node, plugin, port, value) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(preset_id, *control) for control in controls],
+        )
+
+        return True
+
+    def query(self, conditions: list[Condition]) -> list[str]:
+        """
+        List the indexed presets matching every condition.
+
+        :param conditions: filters, all of which must match
+        :type conditions: list[Condition]
+        :return: preset paths, sorted
+        :rtype: list[str]
+        """
+        sql = "SELECT path FROM presets"
+        params: list[str | float] = []
+        clauses = []
+
+        for condition in conditions:
+            subquery, subparams = condition.sql()
+            clauses.append(f"id IN ({subquery})")
+            params.extend(subparams)
+
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+
+        return [path for (path,) in self.db.execute(sql + " ORDER BY path", params)]
+
+
+def main(argv: list[str] | None = None) -> int:
+    argparser = argparse.ArgumentParser(
+        prog="python -m ee2pw catalog",
+        description="Index presets in a SQLite catalog and query their controls.",
+        epilog="Conditions compare LV2 control values, e.g. limiter:lk>5, "
+        "or an aggregate over the ports of one plugin, e.g. "
+        "'sum(multiband_compressor:cbe_*)>3'. Plugins and ports are glob patterns.",
+    )
+
+    argparser.add_argument(
+        "presets",
+        type=str,
+        nargs="*",
+        help="Presets, globs or directories to index before querying.",
+    )
+    argparser.add_argument(
+        "--db",
+        type=str,
+        help="Catalog database (default: $XDG_CACHE_HOME/ee2pw/catalog.sqlite).",
+    )
+    argparser.add_argument(
+        "-w",
+        "--where",
+        type=str,
+        action="append",
+        default=[],
+        metavar="CONDITION",
+        help="Only list presets matching the condition (can be repeated).",
+    )
+    argparser.add_argument(
+        "--export",
+        type=str,
+        metavar="FILE",
+        help="Write the matching presets to FILE, one per line, for "
+        "python -m ee2pw @FILE -d OUTPUT_DIR.",
+    )
+
+    args = argparser.parse_args(argv)
+
+    try:
+        conditions = [parse_condition(expression) for expression in args.where]
+    except ValueError as e:
+        argparser.error(str(e))
+
+    with Catalog(args.db) as catalog:
+        if args.presets:
+            from .batch import collect_presets
+
+            stats = catalog.update(collect_presets(args.presets))
+            print(stats.format(), file=sys.stderr)
+
+        matches = catalog.query(conditions)
+
+    if args.export:
+        from .util import atomic_write
+
+        atomic_write(args.export, "".join(f"{path}\n" for path in matches))
+    elif matches:
+        print("\n".join(matches))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
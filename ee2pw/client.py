@@ -0,0 +1,153 @@
+import argparse, json, os, socket, sys
+from typing import Any
+
+# Only the standard library is imported here, so that a client call costs an
+# interpreter start and a socket round trip.
+
+
+def default_socket_path() -> str:
+    """
+    Get the default server socket, in ``$XDG_RUNTIME_DIR`` if set.
+
+    :return: Unix socket path
+    :rtype: str
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "ee2pw.sock")
+    return os.path.join("/tmp", f"ee2pw-{os.getuid()}.sock")
+
+
+def request(
+    message: dict[str, Any], socket_path: str | None = None, timeout: float = 60.0
+) -> dict[str, Any]:
+    """
+    Send one request to a conversion server and wait for its response.
+
+    :param message: request, see :mod:`ee2pw.server`
+    :param socket_path: server socket (default: :func:`default_socket_path`)
+    :param timeout: seconds to wait for the response
+    :type message: dict[str, Any]
+    :type socket_path: str | None
+    :type timeout: float
+    :raises OSError: if the server cannot be reached
+    :return: response
+    :rtype: dict[str, Any]
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path or default_socket_path())
+        sock.sendall(json.dumps(message).encode() + b"\n")
+        sock.shutdown(socket.SHUT_WR)
+
+        with sock.makefile("rb") as f:
+            line = f.readline()
+
+    if not line:
+        raise ConnectionError("the server closed the connection without responding")
+    return json.loads(line)
+
+
+def main(argv: list[str] | None = None) -> int:
+    argparser = argparse.ArgumentParser(
+        prog="python -m ee2pw client",
+        description="Convert a preset with a running python -m ee2pw serve.",
+    )
+
+    argparser.add_argument(
+        "filename",
+        type=str,
+        help="Path to the EasyEffects configuration file, or - to send the "
+        "preset read from stdin.",
+    )
+    argparser.add_argument(
+        "-n", "--filter-chain-name", type=str, help="Filter chain name."
+    )
+    argparser.add_argument(
+        "-t", "--smart-filter-target", type=str, help="Smart filter target (if any)."
+    )
+    argparser.add_argument(
+        "-o", "--output", type=str, help="File output (default: stdout)."
+    )
+    argparser.add_argument(
+        "-f",
+        "--format",
+        type=str,
+        choices=["json", "conf"],
+        default="json",
+        help="Output format: strict JSON, or PipeWire SPA-JSON .conf (default: json).",
+    )
+    argparser.add_argument(
+        "--compact", action="store_true", help="Write the output on a single line."
+    )
+    argparser.add_argument(
+        "-O", "--optimize", action="store_true", help="Remove no-op plugins."
+    )
+    argparser.add_argument(
+        "--fuse-filters", action="store_true", help="Merge consecutive filters."
+    )
+    argparser.add_argument(
+        "--latency", action="store_true", help="Report the estimated latency."
+    )
+    argparser.add_argument(
+        "--sparse", action="store_true", help="Omit the LV2 default controls."
+    )
+    argparser.add_argument(
+        "--split", type=int, metavar="N", help="Spread over up to N filter chains."
+    )
+    argparser.add_argument(
+        "--data-loops", type=int, metavar="N", help="Pin split chains to N loops."
+    )
+    argparser.add_argument(
+        "--validate", action="store_true", help="Check the output against LV2_PATH."
+    )
+    argparser.add_argument(
+        "--socket",
+        type=str,
+        help="Server socket (default: $XDG_RUNTIME_DIR/ee2pw.sock).",
+    )
+
+    args = argparser.parse_args(argv)
+
+    message: dict[str, Any] = {
+        "name": args.filter_chain_name,
+        "target": args.smart_filter_target,
+        "format": args.format,
+        "compact": args.compact,
+        "optimize": args.optimize,
+        "fuse_filters": args.fuse_filters,
+        "latency": args.latency,
+        "sparse": args.sparse,
+        "split": args.split,
+        "data_loops": args.data_loops,
+        "validate": args.validate,
+    }
+
+    if args.filename == "-":
+        message["config"] = json.load(sys.stdin)
+    else:
+        message["preset"] = os.path.abspath(args.filename)
+    if args.output:
+        message["output"] = os.path.abspath(args.output)
+
+    try:
+        response = request(message, args.socket)
+    except OSError as e:
+        print(f"cannot reach the ee2pw server: {e}", file=sys.stderr)
+        return 2
+
+    for line in response.get("report", []):
+        print(line, file=sys.stderr)
+
+    if not response.get("ok"):
+        print(response.get("error", "conversion failed"), file=sys.stderr)
+        return 1
+
+    if "text" in response:
+        sys.stdout.write(response["text"])
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
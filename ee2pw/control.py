@@ -0,0 +1,267 @@
+import argparse, subprocess, sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import IO
+
+from .spa_json import dumps_value
+from .util import db_to_linear, format_6f
+
+DB_SUFFIX = "dB"
+
+MULTIBAND_COMPRESSOR_NODE = "multiband_compressor_0"
+
+
+def set_param_args(node_id: int, changes: dict[str, float]) -> list[str]:
+    """
+    Get the arguments of a ``pw-cli`` ``set-param`` command updating several
+    controls in one Props update.
+
+    :param node_id: filter chain node id
+    :param changes: control values keyed by ``<plugin node>:<port>``
+    :type node_id: int
+    :type changes: dict[str, float]
+    :return: command arguments, the Props object being the last one
+    :rtype: list[str]
+    """
+    params: list[str | float] = []
+    for key, value in changes.items():
+        params.extend((key, value))
+
+    return ["set-param", str(node_id), "Props", dumps_value({"params": params})]
+
+
+def set_param_line(node_id: int, changes: dict[str, float]) -> str:
+    """
+    Format :func:`set_param_args` as a line of an interactive ``pw-cli``.
+    """
+    return " ".join(set_param_args(node_id, changes))
+
+
+class ControlSession:
+    """
+    Update the controls of a running filter chain through one ``pw-cli``
+    process.
+
+    Changes are queued and sent as a single ``set-param`` Props update by
+    :meth:`flush`. Outside of :meth:`batch`, every change is sent right away.
+    The session is a context manager that flushes and closes ``pw-cli`` on
+    exit.
+    """
+
+    def __init__(
+        self,
+        node_id: int,
+        pw_cli: str = "pw-cli",
+        known_controls: set[str] | None = None,
+    ):
+        """
+        :param node_id: filter chain node id
+        :param pw_cli: pw-cli executable
+        :param known_controls: controls of the running graph, to reject typos
+            before they reach PipeWire (if any)
+        :type node_id: int
+        :type pw_cli: str
+        :type known_controls: set[str] | None
+        """
+        self.node_id = node_id
+        self.pw_cli = pw_cli
+        self.known_controls = known_controls
+        self.pending: dict[str, float] = {}
+        self._batching = 0
+        self._process: subprocess.Popen | None = None
+
+    def __enter__(self) -> "ControlSession":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _stdin(self) -> IO[str]:
+        if self._process is None:
+            self._process = subprocess.Popen(
+                [self.pw_cli],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                text=True,
+            )
+        return self._process.stdin  # type: ignore[return-value]
+
+    def set(self, node: str, port: str, value: float) -> None:
+        """
+        Set a control to a raw value, as written in the filter graph.
+        """
+        key = f"{node}:{port}"
+        if self.known_controls is not None and key not in self.known_controls:
+            raise KeyError(f"unknown control: {key}")
+
+        self.pending[key] = float(value)
+        if not self._batching:
+            self.flush()
+
+    def set_db(self, node: str, port: str, db: float) -> None:
+        """
+        Set a gain control from a value in dB.
+        """
+        self.set(node, port, format_6f(db_to_linear(db)))
+
+    def set_input_gain(self, db: float, node: str = MULTIBAND_COMPRESSOR_NODE) -> None:
+        self.set_db(node, "g_in", db)
+
+    def set_output_gain(self, db: float, node: str = MULTIBAND_COMPRESSOR_NODE) -> None:
+        self.set_db(node, "g_out", db)
+
+    def set_makeup_gain(
+        self, band: int, db: float, node: str = MULTIBAND_COMPRESSOR_NODE
+    ) -> None:
+        self.set_db(node, f"mk_{band}", db)
+
+    def set_attack_threshold(
+        self, band: int, db: float, node: str = MULTIBAND_COMPRESSOR_NODE
+    ) -> None:
+        self.set_db(node, f"al_{band}", db)
+
+    @contextmanager
+    def batch(self) -> Iterator["ControlSession"]:
+        """
+        Queue every change made in the block and send them as one update.
+
+        Nothing is sent if the block raises.
+        """
+        self._batching += 1
+        try:
+            yield self
+        except BaseException:
+            self.pending.clear()
+            raise
+        finally:
+            self._batching -= 1
+            if not self._batching:
+                self.flush()
+
+    def flush(self) -> str | None:
+        """
+        Send the queued changes.
+
+        :return: the ``set-param`` command sent, or None if nothing was queued
+        :rtype: str | None
+        """
+        if not self.pending:
+            return None
+
+        line = set_param_line(self.node_id, self.pending)
+        self.pending = {}
+
+        stdin = self._stdin()
+        stdin.write(line + "\n")
+        stdin.flush()
+
+        return line
+
+    def close(self) -> None:
+        self.flush()
+
+        if self._process is not None:
+            self._process.stdin.close()  # type: ignore[union-attr]
+            self._process.wait()
+            self._process = None
+
+
+def parse_assignment(assignment: str) -> tuple[str, str, float, bool]:
+    """
+    Parse a ``<plugin node>:<port>=<value>[dB]`` assignment.
+
+    :return: plugin node, port, value and whether the value is in dB
+    :rtype: tuple[str, str, float, bool]
+    """
+    key, sep, value = assignment.partition("=")
+    node, colon, port = key.partition(":")
+
+    if not (sep and colon and node and port and value):
+        raise ValueError(f"expected <node>:<port>=<value>[dB], got {assignment!r}")
+
+    is_db = value.endswith(DB_SUFFIX)
+    if is_db:
+        value = value[: -len(DB_SUFFIX)]
+
+    return node, port, float(value), is_db
+
+
+def apply_assignments(session: ControlSession, assignments: list[str]) -> None:
+    parsed = [parse_assignment(assignment) for assignment in assignments]
+
+    with session.batch():
+        for node, port, value, is_db in parsed:
+            if is_db:
+                session.set_db(node, port, value)
+            else:
+                session.set(node, port, value)
+
+
+def main(argv: list[str] | None = None) -> int:
+    from .apply import find_filter_chain
+    from .pipewire import PwDumpIndex
+
+    argparser = argparse.ArgumentParser(
+        prog="python -m ee2pw control",
+        description="Set filter chain controls through a single pw-cli session.",
+        epilog="Values ending in dB are converted to linear gains, e.g. "
+        "multiband_compressor_0:mk_2=3dB.",
+    )
+
+    argparser.add_argument(
+        "assignments",
+        type=str,
+        nargs="*",
+        metavar="NODE:PORT=VALUE",
+        help="Controls to set in one update. With -, more updates are read "
+        "from standard input, one line of assignments per update.",
+    )
+    target = argparser.add_mutually_exclusive_group(required=True)
+    target.add_argument(
+        "-n", "--filter-chain-name", type=str, help="Filter chain name."
+    )
+    target.add_argument("--node-id", type=int, help="Filter chain node id.")
+    argparser.add_argument(
+        "--pw-dump",
+        type=str,
+        help="Saved pw-dump JSON to read instead of running pw-dump.",
+    )
+    argparser.add_argument(
+        "--pw-cli", type=str, default="pw-cli", help="pw-cli executable."
+    )
+
+    args = argparser.parse_args(argv)
+
+    known_controls: set[str] | None = None
+
+    if args.node_id is not None:
+        node_id = args.node_id
+    else:
+        running = find_filter_chain(
+            PwDumpIndex.load(args.pw_dump), args.filter_chain_name
+        )
+        if running is None:
+            argparser.error(f"filter chain {args.filter_chain_name} is not running")
+        node_id, controls = running
+        known_controls = set(controls)
+
+    read_stdin = "-" in args.assignments
+    assignments = [a for a in args.assignments if a != "-"]
+
+    try:
+        with ControlSession(node_id, args.pw_cli, known_controls) as session:
+            if assignments:
+                apply_assignments(session, assignments)
+
+            if read_stdin:
+                for line in sys.stdin:
+                    if line.strip():
+                        apply_assignments(session, line.split())
+    except (KeyError, ValueError) as e:
+        argparser.error(str(e).strip("'\""))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
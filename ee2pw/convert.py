@@ -0,0 +1,252 @@
+import json, os
+from typing import TYPE_CHECKING, Any, NamedTuple, TextIO
+
+from .core import build
+from .trace import span
+from .util import AtomicWriter, write_if_changed
+
+if TYPE_CHECKING:
+    from .cache import ConversionCache
+
+OUTPUT_FORMATS = ("json", "conf")
+OUTPUT_SUFFIXES = {"json": ".json", "conf": ".conf"}
+
+
+class ConversionOptions(NamedTuple):
+    filter_chain_name: str | None = None
+    smart_filter_target: str | None = None
+    output_format: str = "json"
+    compact: bool = False
+    optimize: bool = False
+    fuse_filters: bool = False
+    latency: bool = False
+    sample_rate: int | None = None
+    max_latency: float | None = None
+    latency_policy: str = "fail"
+    sparse: bool = False
+    split: int | None = None
+    validate: bool = False
+    data_loops: int | None = None
+
+    def cache_options(self) -> tuple[str | None, ...]:
+        return (
+            self.filter_chain_name,
+            self.smart_filter_target,
+            self.output_format,
+            "compact" if self.compact else "pretty",
+            "optimize" if self.optimize else "",
+            "fuse-filters" if self.fuse_filters else "",
+            "latency" if self.latency else "",
+            None if self.sample_rate is None else str(self.sample_rate),
+            None if self.max_latency is None else repr(self.max_latency),
+            self.latency_policy,
+            "sparse" if self.sparse else "",
+            None if self.split is None else str(self.split),
+            "validate" if self.validate else "",
+            None if self.data_loops is None else str(self.data_loops),
+        )
+
+    @property
+    def reports(self) -> bool:
+        """
+        Whether the conversion reports on optional passes, which cached
+        outputs do not keep.
+        """
+        return bool(
+            self.optimize
+            or self.fuse_filters
+            or self.latency
+            or self.max_latency is not None
+            or self.sparse
+            or (self.split is not None and self.split > 1)
+            or self.validate
+        )
+
+
+def default_filter_chain_name(filepath: str) -> str:
+    """
+    Derive a filter chain name from a preset file name.
+
+    :param filepath: path to the EasyEffects preset
+    :type filepath: str
+    :return: preset file name without extension
+    :rtype: str
+    """
+    return os.path.splitext(os.path.basename(filepath))[0]
+
+
+def dump(
+    result: dict, fp: TextIO, output_format: str = "json", compact: bool = False
+) -> None:
+    """
+    Write a filter chain config.
+
+    :param result: filter chain config, as returned by :func:`ee2pw.core.build`
+    :param fp: text file to write to
+    :param output_format: ``json`` for strict JSON, ``conf`` for SPA-JSON
+    :param compact: write everything on one line
+    :type result: dict
+    :type fp: TextIO
+    :type output_format: str
+    :type compact: bool
+    """
+    if output_format == "conf":
+        from . import spa_json
+
+        spa_json.dump(result, fp, indent=None if compact else spa_json.INDENT)
+    elif output_format == "json":
+        if compact:
+            json.dump(result, fp, separators=(",", ":"))
+        else:
+            json.dump(result, fp, indent=2)
+    else:
+        raise ValueError(f"unknown output format: {output_format}")
+
+
+def serialize(result: dict, output_format: str = "json", compact: bool = False) -> str:
+    """
+    Serialize a filter chain config.
+
+    :param result: filter chain config, as returned by :func:`ee2pw.core.build`
+    :param output_format: ``json`` for strict JSON, ``conf`` for SPA-JSON
+    :param compact: write everything on one line
+    :type result: dict
+    :type output_format: str
+    :type compact: bool
+    :return: serialized config
+    :rtype: str
+    """
+    from io import StringIO
+
+    fp = StringIO()
+    dump(result, fp, output_format, compact)
+    return fp.getvalue()
+
+
+def convert_config(
+    config: dict[Any, Any],
+    options: ConversionOptions,
+    report: dict[str, Any] | None = None,
+) -> dict:
+    """
+    Build the filter chain config of a loaded EasyEffects preset and validate
+    it if asked to. When validating, ``sparse`` also omits the controls equal
+    to the defaults of the installed plugins.
+
+    :param config: EasyEffects preset
+    :param options: conversion options, with the filter chain name set
+    :param report: filled with the reports of the optional passes (if any)
+    :type config: dict[Any, Any]
+    :type options: ConversionOptions
+    :type report: dict[str, Any] | None
+    :raises ValueError: if the chain does not fit the latency budget, or does
+        not validate against the LV2 path
+    :return: filter chain config
+    :rtype: dict
+    """
+    index = None
+    if options.validate:
+        from .lv2_index import shared_index
+
+        with span("lv2_index"):
+            index = shared_index()
+
+    with span("build", filter_chain=options.filter_chain_name):
+        result: dict[str, Any] = build(
+            config,
+            options.filter_chain_name,
+            options.smart_filter_target,
+            optimize=options.optimize,
+            fuse_filters=options.fuse_filters,
+            latency=options.latency,
+            sample_rate=options.sample_rate,
+            max_latency=options.max_latency,
+            latency_policy=options.latency_policy,
+            sparse=options.sparse,
+            lv2_index=index,
+            split=options.split,
+            data_loops=options.data_loops,
+            report=report,
+        )
+
+    if index is not None:
+        from .lv2_index import validate_config
+
+        with span("validate"):
+            validation = validate_config(result, index)
+        if not validation.ok:
+            raise ValueError(validation.format())
+        if report is not None:
+            report["validation"] = validation
+
+    return result
+
+
+def convert_file(
+    filepath: str,
+    output: str,
+    options: ConversionOptions = ConversionOptions(),
+    cache: "ConversionCache | None" = None,
+    report: dict[str, Any] | None = None,
+) -> bool:
+    """
+    Convert one EasyEffects preset and write the filter chain config.
+
+    The output is streamed to a temporary file that only replaces ``output``
+    when its content changes. With a cache, presets that were converted before
+    with the same options skip parsing, unless the reports of the optional
+    passes are asked for or the output is validated. With ``validate``, the
+    output is only written if its plugins and ports are found in the LV2 path.
+
+    :param filepath: path to the EasyEffects preset
+    :param output: path of the file to write
+    :param options: conversion options, the filter chain name defaults to the
+        preset name
+    :param cache: conversion cache (if any)
+    :param report: filled with the reports of the optional passes (if any)
+    :type filepath: str
+    :type output: str
+    :type options: ConversionOptions
+    :type cache: ConversionCache | None
+    :type report: dict[str, Any] | None
+    :raises ValueError: if the chain does not fit the latency budget, or does
+        not validate against the LV2 path
+    :return: True if the output file was written
+    :rtype: bool
+    """
+    if not options.filter_chain_name:
+        options = options._replace(
+            filter_chain_name=default_filter_chain_name(filepath)
+        )
+
+    with span("read", path=filepath), open(filepath, "rb") as f:
+        preset: bytes = f.read()
+
+    key: str | None = None
+    # Validation depends on the installed plugins, not only on the preset.
+    lookup = not options.validate and (report is None or not options.reports)
+
+    if cache is not None:
+        from .cache import cache_key
+
+        with span("cache_lookup"):
+            key = cache_key(preset, *options.cache_options())
+            data = cache.get(key) if lookup else None
+
+        if data is not None:
+            return write_if_changed(output, data)
+
+    with span("load_config", path=filepath):
+        config = json.loads(preset)
+
+    result = convert_config(config, options, report)
+
+    writer = AtomicWriter(output)
+
+    with span("dump", format=options.output_format), writer as fp:
+        dump(result, fp, options.output_format, options.compact)
+
+    if cache is not None and key is not None:
+        cache.put_file(key, output)
+
+    return writer.changed
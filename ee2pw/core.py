@@ -1,46 +1,298 @@
-from typing import Any
+import warnings
+from typing import TYPE_CHECKING, Any
 
-from .filter import parse_filter
-from .limiter import parse_limiter
-from .links import create_inputs, create_links, create_outputs
-from .bass_enhancer import parse_bass_enhancer
-from .stereo_tools import parse_stereo_tools
-from .multiband_compressor import parse_multiband_compressor
+from .ir import FilterChain, Node, as_node
+from .registry import get_parser, plugin_base_name
+from .trace import span
 
 from .util import load_config
 
+if TYPE_CHECKING:
+    from .lv2_index import LV2Index
+
 AUDIO_CHANNELS = 2
 AUDIO_POSITION = ["FL", "FR"]
 
+PASSTHROUGH_NODES = ["copy_l", "copy_r"]
+
 
 def builder(
     filepath: str,
     filter_chain_name: str,
     smart_filter_target: str | None = None,
+    *,
+    optimize: bool = False,
+    fuse_filters: bool = False,
+    latency: bool = False,
+    sample_rate: int | None = None,
+    max_latency: float | None = None,
+    latency_policy: str = "fail",
+    sparse: bool = False,
+    lv2_index: "LV2Index | None" = None,
+    split: int | None = None,
+    data_loops: int | None = None,
+    report: dict[str, Any] | None = None,
 ) -> dict:
-    config: dict[Any, Any] = load_config(filepath)
+    with span("load_config", path=filepath):
+        config: dict[Any, Any] = load_config(filepath)
+
+    return build(
+        config,
+        filter_chain_name,
+        smart_filter_target,
+        optimize=optimize,
+        fuse_filters=fuse_filters,
+        latency=latency,
+        sample_rate=sample_rate,
+        max_latency=max_latency,
+        latency_policy=latency_policy,
+        sparse=sparse,
+        lv2_index=lv2_index,
+        split=split,
+        data_loops=data_loops,
+        report=report,
+    )
+
+
+def build(
+    config: dict[Any, Any],
+    filter_chain_name: str,
+    smart_filter_target: str | None = None,
+    *,
+    optimize: bool = False,
+    fuse_filters: bool = False,
+    latency: bool = False,
+    sample_rate: int | None = None,
+    max_latency: float | None = None,
+    latency_policy: str = "fail",
+    sparse: bool = False,
+    lv2_index: "LV2Index | None" = None,
+    split: int | None = None,
+    data_loops: int | None = None,
+    report: dict[str, Any] | None = None,
+) -> dict:
+    """
+    Build a PipeWire filter chain config from an EasyEffects preset.
+
+    :param config: EasyEffects preset
+    :param filter_chain_name: filter chain name
+    :param smart_filter_target: smart filter target (if any)
+    :param optimize: remove nodes that cannot affect the audio
+    :param fuse_filters: merge consecutive filters into parametric equalizers
+    :param latency: estimate the chain latency and report it
+    :param sample_rate: sample rate of the latency estimate (default: 48000)
+    :param max_latency: latency budget in milliseconds, implies ``latency``
+    :param latency_policy: ``fail`` or ``downgrade`` when over the budget
+    :param sparse: omit the controls equal to their LV2 default
+    :param lv2_index: index of the installed plugins, whose defaults
+        ``sparse`` also omits (if any)
+    :param split: spread the chain over up to this many filter chain modules
+    :param data_loops: number of PipeWire data loops to pin split modules to
+    :param report: filled with the reports of the optional passes (if any)
+    :type config: dict[Any, Any]
+    :type filter_chain_name: str
+    :type smart_filter_target: str | None
+    :type optimize: bool
+    :type fuse_filters: bool
+    :type latency: bool
+    :type sample_rate: int | None
+    :type max_latency: float | None
+    :type latency_policy: str
+    :type sparse: bool
+    :type lv2_index: LV2Index | None
+    :type split: int | None
+    :type data_loops: int | None
+    :type report: dict[str, Any] | None
+    :raises ValueError: if the chain does not fit the latency budget
+    :return: filter chain config
+    :rtype: dict
+    """
+    chain = build_chain(
+        config,
+        optimize=optimize,
+        fuse_filters=fuse_filters,
+        latency=latency,
+        sample_rate=sample_rate,
+        max_latency=max_latency,
+        latency_policy=latency_policy,
+        sparse=sparse,
+        lv2_index=lv2_index,
+        report=report,
+    )
+
+    if split is not None and split > 1:
+        from .split import assemble_stages, split_chain
+
+        with span("split", parts=split):
+            stages, split_report = split_chain(
+                chain, split, filter_chain_name, data_loops
+            )
+        if report is not None:
+            report["split"] = split_report
+        if len(stages) > 1:
+            return assemble_stages(
+                stages, filter_chain_name, smart_filter_target, data_loops
+            )
+
+    return assemble(chain, filter_chain_name, smart_filter_target)
+
+
+def build_chain(
+    config: dict[Any, Any],
+    *,
+    optimize: bool = False,
+    fuse_filters: bool = False,
+    latency: bool = False,
+    sample_rate: int | None = None,
+    max_latency: float | None = None,
+    latency_policy: str = "fail",
+    sparse: bool = False,
+    lv2_index: "LV2Index | None" = None,
+    report: dict[str, Any] | None = None,
+) -> FilterChain:
+    """
+    Parse an EasyEffects preset into a filter graph and run the optional
+    passes over it.
+
+    The options are those of :func:`build`, except ``split`` and
+    ``data_loops``.
+
+    :param config: EasyEffects preset
+    :type config: dict[Any, Any]
+    :raises ValueError: if the chain does not fit the latency budget
+    :return: filter graph, not serialized yet
+    :rtype: FilterChain
+    """
+    return run_passes(
+        parse_chain(config),
+        optimize=optimize,
+        fuse_filters=fuse_filters,
+        latency=latency,
+        sample_rate=sample_rate,
+        max_latency=max_latency,
+        latency_policy=latency_policy,
+        sparse=sparse,
+        lv2_index=lv2_index,
+        report=report,
+    )
+
+
+def run_passes(
+    nodes: list[Node],
+    *,
+    optimize: bool = False,
+    fuse_filters: bool = False,
+    latency: bool = False,
+    sample_rate: int | None = None,
+    max_latency: float | None = None,
+    latency_policy: str = "fail",
+    sparse: bool = False,
+    lv2_index: "LV2Index | None" = None,
+    report: dict[str, Any] | None = None,
+) -> FilterChain:
+    """
+    Run the optional passes over parsed nodes and link them into a graph.
+
+    The options are those of :func:`build`.
+
+    :param nodes: parsed plugin nodes, in chain order
+    :type nodes: list[Node]
+    :raises ValueError: if the chain does not fit the latency budget
+    :return: filter graph, not serialized yet
+    :rtype: FilterChain
+    """
+    if optimize:
+        from .optimizer import optimize_nodes
+
+        with span("optimize"):
+            nodes, optimization = optimize_nodes(nodes)
+        if report is not None:
+            report["optimizer"] = optimization
+
+    if fuse_filters:
+        from .optimizer import fuse_filters as fuse
+
+        with span("fuse_filters"):
+            nodes, fusion = fuse(nodes)
+        if report is not None:
+            report["fusion"] = fusion
+
+    if latency or max_latency is not None:
+        from . import latency as latency_model
+
+        with span("latency"):
+            estimate = latency_model.apply_latency_budget(
+                nodes,
+                sample_rate or latency_model.DEFAULT_SAMPLE_RATE,
+                max_latency,
+                latency_policy,
+            )
+        if report is not None:
+            report["latency"] = estimate
+
+    if sparse:
+        from .sparse import sparse_controls
+
+        with span("sparse"):
+            sparseness = sparse_controls(nodes, lv2_index)
+        if report is not None:
+            report["sparse"] = sparseness
+
+    if nodes:
+        with span("links", nodes=len(nodes)):
+            chain = FilterChain.serial(nodes)
+    else:
+        chain = FilterChain.passthrough(PASSTHROUGH_NODES)
+
+    return chain
+
+
+def parse_chain(config: dict[Any, Any]) -> list[Node]:
+    """
+    Parse the plugins of an EasyEffects preset, in chain order.
+
+    Unsupported plugins are skipped with a warning.
+
+    :param config: EasyEffects preset
+    :type config: dict[Any, Any]
+    :return: plugin nodes
+    :rtype: list[Node]
+    """
     ee_output: dict[Any, Any] = config.get("output", {})
     plugins: dict[str, str] = {
         str(plugin): str(plugin).replace("#", "_")
         for plugin in ee_output.get("plugins_order", [])
     }
 
-    nodes: list[dict[str, str | dict[str, float]]] = [
-        parse_node(ee_output.get(ee_plugin, {}), pw_node_name)
-        for ee_plugin, pw_node_name in plugins.items()
-    ]
+    nodes: list[Node] = []
 
-    links: list[dict[str, str]] = create_links(list(plugins.values()))
-    inputs: list[str] = create_inputs(list(plugins.values()))
-    outputs: list[str] = create_outputs(list(plugins.values()))
+    for ee_plugin, pw_node_name in plugins.items():
+        node = parse_node(ee_output.get(ee_plugin, {}), pw_node_name)
+        if node is None:
+            warnings.warn(f"unsupported plugin {ee_plugin} skipped", stacklevel=3)
+            continue
+        nodes.append(node)
+
+    return nodes
 
-    filter_graph: dict[str, list] = {
-        "nodes": nodes,
-        "links": links,
-        "inputs": inputs,
-        "outputs": outputs,
-    }
 
+def assemble(
+    chain: FilterChain,
+    filter_chain_name: str,
+    smart_filter_target: str | None = None,
+) -> dict:
+    """
+    Serialize a filter graph into a PipeWire filter chain config.
+
+    :param chain: filter graph
+    :param filter_chain_name: filter chain name
+    :param smart_filter_target: smart filter target (if any)
+    :type chain: FilterChain
+    :type filter_chain_name: str
+    :type smart_filter_target: str | None
+    :return: filter chain config
+    :rtype: dict
+    """
     capture_props: dict[str, Any] = create_capture_props(
         filter_chain_name, smart_filter_target
     )
@@ -49,46 +301,74 @@ def builder(
         filter_chain_name, smart_filter_target
     )
 
+    module = create_module(chain, filter_chain_name, capture_props, playback_props)
+
+    return {"context.modules": [module]}
+
+
+def create_module(
+    chain: FilterChain,
+    filter_chain_name: str,
+    capture_props: dict[str, Any],
+    playback_props: dict[str, Any],
+) -> dict[str, Any]:
+    """
+    Create a filter chain module.
+
+    :param chain: filter graph
+    :param filter_chain_name: filter chain name
+    :param capture_props: capture node properties
+    :param playback_props: playback node properties
+    :type chain: FilterChain
+    :type filter_chain_name: str
+    :type capture_props: dict[str, Any]
+    :type playback_props: dict[str, Any]
+    :return: ``libpipewire-module-filter-chain`` module
+    :rtype: dict[str, Any]
+    """
     args = {
         "node.description": filter_chain_name,
         "media.name": filter_chain_name,
-        "filter.graph": filter_graph,
+        "filter.graph": chain.to_dict(),
         "audio.channels": AUDIO_CHANNELS,
         "audio.position": AUDIO_POSITION,
         "capture.props": capture_props,
         "playback.props": playback_props,
     }
 
-    module = {
+    return {
         "name": "libpipewire-module-filter-chain",
         "args": args,
     }
 
-    return {"context.modules": [module]}
 
+def parse_node(config: dict[str, Any], ee_id: str) -> Node | None:
+    plugin = plugin_base_name(ee_id)
+    parser = get_parser(plugin)
+    if parser is None:
+        return None
 
-def parse_node(config: dict[str, Any], ee_id: str) -> dict[str, str | dict[str, float]]:
-    if ee_id.startswith("bass_enhancer"):
-        return parse_bass_enhancer(config, ee_id)
-    elif ee_id.startswith("filter"):
-        return parse_filter(config, ee_id)
-    elif ee_id.startswith("limiter"):
-        return parse_limiter(config, ee_id)
-    elif ee_id.startswith("multiband_compressor"):
-        return parse_multiband_compressor(config, ee_id)
-    elif ee_id.startswith("stereo_tools"):
-        return parse_stereo_tools(config, ee_id)
+    with span("parse", plugin=plugin, node=ee_id):
+        return as_node(parser(config, ee_id))
 
-    return {}
+
+def snake_case(filter_chain_name: str) -> str:
+    return filter_chain_name.replace(" ", "_").lower()
+
+
+def capture_node_name(filter_chain_name: str) -> str:
+    return f"input.{snake_case(filter_chain_name)}"
+
+
+def playback_node_name(filter_chain_name: str) -> str:
+    return f"output.{snake_case(filter_chain_name)}"
 
 
 def create_capture_props(
     filter_chain_name: str, smart_filter_target: str | None = None
 ) -> dict[str, Any]:
-    snake_case_filtered_chain_name = filter_chain_name.replace(" ", "_").lower()
-
     capture_props: dict[str, Any] = {
-        "node.name": f"input.{snake_case_filtered_chain_name}",
+        "node.name": capture_node_name(filter_chain_name),
         "media.class": "Audio/Sink",
     }
 
@@ -107,11 +387,9 @@ def create_capture_props(
 def create_playback_props(
     filter_chain_name: str, smart_filter_target: str | None = None
 ) -> dict[str, Any]:
-    snake_case_filter_chain_name = filter_chain_name.replace(" ", "_").lower()
-
     playback_props: dict[str, Any] = {
         "target.object": smart_filter_target,
-        "node.name": f"output.{snake_case_filter_chain_name}",
+        "node.name": playback_node_name(filter_chain_name),
         "node.passive": True,
     }
 
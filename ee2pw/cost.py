@@ -0,0 +1,229 @@
+import re
+from typing import Any, NamedTuple
+
+from .bass_enhancer import PLUGIN_URI as BASS_ENHANCER_URI
+from .equalizer import PLUGIN_URI_PREFIX as EQUALIZER_URI_PREFIX
+from .filter import PLUGIN_URI as FILTER_URI
+from .ir import Node
+from .limiter import LIMITER_OVS_MAP, PLUGIN_URI as LIMITER_URI
+from .multiband_compressor import PLUGIN_URI as MULTIBAND_COMPRESSOR_URI
+from .stereo_tools import PLUGIN_URI as STEREO_TOOLS_URI
+
+# Relative DSP cost, a stereo IIR filter with an x1 slope being 1.0. Every
+# plugin instance pays a fixed overhead on top of its processing.
+INSTANCE_OVERHEAD_COST = 0.5
+FILTER_BAND_COST = 0.5  # per x1 biquad cascade
+FIR_FILTER_FACTOR = 4.0  # FIR/FFT/SPM modes over IIR
+LIMITER_COST = 2.5
+MULTIBAND_BAND_COST = 1.0
+LINEAR_PHASE_FACTOR = 2.0  # FFT crossover over IIR crossover
+DEFAULT_NODE_COST = 1.0
+
+# Plugins whose cost does not depend on their controls.
+FIXED_NODE_COSTS: dict[str, float] = {
+    BASS_ENHANCER_URI: 1.5,
+    STEREO_TOOLS_URI: 0.5,
+}
+
+# Filter slope value (FILTER_S_MAP, EQUALIZER_S_MAP) -> biquads per band.
+SLOPE_ORDERS = (1, 2, 3, 4, 6, 8, 12, 16)
+
+IIR_MODE = 0.0
+LINEAR_PHASE_MODE = 2.0
+
+# Limiter oversampling value -> oversampling factor. True peak detection
+# oversamples 4 times.
+LIMITER_OVS_FACTORS: dict[float, int] = {
+    value: int(match.group(1)) if (match := re.search(r"x(\d+)", name)) else 1
+    for name, value in LIMITER_OVS_MAP.items()
+}
+LIMITER_OVS_FACTORS.update(
+    {LIMITER_OVS_MAP["True Peak/16 bit"]: 4, LIMITER_OVS_MAP["True Peak/24 bit"]: 4}
+)
+
+
+class NodeCost(NamedTuple):
+    name: str
+    plugin: str
+    cost: float
+
+
+class ChainCost(NamedTuple):
+    name: str
+    nodes: list[NodeCost]
+
+    @property
+    def total(self) -> float:
+        return sum(node.cost for node in self.nodes)
+
+    def format(self) -> str:
+        lines = [
+            f"{node.cost:8.2f}  {node.name} ({node.plugin.rpartition('/')[2]})"
+            for node in self.nodes
+        ]
+        lines.append(f"{self.total:8.2f}  total for {self.name}")
+        return "\n".join(lines)
+
+
+def slope_order(slope: float) -> int:
+    return SLOPE_ORDERS[min(int(slope), len(SLOPE_ORDERS) - 1)]
+
+
+def filter_cost(control: dict[str, float]) -> float:
+    cost = FILTER_BAND_COST * slope_order(control.get("s", 0.0))
+    if control.get("mode", IIR_MODE) != IIR_MODE:
+        cost *= FIR_FILTER_FACTOR
+    return INSTANCE_OVERHEAD_COST + cost
+
+
+def equalizer_cost(control: dict[str, float]) -> float:
+    # Bands of the left/right build filter one channel each.
+    cost = sum(
+        FILTER_BAND_COST
+        * slope_order(control.get(f"s{port[2:]}", 0.0))
+        * (1.0 if port[2] == "_" else 0.5)
+        for port, value in control.items()
+        if port.startswith(("ft_", "ftl_", "ftr_")) and value
+    )
+    if control.get("mode", IIR_MODE) != IIR_MODE:
+        cost *= FIR_FILTER_FACTOR
+    return INSTANCE_OVERHEAD_COST + cost
+
+
+def limiter_cost(control: dict[str, float]) -> float:
+    factor = LIMITER_OVS_FACTORS.get(control.get("ovs", 0.0), 1)
+    return INSTANCE_OVERHEAD_COST + LIMITER_COST * factor
+
+
+def multiband_compressor_cost(control: dict[str, float]) -> float:
+    # Band 0 is always active, the others have a cbe_N enable port.
+    bands = 1 + sum(
+        1 for port, value in control.items() if port.startswith("cbe_") and value
+    )
+    cost = MULTIBAND_BAND_COST * bands
+    if control.get("mode") == LINEAR_PHASE_MODE:
+        cost *= LINEAR_PHASE_FACTOR
+    return INSTANCE_OVERHEAD_COST + cost
+
+
+COST_MODELS = {
+    FILTER_URI: filter_cost,
+    LIMITER_URI: limiter_cost,
+    MULTIBAND_COMPRESSOR_URI: multiband_compressor_cost,
+}
+
+
+def node_cost(node: Node) -> float:
+    """
+    Estimate the relative CPU cost of a plugin node.
+
+    Bypassed nodes keep their cost, as plugins still run while bypassed.
+
+    :param node: parsed plugin node
+    :type node: Node
+    :return: relative cost, a stereo IIR filter with an x1 slope being 1.0
+    :rtype: float
+    """
+    if node.type == "builtin":
+        return 0.0
+
+    plugin = node.plugin or ""
+    control = node.control
+
+    if plugin in FIXED_NODE_COSTS:
+        return FIXED_NODE_COSTS[plugin]
+    if plugin in COST_MODELS:
+        return COST_MODELS[plugin](control)
+    if plugin.startswith(EQUALIZER_URI_PREFIX):
+        return equalizer_cost(control)
+
+    return DEFAULT_NODE_COST
+
+
+def chain_cost(nodes: list[Node], name: str = "") -> ChainCost:
+    """
+    Estimate the relative CPU cost of every node of a chain.
+
+    :param nodes: parsed plugin nodes, or the nodes of a filter graph
+    :param name: chain name used in the report
+    :type nodes: list[Node]
+    :type name: str
+    :return: cost of every node
+    :rtype: ChainCost
+    """
+    return ChainCost(
+        name,
+        [NodeCost(node.name, node.plugin or "", node_cost(node)) for node in nodes],
+    )
+
+
+def result_cost(result: dict, name: str = "") -> ChainCost:
+    """
+    Estimate the cost of a filter chain config, as returned by
+    :func:`ee2pw.core.build`.
+    """
+    return chain_cost(
+        [
+            Node.from_dict(node)
+            for module in result.get("context.modules", [])
+            for node in module["args"]["filter.graph"]["nodes"]
+        ],
+        name,
+    )
+
+
+def rank_presets(
+    presets: list[str], errors: dict[str, str] | None = None, **build_options: Any
+) -> list[ChainCost]:
+    """
+    Estimate the cost of presets, most expensive first.
+
+    :param presets: paths to EasyEffects presets
+    :param errors: filled with the error of every preset that could not be read
+        or parsed, which is left out of the ranking (if any, errors are raised
+        otherwise)
+    :param build_options: keyword arguments of :func:`ee2pw.core.run_passes`,
+        such as ``optimize`` or ``fuse_filters``
+    :type presets: list[str]
+    :type errors: dict[str, str] | None
+    :return: cost of every preset, sorted by total cost
+    :rtype: list[ChainCost]
+    """
+    from .bulk import build_chains
+    from .convert import default_filter_chain_name
+    from .util import load_config
+
+    configs: dict[str, dict[Any, Any]] = {}
+    for preset in presets:
+        try:
+            configs[preset] = load_config(preset)
+        except Exception as e:
+            if errors is None:
+                raise
+            errors[preset] = f"{type(e).__name__}: {e}"
+
+    try:
+        chains = dict(
+            zip(configs, build_chains(list(configs.values()), **build_options))
+        )
+    except Exception:
+        if errors is None:
+            raise
+        # Build the presets one by one to find the ones that failed.
+        chains = {}
+        for preset, config in configs.items():
+            try:
+                (chains[preset],) = build_chains([config], **build_options)
+            except Exception as e:
+                errors[preset] = f"{type(e).__name__}: {e}"
+
+    costs = [
+        chain_cost(chain.nodes, default_filter_chain_name(preset))
+        for preset, chain in chains.items()
+    ]
+
+    return sorted(costs, key=lambda cost: cost.total, reverse=True)
+
+
+def format_ranking(costs: list[ChainCost]) -> str:
+    return "\n".join(f"{cost.total:8.2f}  {cost.name}" for cost in costs)
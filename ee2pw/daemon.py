@@ -0,0 +1,302 @@
+import argparse, asyncio, json, sys, time
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable
+from typing import Any, NamedTuple
+
+from .core import capture_node_name
+from .pipewire import PwDumpIndex, PwObject, aiter_pw_dump, iter_pw_dump
+from .split import stage_name
+
+DEFAULT_SINK_KEY = "default.audio.sink"
+FILTERS_METADATA = "filters"
+DISABLED_KEY = "filter.smart.disabled"
+
+# Writes filter.smart.disabled for a filter node id.
+SetDisabled = Callable[[int, bool], Awaitable[None]]
+
+
+class Switch(NamedTuple):
+    filter_chain: str
+    node_id: int
+    disabled: bool
+
+    def format(self) -> str:
+        state = "disabled" if self.disabled else "enabled"
+        return f"{state} {self.filter_chain} (node {self.node_id})"
+
+
+def default_sink(index: PwDumpIndex) -> str | None:
+    value = index.metadata_value(DEFAULT_SINK_KEY)
+    if isinstance(value, dict):
+        return value.get("name")
+    return value
+
+
+def is_disabled(value: Any) -> bool | None:
+    if isinstance(value, str):
+        value = value.strip().lower()
+        return {"true": True, "false": False}.get(value)
+    return value if isinstance(value, bool) else None
+
+
+async def pw_metadata_set_disabled(
+    node_id: int, disabled: bool, pw_metadata: str = "pw-metadata"
+) -> None:
+    """
+    Set ``filter.smart.disabled`` like ``bin/smart_filter_utils.sh``.
+    """
+    process = await asyncio.create_subprocess_exec(
+        pw_metadata,
+        "-n",
+        FILTERS_METADATA,
+        str(node_id),
+        DISABLED_KEY,
+        "true" if disabled else "false",
+        "Spa:String:JSON",
+        stdout=asyncio.subprocess.DEVNULL,
+    )
+    if await process.wait():
+        raise RuntimeError(f"{pw_metadata} failed for node {node_id}")
+
+
+class SmartFilterSwitcher:
+    """
+    Enable the pre-generated smart filter mapped to the default sink and
+    disable the other mapped ones, whenever the PipeWire graph changes.
+
+    Only the ``filter.smart.disabled`` metadata is written, filter chain
+    configs are never regenerated or reloaded.
+    """
+
+    def __init__(
+        self,
+        device_map: dict[str, str],
+        set_disabled: SetDisabled,
+        log: Callable[[str], None] | None = None,
+    ):
+        """
+        :param device_map: filter chain name per sink ``node.name``
+        :param set_disabled: coroutine writing ``filter.smart.disabled``
+        :param log: called with a message for every switch and failure (if any)
+        :type device_map: dict[str, str]
+        :type set_disabled: SetDisabled
+        :type log: Callable[[str], None] | None
+        """
+        self.device_map = device_map
+        self.set_disabled = set_disabled
+        self.log = log
+        self.index = PwDumpIndex()
+        # Value written per node id, with the metadata value it replaced,
+        # until PipeWire reports the metadata change.
+        self.pending: dict[int, tuple[bool, bool | None]] = {}
+
+    def current(self, node_id: int) -> bool | None:
+        return is_disabled(
+            self.index.metadata_value(DISABLED_KEY, node_id, FILTERS_METADATA)
+        )
+
+    def plan(self) -> list[Switch]:
+        """
+        List the switches needed to match the current default sink.
+
+        The ``filter.smart.disabled`` metadata is the reference, so changes
+        made behind the daemon are undone. Writes that PipeWire has not
+        reported back yet are not repeated.
+        """
+        # PipeWire reuses the ids of removed nodes.
+        for node_id in [n for n in self.pending if self.index.get(n) is None]:
+            del self.pending[node_id]
+
+        active = self.device_map.get(default_sink(self.index) or "")
+        switches: list[Switch] = []
+
+        for filter_chain in dict.fromkeys(self.device_map.values()):
+            disabled = filter_chain != active
+            for node_id in self.stage_node_ids(filter_chain):
+                current = self.current(node_id)
+
+                pending = self.pending.get(node_id)
+                if pending is not None and current != pending[1]:
+                    # Reported back, or changed by something else since.
+                    del self.pending[node_id]
+                    pending = None
+
+                if current != disabled and (pending is None or pending[0] != disabled):
+                    switches.append(Switch(filter_chain, node_id, disabled))
+
+        return switches
+
+    def stage_node_ids(self, filter_chain: str) -> list[int]:
+        """
+        Get the capture node ids of a filter chain and of the stages it was
+        split into with ``--split``, if running.
+        """
+        node_ids: list[int] = []
+        while (
+            node_id := self.index.node_id(
+                capture_node_name(stage_name(filter_chain, len(node_ids)))
+            )
+        ) is not None:
+            node_ids.append(node_id)
+        return node_ids
+
+    async def handle(self, update: list[PwObject]) -> list[Switch]:
+        """
+        Apply one ``pw-dump --monitor`` update and switch filters if needed.
+
+        A switch that failed is logged and retried on the next update.
+
+        :return: the switches made
+        :rtype: list[Switch]
+        """
+        if not self.index.update(update):
+            return []
+
+        start = time.perf_counter()
+        switches = self.plan()
+        results = await asyncio.gather(
+            *(
+                self.set_disabled(switch.node_id, switch.disabled)
+                for switch in switches
+            ),
+            return_exceptions=True,
+        )
+        elapsed = 1000 * (time.perf_counter() - start)
+
+        done: list[Switch] = []
+        for switch, result in zip(switches, results):
+            if isinstance(result, Exception):
+                if self.log is not None:
+                    self.log(f"failed to switch {switch.filter_chain}: {result}")
+                continue
+
+            self.pending[switch.node_id] = (
+                switch.disabled,
+                self.current(switch.node_id),
+            )
+            done.append(switch)
+            if self.log is not None:
+                self.log(
+                    f"{switch.format()} for {default_sink(self.index)} "
+                    f"in {elapsed:.1f} ms"
+                )
+
+        return done
+
+    async def run(self, updates: AsyncIterable[list[PwObject]]) -> None:
+        async for update in updates:
+            await self.handle(update)
+
+
+async def replay(updates: Iterable[list[PwObject]]) -> AsyncIterator[list[PwObject]]:
+    """
+    Replay recorded updates, such as a saved ``pw-dump --monitor`` stream.
+    """
+    for update in updates:
+        yield update
+
+
+def load_device_map(filepath: str) -> dict[str, str]:
+    with open(filepath, "r") as f:
+        device_map = json.load(f)
+
+    if not isinstance(device_map, dict) or not all(
+        isinstance(v, str) for v in device_map.values()
+    ):
+        raise ValueError(f"{filepath}: expected an object of sink name to filter chain")
+
+    return device_map
+
+
+def parse_mapping(mapping: str) -> tuple[str, str]:
+    device, sep, filter_chain = mapping.partition("=")
+    if not (sep and device and filter_chain):
+        raise ValueError(f"expected SINK=FILTER_CHAIN_NAME, got {mapping!r}")
+    return device, filter_chain
+
+
+async def run_daemon(args: argparse.Namespace, device_map: dict[str, str]) -> None:
+    def log(message: str) -> None:
+        print(message, file=sys.stderr, flush=True)
+
+    async def dry_run(node_id: int, disabled: bool) -> None:
+        pass
+
+    async def set_disabled(node_id: int, disabled: bool) -> None:
+        await pw_metadata_set_disabled(node_id, disabled, args.pw_metadata)
+
+    switcher = SmartFilterSwitcher(
+        device_map, dry_run if args.dry_run else set_disabled, log
+    )
+
+    if args.pw_dump:
+        with open(args.pw_dump, "r") as f:
+            await switcher.run(replay(iter_pw_dump(f)))
+        return
+
+    process = await asyncio.create_subprocess_exec(
+        "pw-dump", "--monitor", "--no-colors", stdout=asyncio.subprocess.PIPE
+    )
+    try:
+        await switcher.run(aiter_pw_dump(process.stdout))  # type: ignore[arg-type]
+    finally:
+        if process.returncode is None:
+            process.terminate()
+            await process.wait()
+
+
+def main(argv: list[str] | None = None) -> int:
+    argparser = argparse.ArgumentParser(
+        prog="python -m ee2pw daemon",
+        description="Enable the smart filter mapped to the default sink whenever "
+        "it changes, by flipping filter.smart.disabled.",
+    )
+
+    argparser.add_argument(
+        "-m",
+        "--map",
+        type=str,
+        action="append",
+        default=[],
+        metavar="SINK=FILTER_CHAIN_NAME",
+        help="Filter chain to enable when a sink is the default (can be repeated).",
+    )
+    argparser.add_argument(
+        "--map-file",
+        type=str,
+        help="JSON object mapping sink node names to filter chain names.",
+    )
+    argparser.add_argument(
+        "--pw-dump",
+        type=str,
+        help="Replay a saved pw-dump --monitor stream instead of running pw-dump.",
+    )
+    argparser.add_argument(
+        "--pw-metadata", type=str, default="pw-metadata", help="pw-metadata executable."
+    )
+    argparser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the switches without writing metadata.",
+    )
+
+    args = argparser.parse_args(argv)
+
+    try:
+        device_map = load_device_map(args.map_file) if args.map_file else {}
+        device_map.update(parse_mapping(mapping) for mapping in args.map)
+    except (OSError, ValueError) as e:
+        argparser.error(str(e))
+
+    if not device_map:
+        argparser.error("no sink mapped, use --map or --map-file")
+
+    try:
+        asyncio.run(run_daemon(args, device_map))
+    except KeyboardInterrupt:
+        pass
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
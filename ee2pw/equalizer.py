@@ -0,0 +1,165 @@
+from typing import Any
+from .filter import FILTER_FM_MAP, FILTER_MODE_MAP
+from .ir import Node
+from .lv2_wrapper import (
+    BOOL,
+    ENUM,
+    FLOAT,
+    FLOAT_DB,
+    INVERTED_BOOL,
+    Control,
+    compile_controls,
+)
+
+PLUGIN_TYPE = "lv2"
+PLUGIN_URI_PREFIX = "http://lsp-plug.in/plugins/lv2/para_equalizer_x"
+
+# Band counts of the LSP parametric equalizer builds.
+EQUALIZER_SIZES = (8, 16, 32)
+
+EQUALIZER_FT_MAP = {
+    "Off": 0.0,
+    "Bell": 1.0,
+    "Hi-pass": 2.0,
+    "Hi-shelf": 3.0,
+    "Lo-pass": 4.0,
+    "Lo-shelf": 5.0,
+    "Notch": 6.0,
+    "Resonance": 7.0,
+    "Allpass": 8.0,
+    "Bandpass": 9.0,
+    "Ladder-pass": 10.0,
+    "Ladder-rej": 11.0,
+}
+
+# Filter modes and equalizer modes share the filter plugin values.
+EQUALIZER_FM_MAP = FILTER_FM_MAP
+EQUALIZER_MODE_MAP = FILTER_MODE_MAP
+
+EQUALIZER_S_MAP = {
+    "x1": 0.0,
+    "x2": 1.0,
+    "x3": 2.0,
+    "x4": 3.0,
+}
+
+
+def equalizer_size(bands: int) -> int:
+    """
+    Get the smallest equalizer build with at least ``bands`` bands.
+
+    :param bands: number of bands needed
+    :type bands: int
+    :return: equalizer band count
+    :rtype: int
+    """
+    for size in EQUALIZER_SIZES:
+        if bands <= size:
+            return size
+
+    raise ValueError(f"no equalizer has {bands} bands")
+
+
+def equalizer_uri(size: int, layout: str = "stereo") -> str:
+    return f"{PLUGIN_URI_PREFIX}{size}_{layout}"
+
+
+STEREO_LAYOUT = "stereo"
+LR_LAYOUT = "lr"
+
+EQUALIZER_MAX_BANDS = EQUALIZER_SIZES[-1]
+
+EQUALIZER_CONTROLS: tuple[Control, ...] = (
+    Control("enabled", "bypass", INVERTED_BOOL, False),
+    Control("g_in", "input-gain", FLOAT_DB, 0.0),
+    Control("g_out", "output-gain", FLOAT_DB, 0.0),
+    Control("mode", "mode", ENUM, "IIR", EQUALIZER_MODE_MAP, 0.0),
+    Control("bal", "balance", FLOAT, 0.0),
+)
+
+EQUALIZER_PITCH_CONTROLS: tuple[Control, ...] = (
+    Control("frqs_l", "pitch-left", FLOAT, 0.0),
+    Control("frqs_r", "pitch-right", FLOAT, 0.0),
+)
+
+
+def band_controls(i: int, channel: str = "") -> tuple[Control, ...]:
+    """
+    Get the controls of one equalizer band.
+
+    :param i: band index
+    :param channel: ``l`` or ``r`` on the left/right build, empty otherwise
+    :type i: int
+    :type channel: str
+    :return: band controls
+    :rtype: tuple[Control, ...]
+    """
+    return (
+        Control(f"ft{channel}_{i}", "type", ENUM, "Bell", EQUALIZER_FT_MAP, 1.0),
+        Control(f"fm{channel}_{i}", "mode", ENUM, "RLC (BT)", EQUALIZER_FM_MAP, 0.0),
+        Control(f"s{channel}_{i}", "slope", ENUM, "x1", EQUALIZER_S_MAP, 0.0),
+        Control(f"xs{channel}_{i}", "solo", BOOL, False),
+        Control(f"xm{channel}_{i}", "mute", BOOL, False),
+        Control(f"f{channel}_{i}", "frequency", FLOAT, 1000.0),
+        Control(f"w{channel}_{i}", "width", FLOAT, 4.0),
+        Control(f"g{channel}_{i}", "gain", FLOAT_DB, 0.0),
+        Control(f"q{channel}_{i}", "q", FLOAT, 4.36),
+    )
+
+
+convert_equalizer = compile_controls(EQUALIZER_CONTROLS)
+convert_equalizer_pitch = compile_controls(EQUALIZER_PITCH_CONTROLS)
+
+# Band converters per channel suffix of the band ports: ``ft_0`` on the stereo
+# build, ``ftl_0`` and ``ftr_0`` on the left/right build.
+EQUALIZER_BAND_CONVERTERS = {
+    channel: tuple(
+        compile_controls(band_controls(i, channel)) for i in range(EQUALIZER_MAX_BANDS)
+    )
+    for channel in ("", "l", "r")
+}
+
+
+def parse_equalizer(ee_config: dict[Any, Any], pw_node_name: str) -> Node:
+    """
+    Parse equalizer settings into one LSP parametric equalizer.
+
+    The stereo build is used unless the channels are split or pitch shifted,
+    which needs the left/right build. Bands past ``num-bands`` are turned off.
+
+    :param ee_config: EasyEffects equalizer configuration data
+    :param pw_node_name: PipeWire node name
+    :type ee_config: dict[Any, Any]
+    :type pw_node_name: str
+    :return: parsed equalizer settings
+    :rtype: Node
+    """
+    bands = min(
+        int(ee_config.get("num-bands", EQUALIZER_MAX_BANDS)), EQUALIZER_MAX_BANDS
+    )
+    size = equalizer_size(max(bands, 1))
+    split = bool(ee_config.get("split-channels", False))
+
+    control = convert_equalizer(ee_config)
+    pitch = convert_equalizer_pitch(ee_config)
+
+    left: dict[Any, Any] = ee_config.get("left", {})
+    right: dict[Any, Any] = ee_config.get("right", {}) if split else left
+
+    if split or any(pitch.values()):
+        layout = LR_LAYOUT
+        control.update(pitch)
+        channels = (("l", left), ("r", right))
+    else:
+        layout = STEREO_LAYOUT
+        channels = (("", left),)
+
+    for channel, ee_bands in channels:
+        converters = EQUALIZER_BAND_CONVERTERS[channel]
+        for i in range(size):
+            if i < bands:
+                control.update(converters[i](ee_bands.get(f"band{i}", {})))
+            else:
+                control[f"ft{channel}_{i}"] = EQUALIZER_FT_MAP["Off"]
+
+    return Node(PLUGIN_TYPE, pw_node_name, equalizer_uri(size, layout), control=control)
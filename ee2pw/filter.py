@@ -1,6 +1,13 @@
 from typing import Any
-from .util import db_to_linear
-from .lv2_wrapper import *
+from .ir import Node
+from .lv2_wrapper import (
+    ENUM,
+    FLOAT,
+    FLOAT_DB,
+    INVERTED_BOOL,
+    Control,
+    compile_controls,
+)
 
 PLUGIN_TYPE = "lv2"
 PLUGIN_URI = "http://lsp-plug.in/plugins/lv2/filter_stereo"
@@ -47,10 +54,25 @@ FILTER_S_MAP = {
     "x8": 5.0,
 }
 
+FILTER_CONTROLS: tuple[Control, ...] = (
+    Control("enabled", "bypass", INVERTED_BOOL, False),
+    Control("g_in", "input-gain", FLOAT_DB, 0.0),
+    Control("g_out", "output-gain", FLOAT_DB, 0.0),
+    Control("f", "frequency", FLOAT, 0.0),
+    Control("w", "width", FLOAT, 4.0),
+    Control("g", "gain", FLOAT_DB, 0.0),
+    Control("q", "quality", FLOAT, 0.0),
+    Control("bal", "balance", FLOAT, 0.0),
+    Control("ft", "type", ENUM, "Lo-pass", FILTER_FT_MAP, 0.0),
+    Control("fm", "mode", ENUM, "RLC (BT)", FILTER_FM_MAP, 0.0),
+    Control("mode", "equal-mode", ENUM, "IIR", FILTER_MODE_MAP, 0.0),
+    Control("s", "slope", ENUM, "x1", FILTER_S_MAP, 0.0),
+)
 
-def parse_filter(
-    ee_config: dict[Any, Any], pw_node_name: str
-) -> dict[str, str | dict[str, float]]:
+convert_filter = compile_controls(FILTER_CONTROLS)
+
+
+def parse_filter(ee_config: dict[Any, Any], pw_node_name: str) -> Node:
     """
     Parse filter settings.
 
@@ -59,24 +81,8 @@ def parse_filter(
     :type data: dict[Any, Any]
     :type pw_node_name: str
     :return: parsed filter settings
-    :rtype: dict[str, float]
+    :rtype: Node
     """
-    return {
-        "type": PLUGIN_TYPE,
-        "name": pw_node_name,
-        "plugin": PLUGIN_URI,
-        "control": {
-            "enabled": parse_bool(ee_config, "bypass", False, True),
-            "g_in": parse_float_db(ee_config, "input-gain", 0.0),
-            "g_out": parse_float_db(ee_config, "output-gain", 0.0),
-            "f": parse_float(ee_config, "frequency", 0.0),
-            "w": parse_float(ee_config, "width", 4.0),
-            "g": parse_float_db(ee_config, "gain", 0.0),
-            "q": parse_float(ee_config, "quality", 0.0),
-            "bal": parse_float(ee_config, "balance", 0.0),
-            "ft": parse_enum(ee_config, "type", "Lo-pass", FILTER_FT_MAP, 0.0),
-            "fm": parse_enum(ee_config, "mode", "RLC (BT)", FILTER_FM_MAP, 0.0),
-            "mode": parse_enum(ee_config, "equal-mode", "IIR", FILTER_MODE_MAP, 0.0),
-            "s": parse_enum(ee_config, "slope", "x1", FILTER_S_MAP, 0.0),
-        },
-    }
+    return Node(
+        PLUGIN_TYPE, pw_node_name, PLUGIN_URI, control=convert_filter(ee_config)
+    )
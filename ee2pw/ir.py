@@ -0,0 +1,199 @@
+import sys
+from typing import Any
+
+# Stereo LV2 plugin ports, (input, output) per channel.
+STEREO_PORTS: tuple[tuple[str, str], ...] = (("in_l", "out_l"), ("in_r", "out_r"))
+
+# Ports of the builtin copy nodes used when a chain has no plugin.
+COPY_INPUT = "In"
+COPY_OUTPUT = "Out"
+
+
+class Port:
+    """
+    Port of a filter graph node, ``<node>:<port>`` once serialized.
+
+    Node and port names are interned, so the many ports of a large batch
+    share their strings.
+    """
+
+    __slots__ = ("node", "port")
+
+    def __init__(self, node: str, port: str):
+        self.node = sys.intern(node)
+        self.port = sys.intern(port)
+
+    def __str__(self) -> str:
+        return f"{self.node}:{self.port}"
+
+    def __repr__(self) -> str:
+        return f"Port({self.node!r}, {self.port!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Port):
+            return NotImplemented
+        return self.node is other.node and self.port is other.port
+
+    def __hash__(self) -> int:
+        return hash((self.node, self.port))
+
+
+class Link:
+    """
+    Link from an output port to an input port.
+    """
+
+    __slots__ = ("output", "input")
+
+    def __init__(self, output: Port, input: Port):
+        self.output = output
+        self.input = input
+
+    def __repr__(self) -> str:
+        return f"Link({self.output!r}, {self.input!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Link):
+            return NotImplemented
+        return self.output == other.output and self.input == other.input
+
+    def to_dict(self) -> dict[str, str]:
+        return {"output": str(self.output), "input": str(self.input)}
+
+
+class Node:
+    """
+    Filter graph node: an LV2 plugin with its control values, or a builtin.
+
+    Keys of a parser's dict that have no attribute are kept in ``extra`` and
+    written after the known keys.
+    """
+
+    __slots__ = ("type", "name", "plugin", "label", "control", "extra")
+
+    def __init__(
+        self,
+        type: str,
+        name: str,
+        plugin: str | None = None,
+        label: str | None = None,
+        control: dict[str, float] | None = None,
+        extra: dict[str, Any] | None = None,
+    ):
+        self.type = type
+        self.name = sys.intern(name)
+        self.plugin = plugin
+        self.label = label
+        self.control = {} if control is None else control
+        self.extra = extra
+
+    def __repr__(self) -> str:
+        return f"Node({self.type!r}, {self.name!r}, plugin={self.plugin!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Node):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def port(self, name: str) -> Port:
+        return Port(self.name, name)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Node":
+        extra = {
+            k: v
+            for k, v in data.items()
+            if k not in ("type", "name", "plugin", "label", "control")
+        }
+        return cls(
+            data.get("type", ""),
+            data["name"],
+            data.get("plugin"),
+            data.get("label"),
+            data.get("control"),
+            extra or None,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        data: dict[str, Any] = {"type": self.type, "name": self.name}
+        if self.plugin is not None:
+            data["plugin"] = self.plugin
+        if self.label is not None:
+            data["label"] = self.label
+        if self.control or self.label is None:
+            data["control"] = self.control
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+
+def as_node(value: "Node | dict[str, Any] | None") -> Node | None:
+    """
+    Wrap the dict returned by a third-party parser into a :class:`Node`.
+
+    :param value: parser result, an empty dict meaning unsupported
+    :type value: Node | dict[str, Any] | None
+    :return: node, or None if there is none
+    :rtype: Node | None
+    """
+    if isinstance(value, Node) or value is None:
+        return value
+    return Node.from_dict(value) if value else None
+
+
+class FilterChain:
+    """
+    Filter graph: nodes, the links between them and the graph inputs and
+    outputs.
+    """
+
+    __slots__ = ("nodes", "links", "inputs", "outputs")
+
+    def __init__(
+        self,
+        nodes: list[Node],
+        links: list[Link],
+        inputs: list[Port],
+        outputs: list[Port],
+    ):
+        self.nodes = nodes
+        self.links = links
+        self.inputs = inputs
+        self.outputs = outputs
+
+    @classmethod
+    def serial(cls, nodes: list[Node]) -> "FilterChain":
+        """
+        Chain stereo plugin nodes in order, left channel links first.
+        """
+        return cls(
+            nodes,
+            [
+                Link(before.port(output), after.port(input))
+                for input, output in STEREO_PORTS
+                for before, after in zip(nodes, nodes[1:])
+            ],
+            [nodes[0].port(input) for input, _ in STEREO_PORTS],
+            [nodes[-1].port(output) for _, output in STEREO_PORTS],
+        )
+
+    @classmethod
+    def passthrough(cls, names: list[str]) -> "FilterChain":
+        """
+        Pass audio through unchanged with one builtin copy node per channel.
+        """
+        nodes = [Node("builtin", name, label="copy") for name in names]
+        return cls(
+            nodes,
+            [],
+            [node.port(COPY_INPUT) for node in nodes],
+            [node.port(COPY_OUTPUT) for node in nodes],
+        )
+
+    def to_dict(self) -> dict[str, list]:
+        return {
+            "nodes": [node.to_dict() for node in self.nodes],
+            "links": [link.to_dict() for link in self.links],
+            "inputs": [str(port) for port in self.inputs],
+            "outputs": [str(port) for port in self.outputs],
+        }
@@ -0,0 +1,255 @@
+import math
+from collections.abc import Callable
+from typing import NamedTuple
+
+from .equalizer import PLUGIN_URI_PREFIX as EQUALIZER_URI_PREFIX
+from .filter import PLUGIN_URI as FILTER_URI
+from .ir import Node
+from .limiter import PLUGIN_URI as LIMITER_URI
+from .multiband_compressor import PLUGIN_URI as MULTIBAND_COMPRESSOR_URI
+from .util import format_6f
+
+DEFAULT_SAMPLE_RATE = 48000
+
+LATENCY_POLICIES = ("fail", "downgrade")
+
+# Estimated delays of the LSP processing stages, in samples at the base rate.
+# They are approximations of the plugins' block sizes, not measured values.
+OVERSAMPLING_LATENCY = 8  # resampling FIR of the limiter (ovs != None)
+FIR_EQUALIZER_LATENCY = 4096  # filter and equalizer FIR/FFT/SPM modes
+LINEAR_PHASE_CROSSOVER_LATENCY = 4096  # multiband compressor "Linear Phase"
+
+IIR_MODE = 0.0
+LINEAR_PHASE_MODE = 2.0
+MODERN_MODE = 1.0
+NO_OVERSAMPLING = 0.0
+
+# Shortest lookahead the LSP limiter accepts, in milliseconds.
+MIN_LOOKAHEAD = 0.1
+
+
+class NodeLatency(NamedTuple):
+    name: str
+    samples: int
+    sources: list[tuple[str, int]]
+
+
+class LatencyReport(NamedTuple):
+    sample_rate: int
+    nodes: list[NodeLatency]
+    max_latency: float | None = None
+    downgrades: list[str] = []
+
+    @property
+    def total_samples(self) -> int:
+        return sum(node.samples for node in self.nodes)
+
+    @property
+    def total_ms(self) -> float:
+        return 1000 * self.total_samples / self.sample_rate
+
+    def format(self) -> str:
+        lines = []
+        for node in self.nodes:
+            if node.samples:
+                sources = ", ".join(f"{source} {n}" for source, n in node.sources)
+                lines.append(f"latency of {node.name}: {node.samples} ({sources})")
+        lines.extend(f"downgraded {downgrade}" for downgrade in self.downgrades)
+        budget = f", budget {self.max_latency:g} ms" if self.max_latency else ""
+        lines.append(
+            f"estimated latency: {self.total_samples} samples, "
+            f"{self.total_ms:.2f} ms at {self.sample_rate} Hz{budget}"
+        )
+        return "\n".join(lines)
+
+
+def ms_to_samples(ms: float, sample_rate: int) -> int:
+    return math.ceil(ms * sample_rate / 1000)
+
+
+def limiter_latency(
+    control: dict[str, float], sample_rate: int
+) -> list[tuple[str, int]]:
+    sources = []
+    if control.get("lk", 0.0):
+        sources.append(("lookahead", ms_to_samples(control["lk"], sample_rate)))
+    if control.get("ovs", NO_OVERSAMPLING) != NO_OVERSAMPLING:
+        sources.append(("oversampling", OVERSAMPLING_LATENCY))
+    return sources
+
+
+def equalizer_latency(
+    control: dict[str, float], sample_rate: int
+) -> list[tuple[str, int]]:
+    if control.get("mode", IIR_MODE) != IIR_MODE:
+        return [("FIR mode", FIR_EQUALIZER_LATENCY)]
+    return []
+
+
+def multiband_compressor_latency(
+    control: dict[str, float], sample_rate: int
+) -> list[tuple[str, int]]:
+    if control.get("mode") == LINEAR_PHASE_MODE:
+        return [("linear phase", LINEAR_PHASE_CROSSOVER_LATENCY)]
+    return []
+
+
+LatencyModel = Callable[[dict[str, float], int], list[tuple[str, int]]]
+
+# Plugin URI -> function listing the (source, samples) delays of a node.
+LATENCY_MODELS: dict[str, LatencyModel] = {
+    FILTER_URI: equalizer_latency,
+    LIMITER_URI: limiter_latency,
+    MULTIBAND_COMPRESSOR_URI: multiband_compressor_latency,
+}
+
+
+def latency_model(plugin: str) -> LatencyModel | None:
+    if plugin.startswith(EQUALIZER_URI_PREFIX):
+        return equalizer_latency
+    return LATENCY_MODELS.get(plugin)
+
+
+def node_latency(node: Node, sample_rate: int = DEFAULT_SAMPLE_RATE) -> NodeLatency:
+    """
+    Estimate the algorithmic delay a plugin node adds.
+
+    Bypassed nodes are assumed to keep their delay, as LSP plugins compensate
+    the bypass path.
+
+    :param node: parsed plugin node
+    :param sample_rate: graph sample rate
+    :type node: Node
+    :type sample_rate: int
+    :return: delay in samples and where it comes from
+    :rtype: NodeLatency
+    """
+    model = latency_model(node.plugin or "")
+    sources = model(node.control, sample_rate) if model else []
+    return NodeLatency(node.name, sum(n for _, n in sources), sources)
+
+
+def chain_latency(
+    nodes: list[Node], sample_rate: int = DEFAULT_SAMPLE_RATE
+) -> list[NodeLatency]:
+    return [node_latency(node, sample_rate) for node in nodes]
+
+
+def downgrade(node: Node) -> str | None:
+    """
+    Switch one setting of a node to a lower-latency alternative.
+
+    Linear phase and FIR modes go first as they cost the most, then
+    oversampling.
+
+    :return: description of the change, or None if nothing is left to change
+    :rtype: str | None
+    """
+    plugin = node.plugin or ""
+    control = node.control
+
+    if latency_model(plugin) is equalizer_latency:
+        if control.get("mode", IIR_MODE) != IIR_MODE:
+            control["mode"] = IIR_MODE
+            return f"{node.name}: mode -> IIR"
+    elif plugin == MULTIBAND_COMPRESSOR_URI:
+        if control.get("mode") == LINEAR_PHASE_MODE:
+            control["mode"] = MODERN_MODE
+            return f"{node.name}: mode Linear Phase -> Modern"
+    elif plugin == LIMITER_URI:
+        if control.get("ovs", NO_OVERSAMPLING) != NO_OVERSAMPLING:
+            control["ovs"] = NO_OVERSAMPLING
+            return f"{node.name}: oversampling -> None"
+
+    return None
+
+
+def shorten_lookahead(node: Node, excess: int, sample_rate: int) -> str | None:
+    """
+    Shorten the lookahead of a limiter node by up to ``excess`` samples.
+
+    :return: description of the change, or None if it cannot be shortened
+    :rtype: str | None
+    """
+    control = node.control
+    lookahead = control.get("lk", 0.0)
+
+    if node.plugin != LIMITER_URI or lookahead <= MIN_LOOKAHEAD:
+        return None
+
+    samples = ms_to_samples(lookahead, sample_rate) - excess
+    # Round down to the 6 decimals kept in the output, so the shortened
+    # lookahead never takes more samples than intended.
+    shortened = max(MIN_LOOKAHEAD, math.floor(1e9 * samples / sample_rate) / 1e6)
+    control["lk"] = format_6f(shortened)
+
+    return f"{node.name}: lookahead {lookahead:g} -> {control['lk']:g} ms"
+
+
+def apply_latency_budget(
+    nodes: list[Node],
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    max_latency: float | None = None,
+    policy: str = "fail",
+) -> LatencyReport:
+    """
+    Estimate the latency of a chain and enforce a latency budget.
+
+    With the ``downgrade`` policy, nodes are switched to lower-latency settings
+    in place, largest delay first, until the chain fits. Limiter lookahead is
+    shortened last, as it changes how the limiter sounds the most.
+
+    :param nodes: parsed plugin nodes, in chain order
+    :param sample_rate: graph sample rate
+    :param max_latency: latency budget in milliseconds (if any)
+    :param policy: ``fail`` or ``downgrade``
+    :type nodes: list[Node]
+    :type sample_rate: int
+    :type max_latency: float | None
+    :type policy: str
+    :raises ValueError: if the chain does not fit the budget
+    :return: latency of every node and the downgrades applied
+    :rtype: LatencyReport
+    """
+    if policy not in LATENCY_POLICIES:
+        raise ValueError(f"unknown latency policy: {policy}")
+
+    report = LatencyReport(sample_rate, chain_latency(nodes, sample_rate), max_latency)
+
+    if max_latency is None:
+        return report
+
+    budget = math.floor(max_latency * sample_rate / 1000)
+
+    if report.total_samples > budget and policy == "downgrade":
+        downgrades: list[str] = []
+        by_latency = sorted(
+            range(len(nodes)), key=lambda i: report.nodes[i].samples, reverse=True
+        )
+
+        for i in by_latency:
+            while report.total_samples > budget:
+                change = downgrade(nodes[i])
+                if change is None:
+                    break
+                downgrades.append(change)
+                report.nodes[i] = node_latency(nodes[i], sample_rate)
+
+        for i in by_latency:
+            excess = report.total_samples - budget
+            if excess <= 0:
+                break
+            change = shorten_lookahead(nodes[i], excess, sample_rate)
+            if change is not None:
+                downgrades.append(change)
+                report.nodes[i] = node_latency(nodes[i], sample_rate)
+
+        report = report._replace(downgrades=downgrades)
+
+    if report.total_samples > budget:
+        raise ValueError(
+            f"estimated latency {report.total_ms:.2f} ms exceeds the "
+            f"{max_latency:g} ms budget"
+        )
+
+    return report
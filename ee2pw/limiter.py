@@ -1,5 +1,14 @@
 from typing import Any
-from .lv2_wrapper import parse_bool, parse_enum, parse_float, parse_float_db
+from .ir import Node
+from .lv2_wrapper import (
+    BOOL,
+    ENUM,
+    FLOAT,
+    FLOAT_DB,
+    INVERTED_BOOL,
+    Control,
+    compile_controls,
+)
 
 PLUGIN_TYPE = "lv2"
 PLUGIN_URI = "http://lsp-plug.in/plugins/lv2/sc_limiter_stereo"
@@ -57,10 +66,29 @@ LIMITER_DITHERING_MAP: dict[str, float] = {
     "24bit": 8.0,
 }
 
+LIMITER_CONTROLS: tuple[Control, ...] = (
+    Control("mode", "mode", ENUM, "Herm Thin", LIMITER_MODE_MAP, 0.0),
+    Control("ovs", "oversampling", ENUM, "None", LIMITER_OVS_MAP, 0.0),
+    Control("dith", "dithering", ENUM, "None", LIMITER_DITHERING_MAP, 0.0),
+    Control("enabled", "bypass", INVERTED_BOOL, False),
+    Control("g_in", "input-gain", FLOAT_DB, 0.0),
+    Control("g_out", "output-gain", FLOAT_DB, 0.0),
+    Control("lk", "lookahead", FLOAT, 5.0),
+    Control("at", "attack", FLOAT, 0.0),
+    Control("rt", "release", FLOAT, 5.0),
+    Control("th", "threshold", FLOAT_DB, 0.0),
+    Control("slink", "stereo-link", FLOAT, 100.0),
+    Control("alr_at", "alr-attack", FLOAT, 5.0),
+    Control("alr_rt", "alr-release", FLOAT, 50.0),
+    Control("knee", "alr-knee", FLOAT_DB, 0.0),
+    Control("alr", "alr", BOOL, False),
+    Control("boost", "gain-boost", BOOL, False),
+)
 
-def parse_limiter(
-    ee_config: dict[Any, Any], pw_node_name: str
-) -> dict[str, str | dict[str, float]]:
+convert_limiter = compile_controls(LIMITER_CONTROLS)
+
+
+def parse_limiter(ee_config: dict[Any, Any], pw_node_name: str) -> Node:
     """
     Parse limiter settings.
 
@@ -69,30 +97,8 @@ def parse_limiter(
     :type data: dict[Any, Any]
     :type pw_node_name: str
     :return: parsed limiter settings
-    :rtype: dict
+    :rtype: Node
     """
-    return {
-        "type": PLUGIN_TYPE,
-        "name": pw_node_name,
-        "plugin": PLUGIN_URI,
-        "control": {
-            "mode": parse_enum(ee_config, "mode", "Herm Thin", LIMITER_MODE_MAP, 0.0),
-            "ovs": parse_enum(ee_config, "oversampling", "None", LIMITER_OVS_MAP, 0.0),
-            "dith": parse_enum(
-                ee_config, "dithering", "None", LIMITER_DITHERING_MAP, 0.0
-            ),
-            "enabled": parse_bool(ee_config, "bypass", False, True),
-            "g_in": parse_float_db(ee_config, "input-gain", 0.0),
-            "g_out": parse_float_db(ee_config, "output-gain", 0.0),
-            "lk": parse_float(ee_config, "lookahead", 5.0),
-            "at": parse_float(ee_config, "attack", 0.0),
-            "rt": parse_float(ee_config, "release", 5.0),
-            "th": parse_float_db(ee_config, "threshold", 0.0),
-            "slink": parse_float(ee_config, "stereo-link", 100.0),
-            "alr_at": parse_float(ee_config, "alr-attack", 5.0),
-            "alr_rt": parse_float(ee_config, "alr-release", 50.0),
-            "knee": parse_float_db(ee_config, "alr-knee", 0.0),
-            "alr": parse_bool(ee_config, "alr", False),
-            "boost": parse_bool(ee_config, "gain-boost", False),
-        },
-    }
+    return Node(
+        PLUGIN_TYPE, pw_node_name, PLUGIN_URI, control=convert_limiter(ee_config)
+    )
@@ -0,0 +1,421 @@
+import argparse, json, os, sys, threading
+from typing import Any, NamedTuple
+from urllib.parse import unquote, urlparse
+
+from . import __version__
+from .turtle import RDF_TYPE, IRI, Graph, TurtleError, new_graph, parse
+
+LV2 = "http://lv2plug.in/ns/lv2core#"
+RDFS_SEE_ALSO = "http://www.w3.org/2000/01/rdf-schema#seeAlso"
+MANIFEST = "manifest.ttl"
+
+# Default search path of lilv on Linux, which PipeWire uses to load plugins.
+DEFAULT_LV2_PATH = ("~/.lv2", "/usr/lib/lv2", "/usr/local/lib/lv2")
+
+INDEX_VERSION = 1
+
+CONTROL = "control"
+AUDIO = "audio"
+PORT_KINDS = {
+    LV2 + "ControlPort": CONTROL,
+    LV2 + "AudioPort": AUDIO,
+    LV2 + "CVPort": "cv",
+    "http://lv2plug.in/ns/ext/atom#AtomPort": "atom",
+}
+
+
+class PortInfo(NamedTuple):
+    kind: str
+    input: bool
+    minimum: float | None = None
+    maximum: float | None = None
+    default: float | None = None
+
+
+# Port symbol -> port, for every plugin URI of a bundle.
+Plugins = dict[str, dict[str, PortInfo]]
+
+
+def default_index_path() -> str:
+    from .cache import default_cache_dir
+
+    return os.path.join(default_cache_dir(), "lv2_index.json")
+
+
+def lv2_path() -> list[str]:
+    """
+    Get the LV2 search path, ``LV2_PATH`` if set.
+
+    :return: directories holding LV2 bundles, in search order
+    :rtype: list[str]
+    """
+    path = os.environ.get("LV2_PATH")
+    directories = path.split(os.pathsep) if path else DEFAULT_LV2_PATH
+    return [os.path.expanduser(directory) for directory in directories if directory]
+
+
+def bundle_mtime(bundle: str) -> list[int]:
+    """
+    Get what invalidates the index of a bundle: the mtimes of its directory,
+    which changes when files are added, removed or replaced, and of its
+    manifest.
+    """
+    return [
+        os.stat(bundle).st_mtime_ns,
+        os.stat(os.path.join(bundle, MANIFEST)).st_mtime_ns,
+    ]
+
+
+def file_iri(path: str) -> str:
+    return "file://" + os.path.abspath(path).replace(os.sep, "/")
+
+
+def iri_path(iri: str) -> str | None:
+    url = urlparse(iri)
+    return unquote(url.path) if url.scheme == "file" else None
+
+
+def number(values: list[Any]) -> float | None:
+    for value in values:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+    return None
+
+
+def plugin_ports(graph: Graph, plugin: IRI) -> dict[str, PortInfo]:
+    ports: dict[str, PortInfo] = {}
+
+    for port in graph.get(plugin, {}).get(LV2 + "port", []):
+        properties = graph.get(port, {})
+        symbols = properties.get(LV2 + "symbol", [])
+        if not symbols:
+            continue
+
+        types = properties.get(RDF_TYPE, [])
+        kind = next((PORT_KINDS[t] for t in types if t in PORT_KINDS), "other")
+        ports[str(symbols[0])] = PortInfo(
+            kind,
+            LV2 + "InputPort" in types,
+            number(properties.get(LV2 + "minimum", [])),
+            number(properties.get(LV2 + "maximum", [])),
+            number(properties.get(LV2 + "default", [])),
+        )
+
+    return ports
+
+
+def scan_bundle(bundle: str) -> Plugins:
+    """
+    Read the plugins of an LV2 bundle from its manifest and the files the
+    manifest points to with ``rdfs:seeAlso``.
+
+    :param bundle: bundle directory
+    :type bundle: str
+    :raises TurtleError: if a file of the bundle is invalid
+    :return: ports of every plugin
+    :rtype: Plugins
+    """
+    graph = new_graph()
+    manifest = os.path.join(bundle, MANIFEST)
+
+    with open(manifest, "r", encoding="utf-8") as f:
+        parse(f.read(), file_iri(manifest), graph)
+
+    plugins = [
+        subject
+        for subject, properties in list(graph.items())
+        if isinstance(subject, IRI) and LV2 + "Plugin" in properties.get(RDF_TYPE, [])
+    ]
+
+    seen = {os.path.abspath(manifest)}
+    for plugin in plugins:
+        for see_also in graph[plugin].get(RDFS_SEE_ALSO, []):
+            path = iri_path(see_also)
+            if path is None or path in seen or not os.path.isfile(path):
+                continue
+            seen.add(path)
+            with open(path, "r", encoding="utf-8") as f:
+                parse(f.read(), file_iri(path), graph)
+
+    return {str(plugin): plugin_ports(graph, plugin) for plugin in plugins}
+
+
+class LV2Index:
+    """
+    Index of the LV2 plugins found in the search path, their port symbols
+    and ranges.
+
+    The index is kept in a JSON file and only the bundles whose mtime
+    changed are read again, so refreshing it costs one ``stat`` per bundle.
+    Refreshes are serialized and replace :attr:`plugins` in one assignment,
+    so threads can look up ports while another one refreshes.
+    """
+
+    def __init__(self, path: list[str] | None = None, index_path: str | None = None):
+        """
+        :param path: LV2 search path (default: ``LV2_PATH`` or lilv's default)
+        :param index_path: index file (default: $XDG_CACHE_HOME/ee2pw/lv2_index.json)
+        :type path: list[str] | None
+        :type index_path: str | None
+        """
+        self.path = lv2_path() if path is None else path
+        self.index_path = index_path or default_index_path()
+        self.bundles: dict[str, dict[str, Any]] = self._load()
+        self.plugins: dict[str, dict[str, PortInfo]] = {}
+        self.errors: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        try:
+            with open(self.index_path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if data.get("version") != [INDEX_VERSION, __version__]:
+            return {}
+        return data.get("bundles", {})
+
+    def _save(self) -> None:
+        from .util import atomic_write
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.index_path)), exist_ok=True)
+        atomic_write(
+            self.index_path,
+            json.dumps(
+                {"version": [INDEX_VERSION, __version__], "bundles": self.bundles}
+            ),
+        )
+
+    def find_bundles(self) -> list[str]:
+        bundles: list[str] = []
+
+        for directory in self.path:
+            try:
+                entries = sorted(os.scandir(directory), key=lambda e: e.name)
+            except OSError:
+                continue
+            bundles.extend(
+                os.path.abspath(entry.path)
+                for entry in entries
+                if entry.is_dir() and os.path.isfile(os.path.join(entry.path, MANIFEST))
+            )
+
+        return bundles
+
+    def refresh(self) -> int:
+        """
+        Read the bundles that are new or changed since the last refresh and
+        forget the removed ones.
+
+        :return: number of bundles read
+        :rtype: int
+        """
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self) -> int:
+        bundles: dict[str, dict[str, Any]] = {}
+        scanned = 0
+
+        for bundle in self.find_bundles():
+            try:
+                mtime = bundle_mtime(bundle)
+            except OSError:
+                continue
+
+            cached = self.bundles.get(bundle)
+            if cached is not None and cached["mtime"] == mtime:
+                bundles[bundle] = cached
+                continue
+
+            scanned += 1
+            try:
+                plugins = scan_bundle(bundle)
+                bundles[bundle] = {
+                    "mtime": mtime,
+                    "plugins": {
+                        uri: {symbol: list(port) for symbol, port in ports.items()}
+                        for uri, ports in plugins.items()
+                    },
+                }
+            except (OSError, UnicodeDecodeError, TurtleError) as e:
+                bundles[bundle] = {"mtime": mtime, "plugins": {}, "error": str(e)}
+
+        if scanned or bundles.keys() != self.bundles.keys():
+            self.bundles = bundles
+            self._save()
+        elif self.plugins or not bundles:
+            return 0
+
+        # The first bundle of the search path providing a plugin wins.
+        plugins: dict[str, dict[str, PortInfo]] = {}
+        errors: dict[str, str] = {}
+        for bundle, data in bundles.items():
+            if data.get("error"):
+                errors[bundle] = data["error"]
+            for uri, ports in data["plugins"].items():
+                if uri not in plugins:
+                    plugins[uri] = {
+                        symbol: PortInfo(*port) for symbol, port in ports.items()
+                    }
+
+        self.plugins, self.errors = plugins, errors
+        return scanned
+
+    def ports(self, uri: str) -> dict[str, PortInfo] | None:
+        return self.plugins.get(uri)
+
+
+_shared: LV2Index | None = None
+_shared_lock = threading.Lock()
+
+
+def shared_index() -> LV2Index:
+    """
+    Get the index of the current process, refreshed on every call.
+    """
+    global _shared
+
+    with _shared_lock:
+        if _shared is None:
+            _shared = LV2Index()
+        index = _shared
+    index.refresh()
+    return index
+
+
+class ValidationReport(NamedTuple):
+    nodes: int
+    errors: list[str]
+    warnings: list[str]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def format(self) -> str:
+        lines = [f"error: {error}" for error in self.errors]
+        lines.extend(f"warning: {warning}" for warning in self.warnings)
+        lines.append(
+            f"validated {self.nodes} LV2 nodes: {len(self.errors)} errors, "
+            f"{len(self.warnings)} warnings"
+        )
+        return "\n".join(lines)
+
+
+def validate_config(result: dict, index: LV2Index) -> ValidationReport:
+    """
+    Check the LV2 nodes of a filter chain config against the index: plugin
+    URIs, control ports and their ranges, and the audio ports of the links.
+
+    :param result: filter chain config, as returned by :func:`ee2pw.core.build`
+    :param index: refreshed LV2 index
+    :type result: dict
+    :type index: LV2Index
+    :return: errors, which would fail to load, and out of range values
+    :rtype: ValidationReport
+    """
+    errors: list[str] = []
+    warnings: list[str] = []
+    count = 0
+
+    for module in result.get("context.modules", []):
+        graph = module["args"]["filter.graph"]
+        nodes: dict[str, dict[str, PortInfo] | None] = {}
+
+        for node in graph["nodes"]:
+            if node.get("type") != "lv2":
+                continue
+
+            count += 1
+            name, uri = node["name"], node.get("plugin", "")
+            ports = nodes[name] = index.ports(uri)
+            if ports is None:
+                errors.append(f"{name}: plugin {uri} not found in the LV2 path")
+                continue
+
+            for symbol, value in node.get("control", {}).items():
+                port = ports.get(symbol)
+                if port is None:
+                    errors.append(f"{name}: {uri} has no port {symbol}")
+                elif port.kind != CONTROL or not port.input:
+                    errors.append(f"{name}: {symbol} is not a control input")
+                elif (port.minimum is not None and value < port.minimum) or (
+                    port.maximum is not None and value > port.maximum
+                ):
+                    warnings.append(
+                        f"{name}: {symbol} = {value:g} outside "
+                        f"{port.minimum} .. {port.maximum}"
+                    )
+
+        endpoints = [(link["output"], False) for link in graph.get("links", [])]
+        endpoints += [(link["input"], True) for link in graph.get("links", [])]
+        endpoints += [(port, True) for port in graph.get("inputs", [])]
+        endpoints += [(port, False) for port in graph.get("outputs", [])]
+
+        for endpoint, is_input in endpoints:
+            name, _, symbol = endpoint.rpartition(":")
+            ports = nodes.get(name)
+            if ports is None:
+                continue
+            port = ports.get(symbol)
+            if port is None or port.kind != AUDIO or port.input != is_input:
+                direction = "input" if is_input else "output"
+                errors.append(f"{name}: {symbol} is not an audio {direction}")
+
+    return ValidationReport(count, errors, warnings)
+
+
+def main(argv: list[str] | None = None) -> int:
+    argparser = argparse.ArgumentParser(
+        prog="python -m ee2pw lv2",
+        description="Index the LV2 plugins of LV2_PATH and list them, or the "
+        "ports of some of them.",
+    )
+
+    argparser.add_argument(
+        "plugins", type=str, nargs="*", help="Plugin URIs to list the ports of."
+    )
+    argparser.add_argument(
+        "--index",
+        type=str,
+        help="Index file (default: $XDG_CACHE_HOME/ee2pw/lv2_index.json).",
+    )
+
+    args = argparser.parse_args(argv)
+
+    index = LV2Index(index_path=args.index)
+    scanned = index.refresh()
+    for bundle, error in index.errors.items():
+        print(f"[FAIL] {bundle}: {error}", file=sys.stderr)
+    print(
+        f"{len(index.plugins)} plugins in {len(index.bundles)} bundles, "
+        f"{scanned} read",
+        file=sys.stderr,
+    )
+
+    if not args.plugins:
+        print("\n".join(sorted(index.plugins)))
+        return 0
+
+    status = 0
+    for uri in args.plugins:
+        ports = index.ports(uri)
+        if ports is None:
+            print(f"{uri}: not found", file=sys.stderr)
+            status = 1
+            continue
+        print(uri)
+        for symbol, port in ports.items():
+            direction = "in" if port.input else "out"
+            line = f"  {symbol:<16} {port.kind} {direction}"
+            if port.kind == CONTROL:
+                line += f" {port.minimum} .. {port.maximum}, default {port.default}"
+            print(line)
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
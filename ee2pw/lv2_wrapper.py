@@ -1,6 +1,31 @@
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, NamedTuple
+
 from .util import db_to_linear, format_6f
-from typing import Any
-from decimal import Decimal
+
+BOOL = "bool"
+INVERTED_BOOL = "inverted_bool"
+FLOAT = "float"
+FLOAT_DB = "float_db"
+ENUM = "enum"
+
+# Kinds whose conversion can be deferred and done in bulk.
+DEFERRABLE_KINDS = (FLOAT, FLOAT_DB)
+
+
+class Control(NamedTuple):
+    """
+    Mapping of one EasyEffects setting onto one LV2 control port.
+    """
+
+    port: str
+    key: str
+    kind: str
+    default: Any
+    enum_map: dict[str, float] | None = None
+    lv2_default: float = 0.0
 
 
 def parse_bool(
@@ -37,5 +62,133 @@ def parse_float_db(
     config_string: str,
     config_default: float,
 ) -> float:
-    config_value: float = float(config.get(config_string, config_default))
+    return convert_float_db(config.get(config_string, config_default))
+
+
+def convert_bool(value: Any) -> float:
+    return 1.0 if value else 0.0
+
+
+def convert_inverted_bool(value: Any) -> float:
+    return 0.0 if value else 1.0
+
+
+def convert_float_db(value: Any) -> float:
+    config_value: float = float(value)
     return format_6f(0.0 if config_value <= -100.0 else db_to_linear(config_value))
+
+
+def converter(control: Control) -> Callable[[Any], float]:
+    """
+    Get the function converting an EasyEffects value for a control.
+
+    :param control: control description
+    :type control: Control
+    :return: value converter
+    :rtype: Callable[[Any], float]
+    """
+    if control.kind == BOOL:
+        return convert_bool
+    elif control.kind == INVERTED_BOOL:
+        return convert_inverted_bool
+    elif control.kind == FLOAT:
+        return format_6f
+    elif control.kind == FLOAT_DB:
+        return convert_float_db
+    elif control.kind == ENUM and control.enum_map is not None:
+        enum_map, lv2_default = control.enum_map, control.lv2_default
+        return lambda value: enum_map.get(value, lv2_default)
+
+    raise ValueError(f"invalid control kind for {control.port}: {control.kind}")
+
+
+class Pending:
+    """
+    Placeholder for a control value whose conversion was deferred.
+    """
+
+    __slots__ = ("index",)
+
+    def __init__(self, index: int):
+        self.index = index
+
+
+class Deferred:
+    """
+    ``float`` and ``float_db`` values gathered by compiled converters instead
+    of being converted, in placeholder order.
+    """
+
+    def __init__(self):
+        self.values: list[float] = []
+        self.is_db: list[bool] = []
+
+    def add(self, value: Any, kind: str) -> Pending:
+        self.values.append(float(value))
+        self.is_db.append(kind == FLOAT_DB)
+        return Pending(len(self.values) - 1)
+
+    def convert_scalar(self, index: int) -> float:
+        value = self.values[index]
+        return convert_float_db(value) if self.is_db[index] else format_6f(value)
+
+
+# Per context, so that threads converting presets concurrently, such as the
+# workers of the conversion server, do not defer each other's values.
+_deferred: ContextVar[Deferred | None] = ContextVar("deferred", default=None)
+
+
+@contextmanager
+def deferred() -> Iterator[Deferred]:
+    """
+    Defer the ``float`` and ``float_db`` conversions of compiled converters
+    for the duration of a block.
+
+    Converted controls hold :class:`Pending` placeholders until they are
+    replaced, see :mod:`ee2pw.bulk`.
+    """
+    pending = Deferred()
+    token = _deferred.set(pending)
+    try:
+        yield pending
+    finally:
+        _deferred.reset(token)
+
+
+def compile_controls(
+    controls: Iterable[Control],
+) -> Callable[[dict[Any, Any]], dict[str, float]]:
+    """
+    Compile control descriptions into a single converter.
+
+    The returned function maps an EasyEffects plugin configuration to LV2
+    control values, in the order of ``controls``.
+
+    :param controls: control descriptions
+    :type controls: Iterable[Control]
+    :return: configuration converter
+    :rtype: Callable[[dict[Any, Any]], dict[str, float]]
+    """
+    controls = tuple(controls)
+    table = tuple(
+        (control.port, control.key, control.default, converter(control))
+        for control in controls
+    )
+    kinds = tuple(
+        control.kind if control.kind in DEFERRABLE_KINDS else None
+        for control in controls
+    )
+
+    def convert(config: dict[Any, Any]) -> dict[str, float]:
+        get = config.get
+        pending = _deferred.get()
+        if pending is None:
+            return {port: conv(get(key, default)) for port, key, default, conv in table}
+
+        add = pending.add
+        return {
+            port: add(get(key, default), kind) if kind else conv(get(key, default))
+            for (port, key, default, conv), kind in zip(table, kinds)
+        }
+
+    return convert
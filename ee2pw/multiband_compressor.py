@@ -1,5 +1,15 @@
 from typing import Any
-from .lv2_wrapper import parse_bool, parse_enum, parse_float, parse_float_db
+from .ir import Node
+from .lv2_wrapper import (
+    BOOL,
+    ENUM,
+    FLOAT,
+    FLOAT_DB,
+    INVERTED_BOOL,
+    Control,
+    compile_controls,
+    convert_bool,
+)
 
 PLUGIN_TYPE = "lv2"
 PLUGIN_URI = "http://lsp-plug.in/plugins/lv2/sc_mb_compressor_stereo"
@@ -25,9 +35,78 @@ MULTIBAND_COMPRESSOR_COMPRESSION_MODE_MAP: dict[str, float] = {
 }
 
 
-def parse_multiband_compressor(
-    ee_config: dict[Any, Any], pw_node_name: str
-) -> dict[str, str | dict[str, float]]:
+MULTIBAND_COMPRESSOR_BANDS = 8
+
+MULTIBAND_COMPRESSOR_CONTROLS: tuple[Control, ...] = (
+    Control("enabled", "bypass", INVERTED_BOOL, False),
+    Control("g_in", "input-gain", FLOAT_DB, 0.0),
+    Control("g_out", "output-gain", FLOAT_DB, 0.0),
+    Control("g_dry", "dry", FLOAT_DB, 0.0),
+    Control("g_wet", "wet", FLOAT_DB, 0.0),
+    Control(
+        "mode", "compressor-mode", ENUM, "Modern", MULTIBAND_COMPRESSOR_MODE_MAP, 1.0
+    ),
+    Control(
+        "envb",
+        "envelope-boost",
+        ENUM,
+        "Pink BT",
+        MULTIBAND_COMPRESSOR_ENVELOPE_BOOST_MAP,
+        1.0,
+    ),
+    Control("ssplit", "stereo-split", BOOL, False),
+)
+
+
+def band_controls(i: int) -> tuple[Control, ...]:
+    """
+    Get the controls of one multiband compressor band.
+
+    Band 0 is always active and has no split frequency.
+
+    :param i: band index
+    :type i: int
+    :return: band controls
+    :rtype: tuple[Control, ...]
+    """
+    split: tuple[Control, ...] = (
+        (Control(f"sf_{i}", "split-frequency", FLOAT, 0.0),) if i != 0 else ()
+    )
+
+    return split + (
+        Control(f"ce_{i}", "compressor-enable", BOOL, True),
+        Control(f"bs_{i}", "solo", BOOL, False),
+        Control(f"bm_{i}", "mute", BOOL, False),
+        Control(f"al_{i}", "attack-threshold", FLOAT_DB, -12.0),
+        Control(f"at_{i}", "attack-time", FLOAT, 0.0),
+        Control(f"rrl_{i}", "release-threshold", FLOAT_DB, 0.0),
+        Control(f"rt_{i}", "release-time", FLOAT, 100.0),
+        Control(f"cr_{i}", "ratio", FLOAT_DB, 0.0),
+        Control(f"kn_{i}", "knee", FLOAT_DB, -6.0),
+        Control(f"mk_{i}", "makeup", FLOAT_DB, 0.0),
+        Control(
+            f"cm_{i}",
+            "compression-mode",
+            ENUM,
+            "Downward",
+            MULTIBAND_COMPRESSOR_COMPRESSION_MODE_MAP,
+            0.0,
+        ),
+        Control(f"bth_{i}", "boost-threshold", FLOAT_DB, -72.0),
+        Control(f"bsa_{i}", "boost-amount", FLOAT_DB, 0.0),
+    )
+
+
+convert_multiband_compressor = compile_controls(MULTIBAND_COMPRESSOR_CONTROLS)
+
+# (band key, band enable port, band converter), expanded once for all bands.
+MULTIBAND_COMPRESSOR_BAND_CONVERTERS = tuple(
+    (f"band{i}", f"cbe_{i}" if i != 0 else None, compile_controls(band_controls(i)))
+    for i in range(MULTIBAND_COMPRESSOR_BANDS)
+)
+
+
+def parse_multiband_compressor(ee_config: dict[Any, Any], pw_node_name: str) -> Node:
     """
     Parse multiband compressor settings.
 
@@ -36,82 +115,20 @@ def parse_multiband_compressor(
     :type data: dict[Any, Any]
     :type pw_node_name: str
     :return: parsed multiband compressor settings
-    :rtype: dict
+    :rtype: Node
     """
-    pw_node_control_config = {}
-
-    pw_node_control_config.update(
-        {
-            "enabled": parse_bool(ee_config, "bypass", False, True),
-            "g_in": parse_float_db(ee_config, "input-gain", 0.0),
-            "g_out": parse_float_db(ee_config, "output-gain", 0.0),
-            "g_dry": parse_float_db(ee_config, "dry", 0.0),
-            "g_wet": parse_float_db(ee_config, "wet", 0.0),
-            "mode": parse_enum(
-                ee_config,
-                "compressor-mode",
-                "Modern",
-                MULTIBAND_COMPRESSOR_MODE_MAP,
-                1.0,
-            ),
-            "envb": parse_enum(
-                ee_config,
-                "envelope-boost",
-                "Pink BT",
-                MULTIBAND_COMPRESSOR_ENVELOPE_BOOST_MAP,
-                1.0,
-            ),
-            "ssplit": parse_bool(ee_config, "stereo-split", False),
-        }
-    )
+    pw_node_control_config = convert_multiband_compressor(ee_config)
 
-    for i in range(0, 8):
-        ee_mb_band_config: dict[Any, Any] = ee_config.get(f"band{i}", {})
-        band_enabled: float = parse_bool(ee_mb_band_config, "enable-band", False)
+    for band_key, enable_port, convert_band in MULTIBAND_COMPRESSOR_BAND_CONVERTERS:
+        ee_mb_band_config: dict[Any, Any] = ee_config.get(band_key, {})
 
-        if i != 0:  # band0 always active
-            pw_node_control_config.update(
-                {
-                    f"cbe_{i}": band_enabled,
-                }
-            )
+        if enable_port is not None:  # band0 always active
+            band_enabled = convert_bool(ee_mb_band_config.get("enable-band", False))
+            pw_node_control_config[enable_port] = band_enabled
 
-            if not bool(band_enabled):
+            if not band_enabled:
                 continue
 
-            pw_node_control_config.update(
-                {
-                    f"sf_{i}": parse_float(ee_mb_band_config, "split-frequency", 0.0),
-                }
-            )
-
-        pw_node_control_config.update(
-            {
-                f"ce_{i}": parse_bool(ee_mb_band_config, "compressor-enable", True),
-                f"bs_{i}": parse_bool(ee_mb_band_config, "solo", False),
-                f"bm_{i}": parse_bool(ee_mb_band_config, "mute", False),
-                f"al_{i}": parse_float_db(ee_mb_band_config, "attack-threshold", -12.0),
-                f"at_{i}": parse_float(ee_mb_band_config, "attack-time", 0.0),
-                f"rrl_{i}": parse_float_db(ee_mb_band_config, "release-threshold", 0.0),
-                f"rt_{i}": parse_float(ee_mb_band_config, "release-time", 100.0),
-                f"cr_{i}": parse_float_db(ee_mb_band_config, "ratio", 0.0),
-                f"kn_{i}": parse_float_db(ee_mb_band_config, "knee", -6.0),
-                f"mk_{i}": parse_float_db(ee_mb_band_config, "makeup", 0.0),
-                f"cm_{i}": parse_enum(
-                    ee_mb_band_config,
-                    "compression-mode",
-                    "Downward",
-                    MULTIBAND_COMPRESSOR_COMPRESSION_MODE_MAP,
-                    0.0,
-                ),
-                f"bth_{i}": parse_float_db(ee_mb_band_config, "boost-threshold", -72.0),
-                f"bsa_{i}": parse_float_db(ee_mb_band_config, "boost-amount", 0.0),
-            }
-        )
-
-    return {
-        "type": PLUGIN_TYPE,
-        "name": pw_node_name,
-        "plugin": PLUGIN_URI,
-        "control": pw_node_control_config,
-    }
+        pw_node_control_config.update(convert_band(ee_mb_band_config))
+
+    return Node(PLUGIN_TYPE, pw_node_name, PLUGIN_URI, control=pw_node_control_config)
@@ -0,0 +1,312 @@
+from typing import NamedTuple
+
+from .cost import INSTANCE_OVERHEAD_COST, node_cost
+from .equalizer import (
+    EQUALIZER_FT_MAP,
+    EQUALIZER_SIZES,
+    PLUGIN_TYPE,
+    equalizer_size,
+    equalizer_uri,
+)
+from .filter import FILTER_FT_MAP, PLUGIN_URI as FILTER_URI
+from .ir import Node
+from .util import format_6f
+
+# Filter types (FILTER_FT_MAP) that are flat when their gain is 0 dB.
+FLAT_AT_UNITY_FILTER_TYPES = (2.0, 3.0, 4.0)
+
+# Filter plugin type -> equalizer band type.
+FILTER_TO_EQUALIZER_FT: dict[float, float] = {
+    value: EQUALIZER_FT_MAP[name] for name, value in FILTER_FT_MAP.items()
+}
+
+# Steepest filter slope the equalizer bands support (x4).
+MAX_EQUALIZER_SLOPE = 3.0
+
+# Filter ports copied to equalizer band ports (``<port>_<band>``).
+FILTER_BAND_PORTS = ("fm", "s", "f", "w", "g", "q")
+
+# Control values that make Calf stereo tools pass the signal through unchanged,
+# apart from its input and output levels.
+STEREO_TOOLS_IDENTITY: dict[str, float] = {
+    "balance_in": 0.0,
+    "balance_out": 0.0,
+    "softclip": 0.0,
+    "mutel": 0.0,
+    "muter": 0.0,
+    "phasel": 0.0,
+    "phaser": 0.0,
+    "mode": 0.0,
+    "slev": 1.0,
+    "sbal": 0.0,
+    "mlev": 1.0,
+    "mpan": 0.0,
+    "stereo_base": 0.0,
+    "delay": 0.0,
+    "stereo_phase": 0.0,
+}
+
+# (input gain port, output gain port) per plugin, applied first and last.
+GAIN_PORTS: dict[str, tuple[str, str]] = {
+    "http://calf.sourceforge.net/plugins/BassEnhancer": ("level_in", "level_out"),
+    "http://calf.sourceforge.net/plugins/StereoTools": ("level_in", "level_out"),
+    FILTER_URI: ("g_in", "g_out"),
+    "http://lsp-plug.in/plugins/lv2/sc_limiter_stereo": ("g_in", "g_out"),
+    "http://lsp-plug.in/plugins/lv2/sc_mb_compressor_stereo": ("g_in", "g_out"),
+}
+
+
+class Change(NamedTuple):
+    name: str
+    reason: str
+    cost: float
+
+
+class OptimizationReport(NamedTuple):
+    changes: list[Change]
+    total_cost: float
+
+    @property
+    def saved_cost(self) -> float:
+        return sum(change.cost for change in self.changes)
+
+    def format(self) -> str:
+        lines = [f"removed {change.name}: {change.reason}" for change in self.changes]
+        percent = 100 * self.saved_cost / self.total_cost if self.total_cost else 0.0
+        lines.append(
+            f"estimated CPU saved: {percent:.0f}% "
+            f"({self.saved_cost:g} of {self.total_cost:g} units)"
+        )
+        return "\n".join(lines)
+
+
+def is_bypassed(node: Node) -> bool:
+    """
+    Check whether a node is bypassed and passes its input through unchanged.
+
+    :param node: parsed plugin node
+    :type node: Node
+    :return: True if the node is bypassed
+    :rtype: bool
+    """
+    control = node.control
+
+    if control.get("enabled") == 0.0:  # LSP
+        return True
+    if control.get("bypass") == 1.0:  # Calf
+        return True
+
+    return False
+
+
+def identity_gain(node: Node) -> float | None:
+    """
+    Get the gain of a node that only scales its input.
+
+    :param node: parsed plugin node
+    :type node: Node
+    :return: linear gain, or None if the node does more than scaling
+    :rtype: float | None
+    """
+    plugin = node.plugin
+    control = node.control
+
+    if plugin == "http://calf.sourceforge.net/plugins/StereoTools":
+        if all(control.get(k, v) == v for k, v in STEREO_TOOLS_IDENTITY.items()):
+            return control.get("level_in", 1.0) * control.get("level_out", 1.0)
+    elif plugin == FILTER_URI:
+        if (
+            control.get("ft") in FLAT_AT_UNITY_FILTER_TYPES
+            and control.get("g") == 1.0
+            and control.get("bal", 0.0) == 0.0
+        ):
+            return control.get("g_in", 1.0) * control.get("g_out", 1.0)
+
+    return None
+
+
+def fold_gain(gain: float, before: Node | None, after: Node | None) -> str | None:
+    """
+    Fold a gain into the output gain of the node before it, or into the input
+    gain of the node after it.
+
+    :return: the port the gain was folded into, or None if there is none
+    :rtype: str | None
+    """
+    for node, side in ((before, 1), (after, 0)):
+        if node is None or node.plugin not in GAIN_PORTS:
+            continue
+
+        port = GAIN_PORTS[node.plugin][side]
+        control = node.control
+        control[port] = format_6f(control.get(port, 1.0) * gain)
+
+        return f"{node.name}:{port}"
+
+    return None
+
+
+def optimize_nodes(nodes: list[Node]) -> tuple[list[Node], OptimizationReport]:
+    """
+    Remove nodes that cannot affect the audio.
+
+    Bypassed nodes are dropped. Nodes that only apply a gain are dropped, and
+    their gain is folded into a neighbouring node when it is not unity. Links
+    are created from the returned node list, so they are rewired around the
+    removed nodes.
+
+    :param nodes: parsed plugin nodes, in chain order
+    :type nodes: list[Node]
+    :return: remaining nodes and what was removed
+    :rtype: tuple[list[Node], OptimizationReport]
+    """
+    total_cost = sum(node_cost(node) for node in nodes)
+    changes: list[Change] = []
+    kept: list[Node] = []
+
+    for node in nodes:
+        if is_bypassed(node):
+            changes.append(Change(node.name, "bypassed", node_cost(node)))
+        else:
+            kept.append(node)
+
+    optimized: list[Node] = []
+
+    for i, node in enumerate(kept):
+        gain = identity_gain(node)
+
+        if gain is None:
+            optimized.append(node)
+            continue
+
+        if gain == 1.0:
+            reason = "unity gain"
+        else:
+            before = optimized[-1] if optimized else None
+            after = kept[i + 1] if i + 1 < len(kept) else None
+            port = fold_gain(gain, before, after)
+
+            if port is None:
+                optimized.append(node)
+                continue
+
+            reason = f"gain {gain:g} folded into {port}"
+
+        changes.append(Change(node.name, reason, node_cost(node)))
+
+    return optimized, OptimizationReport(changes, total_cost)
+
+
+def fusable_filter(node: Node) -> bool:
+    """
+    Check whether a filter node can become a band of an equalizer.
+
+    :param node: parsed plugin node
+    :type node: Node
+    :return: True if the node is an enabled filter the equalizer can reproduce
+    :rtype: bool
+    """
+    if node.plugin != FILTER_URI:
+        return False
+
+    control = node.control
+
+    return (
+        control.get("enabled") == 1.0
+        and control.get("bal", 0.0) == 0.0
+        and control.get("s", 0.0) <= MAX_EQUALIZER_SLOPE
+        and control.get("ft") in FILTER_TO_EQUALIZER_FT
+    )
+
+
+def fuse_group(filters: list[Node]) -> Node:
+    """
+    Merge filter nodes into one equalizer node, one band per filter.
+
+    The filters must share the same equalizer mode. Their input and output
+    gains are multiplied together, which is exact since every band is linear.
+
+    :param filters: fusable filter nodes, in chain order
+    :type filters: list[Node]
+    :return: equalizer node named after the first filter
+    :rtype: Node
+    """
+    size = equalizer_size(len(filters))
+    g_in = g_out = 1.0
+
+    for node in filters:
+        g_in *= node.control.get("g_in", 1.0)
+        g_out *= node.control.get("g_out", 1.0)
+
+    control: dict[str, float] = {
+        "enabled": 1.0,
+        "mode": filters[0].control.get("mode", 0.0),
+        "g_in": format_6f(g_in),
+        "g_out": format_6f(g_out),
+    }
+
+    for band in range(size):
+        if band >= len(filters):
+            control[f"ft_{band}"] = EQUALIZER_FT_MAP["Off"]
+            continue
+
+        source = filters[band].control
+        control[f"ft_{band}"] = FILTER_TO_EQUALIZER_FT[source["ft"]]
+        for port in FILTER_BAND_PORTS:
+            if port in source:
+                control[f"{port}_{band}"] = source[port]
+
+    return Node(PLUGIN_TYPE, filters[0].name, equalizer_uri(size), control=control)
+
+
+def fuse_filters(nodes: list[Node]) -> tuple[list[Node], OptimizationReport]:
+    """
+    Merge runs of consecutive filter nodes into parametric equalizer nodes.
+
+    Filters that are bypassed, use a balance, a slope steeper than x4 or a
+    different equalizer mode than the rest of the run are left as separate
+    nodes. Runs longer than the largest equalizer are split.
+
+    :param nodes: parsed plugin nodes, in chain order
+    :type nodes: list[Node]
+    :return: nodes with the runs fused and what was fused
+    :rtype: tuple[list[Node], OptimizationReport]
+    """
+    total_cost = sum(node_cost(node) for node in nodes)
+    changes: list[Change] = []
+    fused: list[Node] = []
+    run: list[Node] = []
+
+    def flush() -> None:
+        if len(run) < 2:
+            fused.extend(run)
+        else:
+            node = fuse_group(run)
+            label = node.plugin.rpartition("/")[2]
+            for absorbed in run[1:]:
+                changes.append(
+                    Change(
+                        absorbed.name,
+                        f"fused into {node.name} ({label})",
+                        INSTANCE_OVERHEAD_COST,
+                    )
+                )
+            fused.append(node)
+        run.clear()
+
+    for node in nodes:
+        if not fusable_filter(node):
+            flush()
+            fused.append(node)
+            continue
+
+        if run and (
+            len(run) == EQUALIZER_SIZES[-1]
+            or node.control.get("mode") != run[0].control.get("mode")
+        ):
+            flush()
+        run.append(node)
+
+    flush()
+
+    return fused, OptimizationReport(changes, total_cost)
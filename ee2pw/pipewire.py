@@ -0,0 +1,401 @@
+import argparse, json, subprocess, sys
+from collections.abc import AsyncIterator, Iterable, Iterator
+from typing import TYPE_CHECKING, Any, TextIO
+
+from .core import capture_node_name, playback_node_name
+
+if TYPE_CHECKING:
+    import asyncio
+
+NODE_TYPE = "PipeWire:Interface:Node"
+METADATA_TYPE = "PipeWire:Interface:Metadata"
+
+PwObject = dict[str, Any]
+
+
+def load_pw_dump(filepath: str | None = None) -> list[PwObject]:
+    """
+    Load a ``pw-dump`` snapshot from a file, or from a running PipeWire.
+
+    :param filepath: path to a saved ``pw-dump`` JSON output (if any)
+    :type filepath: str | None
+    :return: PipeWire objects
+    :rtype: list[PwObject]
+    """
+    if filepath:
+        with open(filepath, "r") as f:
+            return json.load(f)
+
+    dump = subprocess.run(["pw-dump"], check=True, capture_output=True, text=True)
+    return json.loads(dump.stdout)
+
+
+class PwDumpDecoder:
+    """
+    Incremental decoder of the consecutive JSON arrays written by
+    ``pw-dump --monitor``, fed one line at a time.
+
+    An update is decoded once the line closing its top-level array is read,
+    so updates are seen as they arrive.
+    """
+
+    def __init__(self):
+        self.lines: list[str] = []
+
+    def feed(self, line: str) -> list[PwObject] | None:
+        """
+        :return: the changed objects of the update ended by the line, if any
+        :rtype: list[PwObject] | None
+        """
+        self.lines.append(line)
+        if not line.rstrip().endswith("]") or line[:1].isspace():
+            return None
+        try:
+            objects = json.loads("".join(self.lines))
+        except json.JSONDecodeError:
+            return None
+        self.lines.clear()
+        return objects
+
+    def close(self) -> None:
+        if "".join(self.lines).strip():
+            raise ValueError("truncated pw-dump output")
+
+
+def iter_pw_dump(fp: TextIO) -> Iterator[list[PwObject]]:
+    """
+    Read the consecutive JSON arrays written by ``pw-dump --monitor``.
+
+    :param fp: text stream, such as the standard output of ``pw-dump --monitor``
+    :type fp: TextIO
+    :return: one list of changed objects per update
+    :rtype: Iterator[list[PwObject]]
+    """
+    decoder = PwDumpDecoder()
+
+    for line in fp:
+        objects = decoder.feed(line)
+        if objects is not None:
+            yield objects
+
+    decoder.close()
+
+
+async def aiter_pw_dump(
+    reader: "asyncio.StreamReader",
+) -> AsyncIterator[list[PwObject]]:
+    """
+    Read the updates of ``pw-dump --monitor`` from an asyncio stream.
+
+    :param reader: standard output of ``pw-dump --monitor``
+    :type reader: asyncio.StreamReader
+    :return: one list of changed objects per update
+    :rtype: AsyncIterator[list[PwObject]]
+    """
+    decoder = PwDumpDecoder()
+
+    while line := await reader.readline():
+        objects = decoder.feed(line.decode())
+        if objects is not None:
+            yield objects
+
+    decoder.close()
+
+
+def props(obj: PwObject) -> dict[str, Any]:
+    return (obj.get("info") or {}).get("props") or {}
+
+
+def merge_object(old: PwObject, new: PwObject) -> PwObject:
+    """
+    Apply a ``pw-dump --monitor`` update to a known object.
+
+    Updates may only carry the parts that changed. ``props`` and ``params``
+    are replaced as a whole when present, as PipeWire always sends them in
+    full.
+    """
+    merged = {**old, **new}
+    if isinstance(old.get("info"), dict) and isinstance(new.get("info"), dict):
+        merged["info"] = {**old["info"], **new["info"]}
+    return merged
+
+
+class PwDumpIndex:
+    """
+    Index of the objects of a ``pw-dump`` snapshot.
+
+    Nodes are indexed by ``node.name``, ``media.class`` and
+    ``node.link-group``, which the capture and playback nodes of a filter
+    chain share. The index is rebuilt lazily, only after an update actually
+    changed an object, and :attr:`generation` is bumped on every change so
+    callers can cache what they derive from it.
+    """
+
+    def __init__(self, objects: Iterable[PwObject] = ()):
+        self.objects: dict[int, PwObject] = {obj["id"]: obj for obj in objects}
+        self.generation = 0
+        self._dirty = True
+        self._by_name: dict[str, list[int]] = {}
+        self._by_media_class: dict[str, list[int]] = {}
+        self._by_link_group: dict[str, list[int]] = {}
+        self._metadata: dict[str, int] = {}
+
+    @classmethod
+    def load(cls, filepath: str | None = None) -> "PwDumpIndex":
+        return cls(load_pw_dump(filepath))
+
+    def update(self, objects: Iterable[PwObject]) -> bool:
+        """
+        Apply one ``pw-dump --monitor`` update.
+
+        Objects with a null ``info`` and no other content are removed.
+
+        :param objects: changed objects
+        :type objects: Iterable[PwObject]
+        :return: True if the graph changed
+        :rtype: bool
+        """
+        changed = False
+
+        for obj in objects:
+            object_id = obj["id"]
+            old = self.objects.get(object_id)
+
+            if obj.get("info", True) is None and "metadata" not in obj:
+                if old is not None:
+                    del self.objects[object_id]
+                    changed = True
+                continue
+
+            new = obj if old is None else merge_object(old, obj)
+            if new != old:
+                self.objects[object_id] = new
+                changed = True
+
+        if changed:
+            self.generation += 1
+            self._dirty = True
+
+        return changed
+
+    def _reindex(self) -> None:
+        if not self._dirty:
+            return
+
+        self._by_name, self._by_media_class, self._by_link_group = {}, {}, {}
+        self._metadata = {}
+
+        for object_id in sorted(self.objects):
+            obj = self.objects[object_id]
+
+            if obj.get("type") == METADATA_TYPE:
+                name = (obj.get("props") or {}).get("metadata.name")
+                if name is not None:
+                    self._metadata.setdefault(name, object_id)
+                continue
+
+            if obj.get("type") != NODE_TYPE:
+                continue
+
+            node_props = props(obj)
+            for key, index in (
+                ("node.name", self._by_name),
+                ("media.class", self._by_media_class),
+                ("node.link-group", self._by_link_group),
+            ):
+                value = node_props.get(key)
+                if value is not None:
+                    index.setdefault(value, []).append(object_id)
+
+        self._dirty = False
+
+    def get(self, object_id: int) -> PwObject | None:
+        return self.objects.get(object_id)
+
+    def node(self, name: str) -> PwObject | None:
+        """
+        Get the node with a ``node.name``, the lowest id first.
+        """
+        self._reindex()
+        ids = self._by_name.get(name)
+        return self.objects[ids[0]] if ids else None
+
+    def node_id(self, name: str) -> int | None:
+        node = self.node(name)
+        return None if node is None else node["id"]
+
+    def nodes(self, media_class: str | None = None) -> list[PwObject]:
+        """
+        List nodes, all of them or those of one ``media.class``.
+        """
+        self._reindex()
+        if media_class is None:
+            ids = sorted(i for ids in self._by_name.values() for i in ids)
+        else:
+            ids = self._by_media_class.get(media_class, [])
+        return [self.objects[i] for i in ids]
+
+    def link_group(self, node: PwObject) -> list[PwObject]:
+        """
+        List the nodes sharing the ``node.link-group`` of a node.
+        """
+        self._reindex()
+        group = props(node).get("node.link-group")
+        if group is None:
+            return [node]
+        return [self.objects[i] for i in self._by_link_group.get(group, [])]
+
+    def filter_chain(self, filter_chain_name: str) -> list[PwObject]:
+        """
+        List the running nodes of a filter chain created by ee2pw.
+
+        :param filter_chain_name: filter chain name
+        :type filter_chain_name: str
+        :return: capture and playback nodes, empty if it is not running
+        :rtype: list[PwObject]
+        """
+        for name in (
+            capture_node_name(filter_chain_name),
+            playback_node_name(filter_chain_name),
+        ):
+            node = self.node(name)
+            if node is not None:
+                return self.link_group(node)
+
+        return []
+
+    def metadata(self, name: str = "default") -> PwObject | None:
+        self._reindex()
+        object_id = self._metadata.get(name)
+        return None if object_id is None else self.objects[object_id]
+
+    def metadata_value(self, key: str, subject: int = 0, name: str = "default") -> Any:
+        """
+        Get a metadata entry value, such as ``default.audio.sink``.
+
+        :param key: metadata key
+        :param subject: object id the entry is about, 0 for global entries
+        :param name: metadata name, such as ``default`` or ``filters``
+        :type key: str
+        :type subject: int
+        :type name: str
+        :return: entry value, or None if there is no such entry
+        :rtype: Any
+        """
+        metadata = self.metadata(name)
+        for entry in (metadata or {}).get("metadata") or []:
+            if entry.get("subject") == subject and entry.get("key") == key:
+                return entry.get("value")
+        return None
+
+
+def format_node(node: PwObject) -> str:
+    node_props = props(node)
+    return (
+        f"{node['id']}\t{node_props.get('media.class', '')}\t"
+        f"{node_props.get('node.name', '')}"
+    )
+
+
+def query(index: PwDumpIndex, args: argparse.Namespace) -> tuple[list[str], bool]:
+    """
+    Answer the queries of the ``pw`` subcommand.
+
+    :return: output lines, and False if a queried node was not found
+    :rtype: tuple[list[str], bool]
+    """
+    lines: list[str] = []
+    found = True
+
+    for name in args.id or []:
+        node_id = index.node_id(name)
+        if node_id is None:
+            found = False
+        else:
+            lines.append(str(node_id))
+
+    if args.filter_chain:
+        chain = index.filter_chain(args.filter_chain)
+        found = found and bool(chain)
+        lines.extend(format_node(node) for node in chain)
+
+    if args.media_class or not (args.id or args.filter_chain):
+        lines.extend(format_node(node) for node in index.nodes(args.media_class))
+
+    return lines, found
+
+
+def main(argv: list[str] | None = None) -> int:
+    argparser = argparse.ArgumentParser(
+        prog="python -m ee2pw pw",
+        description="Resolve PipeWire nodes from a single pw-dump snapshot.",
+    )
+
+    argparser.add_argument(
+        "--pw-dump",
+        type=str,
+        help="Saved pw-dump JSON to read instead of running pw-dump.",
+    )
+    argparser.add_argument(
+        "--id",
+        type=str,
+        action="append",
+        metavar="NODE_NAME",
+        help="Print the id of a node (can be repeated).",
+    )
+    argparser.add_argument(
+        "-c", "--media-class", type=str, help="List the nodes of a media class."
+    )
+    argparser.add_argument(
+        "--filter-chain",
+        type=str,
+        metavar="FILTER_CHAIN_NAME",
+        help="List the nodes of a running filter chain.",
+    )
+    argparser.add_argument(
+        "--monitor",
+        action="store_true",
+        help="Keep reading pw-dump --monitor, or every update saved in "
+        "--pw-dump, and print the answers again whenever they change.",
+    )
+
+    args = argparser.parse_args(argv)
+
+    if not args.monitor:
+        lines, found = query(PwDumpIndex.load(args.pw_dump), args)
+        if lines:
+            print("\n".join(lines))
+        return 0 if found else 1
+
+    index = PwDumpIndex()
+    previous: list[str] | None = None
+
+    if args.pw_dump:
+        fp: TextIO = open(args.pw_dump, "r")
+        process = None
+    else:
+        process = subprocess.Popen(
+            ["pw-dump", "--monitor", "--no-colors"], stdout=subprocess.PIPE, text=True
+        )
+        fp = process.stdout  # type: ignore[assignment]
+
+    try:
+        for update in iter_pw_dump(fp):
+            if not index.update(update):
+                continue
+            lines, _ = query(index, args)
+            if lines != previous:
+                print("\n".join(lines), flush=True)
+                previous = lines
+    except KeyboardInterrupt:
+        pass
+    finally:
+        fp.close()
+        if process is not None:
+            process.terminate()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+import argparse, json, re, sys
+from collections.abc import Iterable
+from typing import NamedTuple
+
+from .cost import NodeCost, chain_cost
+from .ir import Node
+
+HEADER = re.compile(r"^\s*S\s+ID\s+QUANT\s+RATE\b")
+TIME = re.compile(r"^([\d.]+)(us|µs|ms|s)$")
+TIME_UNITS = {"us": 1.0, "µs": 1.0, "ms": 1e3, "s": 1e6}
+
+# Columns before FORMAT and NAME.
+FIXED_COLUMNS = 9
+
+
+class PwTopRow(NamedTuple):
+    """
+    One node of a ``pw-top -b`` refresh, times in microseconds.
+
+    ``quantum`` is the duration of the quantum of the node's driver, in
+    microseconds, when known.
+    """
+
+    state: str
+    id: int
+    name: str
+    wait: float | None
+    busy: float | None
+    busy_quantum: float | None
+    errors: int
+    quantum: float | None
+
+
+def parse_time(value: str) -> float | None:
+    match = TIME.match(value)
+    if match is None:
+        return None  # "----" when inactive, "+++" when out of range
+    return float(match.group(1)) * TIME_UNITS[match.group(2)]
+
+
+def parse_fraction(value: str) -> float | None:
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def parse_name(columns: list[str]) -> tuple[str, bool]:
+    """
+    Split the FORMAT and NAME columns, followers being marked with ``+``.
+    """
+    if "+" in columns:
+        return " ".join(columns[columns.index("+") + 1 :]), True
+    # Audio formats are "<sample format> <channels> <rate>".
+    if len(columns) > 3 and columns[1].isdigit() and columns[2].isdigit():
+        return " ".join(columns[3:]), False
+    return " ".join(columns), False
+
+
+def parse_pw_top(lines: Iterable[str]) -> list[list[PwTopRow]]:
+    """
+    Parse the output of ``pw-top -b``, one refresh per header line.
+
+    :param lines: lines of the batch output
+    :type lines: Iterable[str]
+    :raises ValueError: if a row cannot be parsed
+    :return: rows of every refresh
+    :rtype: list[list[PwTopRow]]
+    """
+    samples: list[list[PwTopRow]] = []
+    quantum: float | None = None
+
+    for number, line in enumerate(lines, 1):
+        if HEADER.match(line):
+            samples.append([])
+            continue
+        columns = line.split()
+        if not columns:
+            continue
+        if not samples or len(columns) < FIXED_COLUMNS + 1:
+            raise ValueError(f"line {number}: not a pw-top -b row: {line.rstrip()!r}")
+
+        state, node_id, quant, rate, wait, busy, _, busy_quantum, errors = columns[
+            :FIXED_COLUMNS
+        ]
+        name, follower = parse_name(columns[FIXED_COLUMNS:])
+
+        if not follower:
+            quant_, rate_ = int(quant), int(rate)
+            quantum = 1e6 * quant_ / rate_ if quant_ and rate_ else None
+
+        samples[-1].append(
+            PwTopRow(
+                state,
+                int(node_id),
+                name,
+                parse_time(wait),
+                parse_time(busy),
+                parse_fraction(busy_quantum),
+                int(errors),
+                quantum,
+            )
+        )
+
+    return samples
+
+
+class ChainNodes(NamedTuple):
+    """
+    PipeWire nodes of one filter chain module and the plugins it runs.
+    """
+
+    name: str
+    nodes: list[str]
+    plugins: list[NodeCost]
+
+
+def config_chains(result: dict) -> list[ChainNodes]:
+    """
+    Get the nodes of every filter chain module of a config written by ee2pw.
+
+    :param result: filter chain config, as returned by :func:`ee2pw.core.build`
+    :type result: dict
+    :return: one entry per module, split chains having several
+    :rtype: list[ChainNodes]
+    """
+    chains: list[ChainNodes] = []
+
+    for module in result.get("context.modules", []):
+        args = module["args"]
+        nodes = [
+            args[props]["node.name"]
+            for props in ("capture.props", "playback.props")
+            if "node.name" in args.get(props, {})
+        ]
+        plugins = chain_cost(
+            [Node.from_dict(node) for node in args["filter.graph"]["nodes"]]
+        ).nodes
+        chains.append(ChainNodes(args.get("node.description", ""), nodes, plugins))
+
+    return chains
+
+
+def mean(values: list[float]) -> float:
+    return sum(values) / len(values) if values else 0.0
+
+
+class ChainProfile(NamedTuple):
+    chain: ChainNodes
+    busy: list[float]  # per sample, microseconds
+    utilisation: list[float]  # per sample, busy time over the quantum
+    errors: int
+
+    @property
+    def total_cost(self) -> float:
+        return sum(plugin.cost for plugin in self.chain.plugins)
+
+    def plugin_shares(self) -> list[tuple[NodeCost, float]]:
+        """
+        Split the chain's time between its plugins by their estimated cost,
+        PipeWire only measuring the filter chain nodes as a whole.
+        """
+        total = self.total_cost
+        return [
+            (plugin, plugin.cost / total if total else 0.0)
+            for plugin in self.chain.plugins
+        ]
+
+    def format(self) -> str:
+        if not self.busy:
+            return (
+                f"{self.chain.name} ({' + '.join(self.chain.nodes)}): "
+                "not running in the samples"
+            )
+
+        busy, utilisation = mean(self.busy), mean(self.utilisation)
+        lines = [
+            f"{self.chain.name} ({' + '.join(self.chain.nodes)}): "
+            f"{len(self.busy)} samples, busy {busy:.1f}us mean, "
+            f"{max(self.busy, default=0.0):.1f}us max, "
+            f"{100 * utilisation:.2f}% of the quantum mean, "
+            f"{100 * max(self.utilisation, default=0.0):.2f}% max, "
+            f"{self.errors} errors"
+        ]
+        for plugin, share in self.plugin_shares():
+            lines.append(
+                f"  {busy * share:9.1f}us {100 * utilisation * share:6.2f}%  "
+                f"{plugin.name} ({plugin.plugin.rpartition('/')[2]})"
+            )
+        return "\n".join(lines)
+
+
+def profile(
+    samples: list[list[PwTopRow]], chains: list[ChainNodes]
+) -> list[ChainProfile]:
+    """
+    Measure the busy time of filter chains in ``pw-top`` samples.
+
+    The busy time of a chain is that of its capture and playback nodes
+    together, in the samples where at least one of them was active.
+
+    :param samples: parsed ``pw-top -b`` refreshes
+    :param chains: filter chains to look for
+    :type samples: list[list[PwTopRow]]
+    :type chains: list[ChainNodes]
+    :return: profile of every chain, busiest first
+    :rtype: list[ChainProfile]
+    """
+    profiles: list[ChainProfile] = []
+
+    for chain in chains:
+        busy: list[float] = []
+        utilisation: list[float] = []
+        first_errors: int | None = None
+        last_errors = 0
+
+        for sample in samples:
+            rows = [row for row in sample if row.name in chain.nodes]
+            active = [row for row in rows if row.busy is not None]
+            if not rows:
+                continue
+
+            errors = sum(row.errors for row in rows)
+            first_errors = errors if first_errors is None else first_errors
+            last_errors = errors
+            if not active:
+                continue
+
+            busy.append(sum(row.busy or 0.0 for row in active))
+            utilisation.append(
+                sum(
+                    (
+                        (row.busy or 0.0) / row.quantum
+                        if row.quantum
+                        else row.busy_quantum or 0.0
+                    )
+                    for row in active
+                )
+            )
+
+        profiles.append(
+            ChainProfile(chain, busy, utilisation, last_errors - (first_errors or 0))
+        )
+
+    return sorted(profiles, key=lambda p: mean(p.busy), reverse=True)
+
+
+def main(argv: list[str] | None = None) -> int:
+    argparser = argparse.ArgumentParser(
+        prog="python -m ee2pw profile",
+        description="Attribute the CPU time measured by pw-top to the filter "
+        "chains written by ee2pw and, by estimated cost, to their plugins.",
+        epilog="e.g. pw-top -b -n 20 | python -m ee2pw profile - -c think.json",
+    )
+
+    argparser.add_argument(
+        "pw_top", type=str, help="Saved pw-top -b output, or - for stdin."
+    )
+    argparser.add_argument(
+        "-c",
+        "--config",
+        type=str,
+        action="append",
+        required=True,
+        help="Filter chain config written by ee2pw in JSON, the default format; "
+        "-f conf configs cannot be read (can be repeated).",
+    )
+    argparser.add_argument(
+        "--skip",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Ignore the first N refreshes, measured before pw-top had a full "
+        "period (default: 1).",
+    )
+
+    args = argparser.parse_args(argv)
+
+    chains: list[ChainNodes] = []
+    try:
+        for config in args.config:
+            with open(config, "r") as f:
+                try:
+                    result = json.load(f)
+                except ValueError:
+                    raise ValueError(
+                        f"{config}: not a JSON config, write it with -f json"
+                    ) from None
+            chains.extend(config_chains(result))
+
+        if args.pw_top == "-":
+            samples = parse_pw_top(sys.stdin)
+        else:
+            with open(args.pw_top, "r") as f:
+                samples = parse_pw_top(f)
+    except (OSError, ValueError, KeyError) as e:
+        argparser.error(str(e))
+
+    samples = samples[args.skip :]
+    print(f"{len(samples)} samples", file=sys.stderr)
+
+    for chain_profile in profile(samples, chains):
+        print(chain_profile.format())
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
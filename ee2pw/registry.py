@@ -0,0 +1,111 @@
+from collections.abc import Callable
+from importlib import import_module
+from typing import Any
+
+from .ir import Node
+
+# Parsers return a Node, or for third-party parsers, its dict form.
+Parser = Callable[[dict[Any, Any], str], Node | dict[str, Any]]
+
+ENTRY_POINT_GROUP = "ee2pw.plugins"
+
+# EasyEffects plugin base name -> "module:function". Modules are imported the
+# first time a preset uses the plugin.
+BUILTIN_PARSERS: dict[str, str] = {
+    "bass_enhancer": "ee2pw.bass_enhancer:parse_bass_enhancer",
+    "equalizer": "ee2pw.equalizer:parse_equalizer",
+    "filter": "ee2pw.filter:parse_filter",
+    "limiter": "ee2pw.limiter:parse_limiter",
+    "multiband_compressor": "ee2pw.multiband_compressor:parse_multiband_compressor",
+    "stereo_tools": "ee2pw.stereo_tools:parse_stereo_tools",
+}
+
+_targets: dict[str, str | Parser] = dict(BUILTIN_PARSERS)
+_parsers: dict[str, Parser] = {}
+_entry_points_loaded = False
+
+
+def plugin_base_name(ee_plugin: str) -> str:
+    """
+    Get the plugin base name of an EasyEffects plugin id or PipeWire node name.
+
+    :param ee_plugin: EasyEffects plugin id (``limiter#0``) or node name
+        (``limiter_0``)
+    :type ee_plugin: str
+    :return: plugin base name (``limiter``)
+    :rtype: str
+    """
+    base, sep, _ = ee_plugin.partition("#")
+    if sep:
+        return base
+
+    base, sep, index = ee_plugin.rpartition("_")
+    return base if sep and index.isdigit() else ee_plugin
+
+
+def register_parser(name: str, parser: str | Parser) -> None:
+    """
+    Register a parser for an EasyEffects plugin base name.
+
+    :param name: plugin base name, e.g. ``equalizer``
+    :param parser: parser function, or ``"module:function"`` to import lazily
+    :type name: str
+    :type parser: str | Parser
+    """
+    _targets[name] = parser
+    _parsers.pop(name, None)
+
+
+def _load_entry_points() -> None:
+    global _entry_points_loaded
+
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+
+    from importlib.metadata import entry_points
+
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        # Built-in and explicitly registered parsers take precedence.
+        _targets.setdefault(entry_point.name, entry_point.value)
+
+
+def _resolve(target: str | Parser) -> Parser:
+    if not isinstance(target, str):
+        return target
+
+    module, _, attr = target.partition(":")
+    return getattr(import_module(module), attr)
+
+
+def get_parser(name: str) -> Parser | None:
+    """
+    Get the parser for an EasyEffects plugin base name.
+
+    Third-party parsers are looked up in the ``ee2pw.plugins`` entry point
+    group, only when no built-in parser matches.
+
+    :param name: plugin base name
+    :type name: str
+    :return: parser, or None if the plugin is not supported
+    :rtype: Parser | None
+    """
+    parser = _parsers.get(name)
+    if parser is not None:
+        return parser
+
+    if name not in _targets:
+        _load_entry_points()
+        if name not in _targets:
+            return None
+
+    parser = _parsers[name] = _resolve(_targets[name])
+    return parser
+
+
+def supported_plugins() -> list[str]:
+    """
+    List every plugin base name with a parser, including entry points.
+    """
+    _load_entry_points()
+    return sorted(_targets)
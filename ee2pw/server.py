@@ -0,0 +1,283 @@
+import argparse, asyncio, json, os, signal, socket, stat, sys
+from typing import Any
+
+from .client import default_socket_path
+from .convert import (
+    OUTPUT_FORMATS,
+    ConversionOptions,
+    convert_config,
+    convert_file,
+    default_filter_chain_name,
+    serialize,
+)
+from .util import load_config, write_if_changed
+
+# Request keys mapped onto ConversionOptions fields, the others keep their name.
+OPTION_KEYS = {
+    "name": "filter_chain_name",
+    "target": "smart_filter_target",
+    "format": "output_format",
+}
+REQUEST_KEYS = frozenset(("id", "preset", "config", "output"))
+
+DEFAULT_FILTER_CHAIN_NAME = "ee2pw"
+
+# Longest request line, inline presets included.
+MAX_REQUEST_SIZE = 16 * 1024 * 1024
+
+
+def request_options(message: dict[str, Any]) -> ConversionOptions:
+    """
+    Get the conversion options of a request, ``None`` values being left out.
+
+    :raises ValueError: if the request has an unknown key
+    """
+    options: dict[str, Any] = {}
+
+    for key, value in message.items():
+        if key in REQUEST_KEYS or value is None:
+            continue
+        field = OPTION_KEYS.get(key, key)
+        if field not in ConversionOptions._fields:
+            raise ValueError(f"unknown request key {key!r}")
+        options[field] = value
+
+    if options.get("output_format", "json") not in OUTPUT_FORMATS:
+        raise ValueError(f"unknown output format: {options['output_format']}")
+
+    return ConversionOptions(**options)
+
+
+def handle_request(message: dict[str, Any]) -> dict[str, Any]:
+    """
+    Convert the preset of a request, like ``python -m ee2pw`` would.
+
+    A request holds ``preset``, a path, or ``config``, an inline preset, and
+    optionally ``output``, a path to write the result to. The other keys are
+    conversion options: ``name``, ``target``, ``format`` and the fields of
+    :class:`ee2pw.convert.ConversionOptions`. Paths must be absolute.
+
+    :param message: request
+    :type message: dict[str, Any]
+    :return: response, with the serialized config as ``text`` or whether the
+        output file ``changed``, and the reports of the optional passes
+    :rtype: dict[str, Any]
+    """
+    response: dict[str, Any] = {"id": message.get("id")}
+    report: dict[str, Any] = {}
+
+    try:
+        options = request_options(message)
+        preset, output = message.get("preset"), message.get("output")
+
+        for path in (preset, output):
+            if path is not None and not os.path.isabs(path):
+                raise ValueError(f"paths must be absolute, got {path!r}")
+
+        if not options.filter_chain_name:
+            options = options._replace(
+                filter_chain_name=(
+                    default_filter_chain_name(preset)
+                    if preset
+                    else DEFAULT_FILTER_CHAIN_NAME
+                )
+            )
+
+        if preset and output:
+            response["changed"] = convert_file(preset, output, options, None, report)
+        else:
+            if "config" in message:
+                config = message["config"]
+            elif preset:
+                config = load_config(preset)
+            else:
+                raise ValueError("a request needs a preset or a config")
+
+            text = serialize(
+                convert_config(config, options, report),
+                options.output_format,
+                options.compact,
+            )
+            if output:
+                response["changed"] = write_if_changed(output, text)
+            else:
+                response["text"] = text
+    except Exception as e:
+        response.update(ok=False, error=f"{type(e).__name__}: {e}")
+    else:
+        response["ok"] = True
+
+    response["report"] = [item.format() for item in report.values()]
+    return response
+
+
+def warm_up() -> None:
+    """
+    Import the builtin plugin parsers ahead of the first request.
+    """
+    from .registry import BUILTIN_PARSERS, get_parser
+
+    for plugin in BUILTIN_PARSERS:
+        get_parser(plugin)
+
+
+class ConversionServer:
+    """
+    Convert presets for clients of a Unix socket.
+
+    Clients send one JSON request per line and get one JSON response per
+    line, tagged with the request ``id``. Requests are converted in worker
+    threads, so a slow conversion does not hold up the others, and responses
+    are sent as soon as they are ready, not necessarily in request order.
+    """
+
+    def __init__(self, socket_path: str | None = None, jobs: int | None = None):
+        """
+        :param socket_path: socket to listen on (default: ``$XDG_RUNTIME_DIR/ee2pw.sock``)
+        :param jobs: maximum number of concurrent conversions (default: CPU count)
+        :type socket_path: str | None
+        :type jobs: int | None
+        """
+        self.socket_path = socket_path or default_socket_path()
+        self.limit = asyncio.Semaphore(jobs or os.cpu_count() or 1)
+        self.server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> None:
+        """
+        Listen on the socket, replacing it if it is left over from a server
+        that is gone.
+
+        :raises OSError: if another server is listening on it, or if it is
+            not a socket
+        """
+        if os.path.exists(self.socket_path):
+            if not stat.S_ISSOCK(os.stat(self.socket_path).st_mode):
+                raise OSError(f"{self.socket_path} exists and is not a socket")
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                try:
+                    sock.connect(self.socket_path)
+                except ConnectionRefusedError:
+                    os.unlink(self.socket_path)
+                else:
+                    raise OSError(
+                        f"a server is already listening on {self.socket_path}"
+                    )
+
+        await asyncio.to_thread(warm_up)
+        self.server = await asyncio.start_unix_server(
+            self.serve_client, self.socket_path, limit=MAX_REQUEST_SIZE
+        )
+
+    async def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    async def serve_forever(self) -> None:
+        if self.server is None:
+            await self.start()
+        assert self.server is not None
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.close()
+
+    async def convert(self, line: bytes) -> dict[str, Any]:
+        try:
+            message = json.loads(line)
+            if not isinstance(message, dict):
+                raise ValueError("a request must be a JSON object")
+        except ValueError as e:
+            return {"id": None, "ok": False, "error": f"invalid request: {e}"}
+
+        async with self.limit:
+            return await asyncio.to_thread(handle_request, message)
+
+    async def serve_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        async def respond(line: bytes) -> None:
+            response = await self.convert(line)
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+        async def reject(error: str) -> None:
+            response = {"id": None, "ok": False, "error": error}
+            writer.write(json.dumps(response).encode() + b"\n")
+            await writer.drain()
+
+        tasks: set[asyncio.Task] = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # The rest of the line cannot be told apart from the next
+                    # request, so the connection is closed after answering.
+                    await reject(
+                        f"invalid request: longer than {MAX_REQUEST_SIZE} bytes"
+                    )
+                    break
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.create_task(respond(line))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+def main(argv: list[str] | None = None) -> int:
+    argparser = argparse.ArgumentParser(
+        prog="python -m ee2pw serve",
+        description="Keep ee2pw loaded and convert presets sent to a Unix socket "
+        "by python -m ee2pw client.",
+    )
+
+    argparser.add_argument(
+        "--socket",
+        type=str,
+        help="Socket to listen on (default: $XDG_RUNTIME_DIR/ee2pw.sock).",
+    )
+    argparser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Maximum number of concurrent conversions (default: CPU count).",
+    )
+
+    args = argparser.parse_args(argv)
+    server = ConversionServer(args.socket, args.jobs)
+
+    async def run() -> None:
+        # Stop like on Ctrl+C under systemd, so that the socket is removed.
+        task = asyncio.current_task()
+        assert task is not None
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, task.cancel)
+
+        await server.start()
+        print(f"listening on {server.socket_path}", file=sys.stderr, flush=True)
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except OSError as e:
+        argparser.error(str(e))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+import io, math, re
+from json.encoder import py_encode_basestring
+from typing import Any, TextIO
+
+INDENT = 4
+
+# Strings matching this are written bare, everything else is quoted. SPA-JSON
+# treats ':', '=', ',', '#', quotes, brackets and whitespace as delimiters.
+BARE_STRING = re.compile(r"[A-Za-z_][A-Za-z0-9_.\-/]*")
+RESERVED_WORDS = frozenset(("true", "false", "null"))
+
+
+def dump(obj: Any, fp: TextIO, indent: int | None = INDENT) -> None:
+    """
+    Write an object as a PipeWire SPA-JSON config file.
+
+    The top-level object is written as bare ``key = value`` entries, as in
+    the files under ``filter-chain.conf.d``. Tokens are written straight to
+    ``fp`` as they are produced.
+
+    :param obj: top-level object to write
+    :param fp: text file to write to
+    :param indent: spaces per nesting level, or None for a compact layout
+    :type obj: Any
+    :type fp: TextIO
+    :type indent: int | None
+    """
+    if not isinstance(obj, dict):
+        raise TypeError(f"top-level SPA-JSON value must be a dict, not {type(obj)}")
+
+    write = fp.write
+
+    for i, (key, value) in enumerate(obj.items()):
+        if i and indent is None:
+            write(" ")
+        _write_key(key, write)
+        write(" = " if indent is not None else "=")
+        _write_value(value, write, indent, 0)
+        if indent is not None:
+            write("\n")
+
+
+def dumps(obj: Any, indent: int | None = INDENT) -> str:
+    """
+    Serialize an object as a PipeWire SPA-JSON config string.
+
+    :param obj: top-level object to serialize
+    :param indent: spaces per nesting level, or None for a compact layout
+    :type obj: Any
+    :type indent: int | None
+    :return: SPA-JSON config
+    :rtype: str
+    """
+    fp = io.StringIO()
+    dump(obj, fp, indent)
+    return fp.getvalue()
+
+
+def dumps_value(value: Any, indent: int | None = None) -> str:
+    """
+    Serialize a single SPA-JSON value, such as a ``pw-cli set-param`` argument.
+
+    :param value: value to serialize
+    :param indent: spaces per nesting level, or None for a compact layout
+    :type value: Any
+    :type indent: int | None
+    :return: SPA-JSON value
+    :rtype: str
+    """
+    fp = io.StringIO()
+    _write_value(value, fp.write, indent, 0)
+    return fp.getvalue()
+
+
+def _write_key(key: Any, write) -> None:
+    if not isinstance(key, str):
+        raise TypeError(f"SPA-JSON keys must be str, not {type(key)}")
+    _write_string(key, write)
+
+
+def _write_string(value: str, write) -> None:
+    if value not in RESERVED_WORDS and BARE_STRING.fullmatch(value):
+        write(value)
+    else:
+        write(py_encode_basestring(value))
+
+
+def _write_value(value: Any, write, indent: int | None, level: int) -> None:
+    if isinstance(value, str):
+        _write_string(value, write)
+    elif value is None:
+        write("null")
+    elif value is True:
+        write("true")
+    elif value is False:
+        write("false")
+    elif isinstance(value, int):
+        write(int.__repr__(value))
+    elif isinstance(value, float):
+        if not math.isfinite(value):
+            raise ValueError(f"SPA-JSON cannot represent {value!r}")
+        write(float.__repr__(value))
+    elif isinstance(value, dict):
+        _write_container(value.items(), "{", "}", write, indent, level, True)
+    elif isinstance(value, (list, tuple)):
+        _write_container(value, "[", "]", write, indent, level, False)
+    else:
+        raise TypeError(f"{type(value)} is not SPA-JSON serializable")
+
+
+def _write_container(
+    items, start: str, end: str, write, indent: int | None, level: int, keyed: bool
+) -> None:
+    write(start)
+
+    empty = True
+    inner = level + 1
+
+    for item in items:
+        if indent is not None:
+            write("\n")
+            write(" " * (indent * inner))
+        elif not empty:
+            write(" ")
+        empty = False
+
+        if keyed:
+            key, value = item
+            _write_key(key, write)
+            write(" = " if indent is not None else "=")
+        else:
+            value = item
+
+        _write_value(value, write, indent, inner)
+
+    if not empty and indent is not None:
+        write("\n")
+        write(" " * (indent * level))
+
+    write(end)
@@ -0,0 +1,183 @@
+import re
+from typing import TYPE_CHECKING, NamedTuple
+
+from .bass_enhancer import PLUGIN_URI as BASS_ENHANCER_URI
+from .equalizer import PLUGIN_URI_PREFIX as EQUALIZER_URI_PREFIX
+from .filter import PLUGIN_URI as FILTER_URI
+from .ir import Node
+from .limiter import PLUGIN_URI as LIMITER_URI
+from .multiband_compressor import PLUGIN_URI as MULTIBAND_COMPRESSOR_URI
+from .stereo_tools import PLUGIN_URI as STEREO_TOOLS_URI
+
+if TYPE_CHECKING:
+    from .lv2_index import LV2Index
+
+# Port defaults declared by the plugins' LV2 metadata, keyed by port name with
+# the band suffix (``_N``) removed. Only defaults known for certain are
+# listed: a port missing here is always written, so the sparse output loads
+# into the same plugin state as the full one. The defaults of the installed
+# plugins can be used on top of these, see sparse_controls().
+LSP_DEFAULTS: dict[str, float] = {
+    "enabled": 1.0,
+    "g_in": 1.0,
+    "g_out": 1.0,
+}
+
+CALF_DEFAULTS: dict[str, float] = {
+    "bypass": 0.0,
+    "level_in": 1.0,
+    "level_out": 1.0,
+}
+
+LV2_DEFAULTS: dict[str, dict[str, float]] = {
+    BASS_ENHANCER_URI: {
+        **CALF_DEFAULTS,
+        "blend": 0.0,
+        "floor_active": 0.0,
+        "listen": 0.0,
+    },
+    FILTER_URI: {**LSP_DEFAULTS, "bal": 0.0},
+    # From sc_limiter_stereo.ttl, see tests/data/lv2.
+    LIMITER_URI: {
+        **LSP_DEFAULTS,
+        "mode": 0.0,
+        "ovs": 0.0,
+        "dith": 0.0,
+        "lk": 5.0,
+        "at": 5.0,
+        "rt": 5.0,
+        "th": 1.0,
+        "slink": 100.0,
+        "alr_at": 5.0,
+        "alr_rt": 50.0,
+        "knee": 1.0,
+        "alr": 1.0,
+        "boost": 1.0,
+    },
+    MULTIBAND_COMPRESSOR_URI: {
+        **LSP_DEFAULTS,
+        "g_dry": 0.0,
+        "g_wet": 1.0,
+        "bs": 0.0,
+        "bm": 0.0,
+    },
+    STEREO_TOOLS_URI: {
+        **CALF_DEFAULTS,
+        "balance_in": 0.0,
+        "balance_out": 0.0,
+        "softclip": 0.0,
+        "mutel": 0.0,
+        "muter": 0.0,
+        "phasel": 0.0,
+        "phaser": 0.0,
+        "mode": 0.0,
+        "slev": 1.0,
+        "sbal": 0.0,
+        "mlev": 1.0,
+        "mpan": 0.0,
+        "stereo_base": 0.0,
+        "delay": 0.0,
+        "sc_level": 1.0,
+        "stereo_phase": 0.0,
+    },
+}
+
+# para_equalizer x8/x16/x32, stereo and left/right builds.
+EQUALIZER_DEFAULTS: dict[str, float] = {
+    **LSP_DEFAULTS,
+    "bal": 0.0,
+    "frqs_l": 0.0,
+    "frqs_r": 0.0,
+    **{f"{port}{channel}": 0.0 for port in ("xs", "xm") for channel in ("", "l", "r")},
+}
+
+BAND_SUFFIX = re.compile(r"_\d+$")
+
+
+class SparseReport(NamedTuple):
+    omitted: int
+    total: int
+
+    def format(self) -> str:
+        return (
+            f"omitted {self.omitted} of {self.total} controls "
+            "equal to their LV2 default"
+        )
+
+
+def plugin_defaults(plugin: str) -> dict[str, float]:
+    """
+    Get the known LV2 port defaults of a plugin.
+
+    :param plugin: LV2 plugin URI
+    :type plugin: str
+    :return: default value per port, without band suffix
+    :rtype: dict[str, float]
+    """
+    if plugin in LV2_DEFAULTS:
+        return LV2_DEFAULTS[plugin]
+    if plugin.startswith(EQUALIZER_URI_PREFIX):
+        return EQUALIZER_DEFAULTS
+    return {}
+
+
+def installed_defaults(plugin: str, index: "LV2Index") -> dict[str, float]:
+    """
+    Get the port defaults declared by an installed plugin.
+
+    :param plugin: LV2 plugin URI
+    :param index: refreshed LV2 index
+    :type plugin: str
+    :type index: LV2Index
+    :return: default value per control input port, empty if not installed
+    :rtype: dict[str, float]
+    """
+    from .lv2_index import CONTROL
+
+    return {
+        symbol: port.default
+        for symbol, port in (index.ports(plugin) or {}).items()
+        if port.kind == CONTROL and port.input and port.default is not None
+    }
+
+
+def sparse_controls(nodes: list[Node], index: "LV2Index | None" = None) -> SparseReport:
+    """
+    Remove the controls equal to their LV2 default, which the plugin starts
+    with anyway.
+
+    With an index, the defaults declared by the installed plugins are used
+    for the ports they declare, which covers ports missing from
+    :data:`LV2_DEFAULTS`. The output then only loads into the same state with
+    those plugin versions.
+
+    :param nodes: parsed plugin nodes, modified in place
+    :param index: refreshed LV2 index of the installed plugins (if any)
+    :type nodes: list[Node]
+    :type index: LV2Index | None
+    :return: how many controls were removed
+    :rtype: SparseReport
+    """
+    omitted = total = 0
+
+    for node in nodes:
+        total += len(node.control)
+        defaults = plugin_defaults(node.plugin or "")
+        installed = installed_defaults(node.plugin or "", index) if index else {}
+        if not defaults and not installed:
+            continue
+
+        control = {
+            port: value
+            for port, value in node.control.items()
+            if (
+                installed[port]
+                if port in installed
+                else defaults.get(BAND_SUFFIX.sub("", port))
+            )
+            != value
+        }
+        omitted += len(node.control) - len(control)
+        node.control = control
+
+    return SparseReport(omitted, total)
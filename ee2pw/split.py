@@ -0,0 +1,211 @@
+import math
+from typing import Any, NamedTuple
+
+from .core import (
+    capture_node_name,
+    create_capture_props,
+    create_module,
+    create_playback_props,
+)
+from .cost import ChainCost, chain_cost
+from .ir import FilterChain
+
+# Data loops created by PipeWire with context.num-data-loops.
+DATA_LOOP_NAME = "data-loop.{}"
+
+# Inner stages are only fed by the previous stage, not offered as sinks.
+INNER_STAGE_CLASS = "Stream/Input/Audio"
+
+
+class SplitReport(NamedTuple):
+    stages: list[ChainCost]
+    loops: list[str | None]
+
+    def format(self) -> str:
+        lines = [
+            f"{stage.total:8.2f}  {stage.name} on {loop or 'any data loop'}: "
+            + ", ".join(node.name for node in stage.nodes)
+            for stage, loop in zip(self.stages, self.loops)
+        ]
+        lines.append(
+            f"split into {len(self.stages)} filter chains, heaviest "
+            f"{max((stage.total for stage in self.stages), default=0.0):g} units"
+        )
+        return "\n".join(lines)
+
+
+def partition(costs: list[float], parts: int) -> list[int]:
+    """
+    Cut a sequence into at most ``parts`` contiguous stages so that the most
+    expensive stage is as cheap as possible.
+
+    Fewer stages are used when more would not lower the heaviest one, every
+    extra stage adding a filter chain module to the graph.
+
+    :param costs: cost of every item, in order
+    :param parts: maximum number of stages
+    :type costs: list[float]
+    :type parts: int
+    :return: index of the first item of every stage
+    :rtype: list[int]
+    """
+    n = len(costs)
+    parts = max(1, min(parts, n))
+
+    prefix = [0.0]
+    for cost in costs:
+        prefix.append(prefix[-1] + cost)
+
+    # best[k][i]: heaviest stage when cutting costs[:i] into k stages, cut[k][i]
+    # the start of the last of them.
+    best = [[math.inf] * (n + 1) for _ in range(parts + 1)]
+    cut = [[0] * (n + 1) for _ in range(parts + 1)]
+    best[0][0] = 0.0
+
+    for k in range(1, parts + 1):
+        for i in range(k, n + 1):
+            for j in range(k - 1, i):
+                heaviest = max(best[k - 1][j], prefix[i] - prefix[j])
+                if heaviest < best[k][i]:
+                    best[k][i], cut[k][i] = heaviest, j
+
+    lowest = min(best[k][n] for k in range(1, parts + 1))
+    k = next(k for k in range(1, parts + 1) if math.isclose(best[k][n], lowest))
+
+    starts: list[int] = []
+    i = n
+    for k in range(k, 0, -1):
+        i = cut[k][i]
+        starts.append(i)
+
+    return starts[::-1]
+
+
+def stage_name(filter_chain_name: str, stage: int) -> str:
+    """
+    Get the filter chain name of a stage, the first one keeping the name of
+    the whole chain so that its input stays where streams expect it.
+    """
+    return filter_chain_name if stage == 0 else f"{filter_chain_name} stage {stage + 1}"
+
+
+def stage_loop(stage: int, data_loops: int | None) -> str | None:
+    """
+    Get the data loop a stage is pinned to, stages sharing the loops when
+    there are fewer loops than stages.
+
+    :param stage: stage index
+    :param data_loops: number of data loops of PipeWire, None or 0 to let
+        PipeWire place the stage
+    :type stage: int
+    :type data_loops: int | None
+    :return: ``node.loop.name`` value, or None
+    :rtype: str | None
+    """
+    if not data_loops:
+        return None
+    return DATA_LOOP_NAME.format(stage % data_loops)
+
+
+def split_chain(
+    chain: FilterChain,
+    parts: int,
+    filter_chain_name: str = "",
+    data_loops: int | None = None,
+) -> tuple[list[FilterChain], SplitReport]:
+    """
+    Split a serial filter graph into cascaded graphs by estimated CPU cost.
+
+    :param chain: serial filter graph, as built by :func:`ee2pw.core.run_passes`
+    :param parts: maximum number of graphs
+    :param filter_chain_name: filter chain name used in the report
+    :param data_loops: number of data loops to pin the graphs to (if any)
+    :type chain: FilterChain
+    :type parts: int
+    :type filter_chain_name: str
+    :type data_loops: int | None
+    :return: graphs in chain order, and the cost of each
+    :rtype: tuple[list[FilterChain], SplitReport]
+    """
+    nodes = chain.nodes
+    costs = chain_cost(nodes).nodes
+
+    # The passthrough graph has no plugin to spread.
+    if any(node.type == "builtin" for node in nodes):
+        starts = [0]
+    else:
+        starts = partition([node.cost for node in costs], parts)
+
+    stages: list[FilterChain] = []
+    stage_costs: list[ChainCost] = []
+
+    for stage, (start, end) in enumerate(zip(starts, starts[1:] + [len(nodes)])):
+        if len(starts) == 1:
+            graph = chain
+        else:
+            graph = FilterChain.serial(nodes[start:end])
+        stages.append(graph)
+        stage_costs.append(
+            ChainCost(stage_name(filter_chain_name, stage), costs[start:end])
+        )
+
+    loops = [stage_loop(stage, data_loops) for stage in range(len(stages))]
+    return stages, SplitReport(stage_costs, loops)
+
+
+def assemble_stages(
+    stages: list[FilterChain],
+    filter_chain_name: str,
+    smart_filter_target: str | None = None,
+    data_loops: int | None = None,
+) -> dict:
+    """
+    Serialize cascaded filter graphs into one filter chain module each.
+
+    With ``data_loops``, stages are pinned to the data loops in turn.
+    Without a smart filter target, a stage plays into the input of the next
+    one through ``target.object``, the inputs after the first being plain
+    streams rather than sinks. With one, every stage is a smart filter of the
+    target, ordered with ``filter.smart.before`` so that the session manager
+    links them in turn.
+
+    :param stages: filter graphs in chain order
+    :param filter_chain_name: filter chain name
+    :param smart_filter_target: smart filter target (if any)
+    :param data_loops: number of data loops of PipeWire (if any)
+    :type stages: list[FilterChain]
+    :type filter_chain_name: str
+    :type smart_filter_target: str | None
+    :type data_loops: int | None
+    :return: filter chain config
+    :rtype: dict
+    """
+    names = [stage_name(filter_chain_name, i) for i in range(len(stages))]
+    modules: list[dict[str, Any]] = []
+
+    for i, (graph, name) in enumerate(zip(stages, names)):
+        loop_name = stage_loop(i, data_loops)
+        loop = {"node.loop.name": loop_name} if loop_name else {}
+        capture_props = {**create_capture_props(name, smart_filter_target), **loop}
+        playback_props = {**create_playback_props(name, smart_filter_target), **loop}
+
+        if i > 0 and not smart_filter_target:
+            # Linked by the previous stage only, not to the default source.
+            capture_props.update(
+                {"media.class": INNER_STAGE_CLASS, "node.autoconnect": False}
+            )
+
+        if i + 1 < len(stages):
+            if smart_filter_target:
+                capture_props["filter.smart.before"] = [names[i + 1]]
+            else:
+                playback_props.update(
+                    {
+                        "target.object": capture_node_name(names[i + 1]),
+                        "node.dont-fallback": True,
+                    }
+                )
+
+        modules.append(create_module(graph, name, capture_props, playback_props))
+
+    return {"context.modules": modules}
@@ -1,6 +1,6 @@
 from typing import Any
-from .util import db_to_linear
-from .lv2_wrapper import parse_bool, parse_enum, parse_float, parse_float_db
+from .ir import Node
+from .lv2_wrapper import BOOL, ENUM, FLOAT, FLOAT_DB, Control, compile_controls
 
 PLUGIN_TYPE = "lv2"
 PLUGIN_URI = "http://calf.sourceforge.net/plugins/StereoTools"
@@ -15,10 +15,34 @@ STEREO_TOOLS_MODE_MAP: dict[str, float] = {
     "LR > RL (Stereo Flip Channels)": 6.0,
 }
 
+STEREO_TOOLS_CONTROLS: tuple[Control, ...] = (
+    Control("bypass", "bypass", BOOL, False),
+    Control("level_in", "input-gain", FLOAT_DB, 0.0),
+    Control("level_out", "output-gain", FLOAT_DB, 0.0),
+    Control("balance_in", "balance-in", FLOAT, 0.0),
+    Control("balance_out", "balance-out", FLOAT, 0.0),
+    Control("softclip", "softclip", BOOL, False),
+    Control("mutel", "mutel", BOOL, False),
+    Control("muter", "muter", BOOL, False),
+    Control("phasel", "phasel", BOOL, False),
+    Control("phaser", "phaser", BOOL, False),
+    Control(
+        "mode", "mode", ENUM, "LR > LR (Stereo Default)", STEREO_TOOLS_MODE_MAP, 0.0
+    ),
+    Control("slev", "slev", FLOAT_DB, 0.0),
+    Control("sbal", "sbal", FLOAT, 0.0),
+    Control("mlev", "mlev", FLOAT_DB, 0.0),
+    Control("mpan", "mpan", FLOAT, 0.0),
+    Control("stereo_base", "stereo-base", FLOAT, 0.0),
+    Control("delay", "delay", FLOAT, 0.0),
+    Control("sc_level", "sc-level", FLOAT_DB, 0.0),
+    Control("stereo_phase", "stereo-phase", FLOAT, 0.0),
+)
 
-def parse_stereo_tools(
-    ee_config: dict[Any, Any], pw_node_name: str
-) -> dict[str, str | dict[str, float]]:
+convert_stereo_tools = compile_controls(STEREO_TOOLS_CONTROLS)
+
+
+def parse_stereo_tools(ee_config: dict[Any, Any], pw_node_name: str) -> Node:
     """
     Parse stereo tools settings.
 
@@ -27,37 +51,8 @@ def parse_stereo_tools(
     :type data: dict[Any, Any]
     :type pw_node_name: str
     :return: parsed stereo tools settings
-    :rtype: dict
+    :rtype: Node
     """
-    return {
-        "type": PLUGIN_TYPE,
-        "name": pw_node_name,
-        "plugin": PLUGIN_URI,
-        "control": {
-            "bypass": parse_bool(ee_config, "bypass", False),
-            "level_in": parse_float_db(ee_config, "input-gain", 0.0),
-            "level_out": parse_float_db(ee_config, "output-gain", 0.0),
-            "balance_in": parse_float(ee_config, "balance-in", 0.0),
-            "balance_out": parse_float(ee_config, "balance-out", 0.0),
-            "softclip": parse_bool(ee_config, "softclip", False),
-            "mutel": parse_bool(ee_config, "mutel", False),
-            "muter": parse_bool(ee_config, "muter", False),
-            "phasel": parse_bool(ee_config, "phasel", False),
-            "phaser": parse_bool(ee_config, "phaser", False),
-            "mode": parse_enum(
-                ee_config,
-                "mode",
-                "LR > LR (Stereo Default)",
-                STEREO_TOOLS_MODE_MAP,
-                0.0,
-            ),
-            "slev": parse_float_db(ee_config, "slev", 0.0),
-            "sbal": parse_float(ee_config, "sbal", 0.0),
-            "mlev": parse_float_db(ee_config, "mlev", 0.0),
-            "mpan": parse_float(ee_config, "mpan", 0.0),
-            "stereo_base": parse_float(ee_config, "stereo-base", 0.0),
-            "delay": parse_float(ee_config, "delay", 0.0),
-            "sc_level": parse_float_db(ee_config, "sc-level", 0.0),
-            "stereo_phase": parse_float(ee_config, "stereo-phase", 0.0),
-        },
-    }
+    return Node(
+        PLUGIN_TYPE, pw_node_name, PLUGIN_URI, control=convert_stereo_tools(ee_config)
+    )
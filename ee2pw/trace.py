@@ -0,0 +1,126 @@
+import time
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, ExitStack, contextmanager, nullcontext
+from typing import Any, NamedTuple
+
+# A hook is called with the span name and attributes when a stage starts, and
+# returns a context manager exited when the stage ends. Tracers such as
+# OpenTelemetry fit directly:
+#
+#     add_hook(lambda name, attrs: tracer.start_as_current_span(
+#         name, attributes=attrs))
+Hook = Callable[[str, dict[str, Any]], AbstractContextManager[Any]]
+
+_hooks: list[Hook] = []
+_disabled: AbstractContextManager[None] = nullcontext()
+
+
+def add_hook(hook: Hook) -> None:
+    _hooks.append(hook)
+
+
+def remove_hook(hook: Hook) -> None:
+    _hooks.remove(hook)
+
+
+@contextmanager
+def hooked(hook: Hook) -> Iterator[Hook]:
+    """
+    Register a hook for the duration of a block.
+    """
+    add_hook(hook)
+    try:
+        yield hook
+    finally:
+        remove_hook(hook)
+
+
+def span(name: str, /, **attrs: Any) -> AbstractContextManager[Any]:
+    """
+    Mark a stage of the conversion for the registered hooks.
+
+    Without hooks, a shared no-op context manager is returned, so an
+    instrumented stage only costs a function call and a list check.
+
+    :param name: stage name, such as ``parse`` or ``dump``
+    :param attrs: attributes passed to the hooks, such as the plugin name
+    :type name: str
+    :type attrs: Any
+    :return: context manager covering the stage
+    :rtype: AbstractContextManager[Any]
+    """
+    if not _hooks:
+        return _disabled
+    return _run_hooks(name, attrs)
+
+
+@contextmanager
+def _run_hooks(name: str, attrs: dict[str, Any]) -> Iterator[None]:
+    with ExitStack() as stack:
+        for hook in tuple(_hooks):
+            stack.enter_context(hook(name, attrs))
+        yield
+
+
+class SpanRecord(NamedTuple):
+    name: str
+    attrs: dict[str, Any]
+    start: float
+    duration: float
+    depth: int
+
+
+class Timings:
+    """
+    Hook recording the duration of every span, in start order.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self.clock = clock
+        self.spans: list[SpanRecord] = []
+        self._origin: float | None = None
+        self._depth = 0
+
+    @contextmanager
+    def __call__(self, name: str, attrs: dict[str, Any]) -> Iterator[None]:
+        start = self.clock()
+        if self._origin is None:
+            self._origin = start
+
+        index = len(self.spans)
+        self.spans.append(SpanRecord(name, attrs, start - self._origin, 0.0, 0))
+        depth = self._depth
+        self._depth += 1
+
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            self.spans[index] = SpanRecord(
+                name, attrs, start - self._origin, self.clock() - start, depth
+            )
+
+    def stages(self) -> dict[str, float]:
+        """
+        Sum the durations of the spans by name, in seconds.
+        """
+        stages: dict[str, float] = {}
+        for record in self.spans:
+            stages[record.name] = stages.get(record.name, 0.0) + record.duration
+        return stages
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "stages": self.stages(),
+            "spans": [record._asdict() for record in self.spans],
+        }
+
+    def format(self) -> str:
+        lines = []
+        for record in self.spans:
+            attrs = " ".join(f"{k}={v}" for k, v in record.attrs.items())
+            lines.append(
+                f"{1000 * record.duration:9.3f} ms  "
+                f"{'  ' * record.depth}{record.name} {attrs}".rstrip()
+            )
+        return "\n".join(lines)
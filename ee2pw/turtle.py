@@ -0,0 +1,258 @@
+import re
+from collections import defaultdict
+from typing import Any
+from urllib.parse import urljoin
+
+RDF = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+RDF_TYPE = RDF + "type"
+XSD = "http://www.w3.org/2001/XMLSchema#"
+
+TOKEN = re.compile(
+    r"""
+    (?P<skip>\s+|\#[^\n]*)
+  | (?P<iri><[^<>"{}|^`\\\s]*>)
+  | (?P<long_string>\"\"\"(?:[^"\\]|\\.|"(?!""))*\"\"\"|'''(?:[^'\\]|\\.|'(?!''))*''')
+  | (?P<string>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+  | (?P<at>@[A-Za-z]+(?:-[A-Za-z0-9]+)*)
+  | (?P<datatype>\^\^)
+  | (?P<number>[+-]?(?:\d+\.\d+|\.\d+|\d+)(?:[eE][+-]?\d+)?)
+  | (?P<punct>[\[\]();,.])
+  | (?P<name>_:[\w-](?:[\w.-]*[\w-])?|(?:[A-Za-z][\w.-]*)?:(?:[\w:%-](?:[\w.:%-]*[\w:%-])?)?|[A-Za-z]\w*)
+    """,
+    re.VERBOSE,
+)
+
+ESCAPES = re.compile(r"\\(?:u([0-9A-Fa-f]{4})|U([0-9A-Fa-f]{8})|(.))", re.DOTALL)
+ESCAPED_CHARS = {"t": "\t", "b": "\b", "n": "\n", "r": "\r", "f": "\f"}
+
+
+class IRI(str):
+    """
+    Absolute IRI, told apart from string literals by its type.
+    """
+
+    __slots__ = ()
+
+
+class BNode:
+    """
+    Blank node, only equal to itself.
+    """
+
+    __slots__ = ()
+
+
+# Subject -> predicate -> objects.
+Graph = dict[Any, dict[str, list[Any]]]
+
+
+class TurtleError(ValueError):
+    pass
+
+
+def _unescape(match: re.Match) -> str:
+    code = match.group(1) or match.group(2)
+    if code:
+        return chr(int(code, 16))
+    char = match.group(3)
+    return ESCAPED_CHARS.get(char, char)
+
+
+def tokenize(text: str) -> list[tuple[str, str]]:
+    tokens: list[tuple[str, str]] = []
+    pos = 0
+
+    while pos < len(text):
+        match = TOKEN.match(text, pos)
+        if match is None:
+            line = text.count("\n", 0, pos) + 1
+            raise TurtleError(f"line {line}: unexpected {text[pos:pos + 20]!r}")
+        if match.lastgroup != "skip":
+            tokens.append((match.lastgroup or "", match.group()))
+        pos = match.end()
+
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text: str, base: str, graph: Graph):
+        self.tokens = tokenize(text)
+        self.pos = 0
+        self.base = base
+        self.graph = graph
+        self.prefixes: dict[str, str] = {}
+        self.bnodes: dict[str, BNode] = {}
+
+    def peek(self) -> tuple[str, str]:
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos]
+        return ("eof", "")
+
+    def next(self) -> tuple[str, str]:
+        token = self.peek()
+        if token[0] == "eof":
+            raise TurtleError("unexpected end of file")
+        self.pos += 1
+        return token
+
+    def expect(self, value: str) -> None:
+        kind, token = self.next()
+        if token != value:
+            raise TurtleError(f"expected {value!r}, got {token!r}")
+
+    def add(self, subject: Any, predicate: str, obj: Any) -> None:
+        self.graph[subject][predicate].append(obj)
+
+    def parse(self) -> None:
+        while self.peek()[0] != "eof":
+            kind, token = self.peek()
+            if token in ("@prefix", "@base") or (
+                kind == "name" and token.upper() in ("PREFIX", "BASE")
+            ):
+                self.directive()
+            else:
+                self.triples()
+                self.expect(".")
+
+    def directive(self) -> None:
+        _, keyword = self.next()
+        if keyword.lower().lstrip("@") == "prefix":
+            _, prefix = self.next()
+            self.prefixes[prefix[:-1]] = self.iri_ref(self.next()[1])
+        else:
+            self.base = self.iri_ref(self.next()[1])
+
+        if keyword.startswith("@"):
+            self.expect(".")
+
+    def iri_ref(self, token: str) -> IRI:
+        return IRI(urljoin(self.base, token[1:-1]))
+
+    def name(self, token: str) -> Any:
+        if token.startswith("_:"):
+            return self.bnodes.setdefault(token, BNode())
+        prefix, sep, local = token.partition(":")
+        if not sep:
+            raise TurtleError(f"unexpected {token!r}")
+        if prefix not in self.prefixes:
+            raise TurtleError(f"undefined prefix {prefix!r}")
+        return IRI(self.prefixes[prefix] + local)
+
+    def triples(self) -> None:
+        if self.peek()[1] == "[":
+            subject = self.blank_node()
+            if self.peek()[1] == ".":
+                return
+        else:
+            subject = self.term()
+        self.predicate_objects(subject)
+
+    def predicate_objects(self, subject: Any) -> None:
+        while True:
+            kind, token = self.next()
+            predicate = RDF_TYPE if token == "a" else self.resolve(kind, token)
+
+            self.add(subject, predicate, self.object())
+            while self.peek()[1] == ",":
+                self.next()
+                self.add(subject, predicate, self.object())
+
+            if self.peek()[1] != ";":
+                return
+            while self.peek()[1] == ";":
+                self.next()
+            if self.peek()[1] in (".", "]"):
+                return
+
+    def resolve(self, kind: str, token: str) -> IRI:
+        if kind == "iri":
+            return self.iri_ref(token)
+        term = self.name(token) if kind == "name" else None
+        if not isinstance(term, IRI):
+            raise TurtleError(f"expected an IRI, got {token!r}")
+        return term
+
+    def blank_node(self) -> BNode:
+        self.expect("[")
+        node = BNode()
+        if self.peek()[1] != "]":
+            self.predicate_objects(node)
+        self.expect("]")
+        return node
+
+    def collection(self) -> list[Any]:
+        self.expect("(")
+        items = []
+        while self.peek()[1] != ")":
+            items.append(self.object())
+        self.next()
+        return items
+
+    def term(self) -> Any:
+        kind, token = self.next()
+        if kind == "iri":
+            return self.iri_ref(token)
+        if kind == "name":
+            return self.name(token)
+        raise TurtleError(f"unexpected {token!r}")
+
+    def object(self) -> Any:
+        kind, token = self.peek()
+
+        if token == "[":
+            return self.blank_node()
+        if token == "(":
+            return self.collection()
+        if kind in ("string", "long_string"):
+            self.next()
+            return self.literal(token)
+        if kind == "number":
+            self.next()
+            return float(token) if any(c in token for c in ".eE") else int(token)
+        if kind == "name" and token in ("true", "false"):
+            self.next()
+            return token == "true"
+
+        return self.term()
+
+    def literal(self, token: str) -> Any:
+        quote = 3 if token[:3] in ('"""', "'''") else 1
+        value = ESCAPES.sub(_unescape, token[quote:-quote])
+
+        kind, suffix = self.peek()
+        if kind == "at":
+            self.next()
+        elif kind == "datatype":
+            self.next()
+            datatype = self.resolve(*self.next())
+            if datatype in (XSD + "float", XSD + "double", XSD + "decimal"):
+                return float(value)
+            if datatype == XSD + "integer":
+                return int(value)
+            if datatype == XSD + "boolean":
+                return value == "true"
+
+        return value
+
+
+def new_graph() -> Graph:
+    return defaultdict(lambda: defaultdict(list))
+
+
+def parse(text: str, base: str = "", graph: Graph | None = None) -> Graph:
+    """
+    Parse Turtle into a graph, enough of it for LV2 plugin descriptions.
+
+    :param text: Turtle document
+    :param base: base IRI of relative IRIs, usually the file IRI
+    :param graph: graph to add the triples to (if any)
+    :type text: str
+    :type base: str
+    :type graph: Graph | None
+    :raises TurtleError: if the document is invalid
+    :return: triples by subject and predicate
+    :rtype: Graph
+    """
+    graph = new_graph() if graph is None else graph
+    _Parser(text, base, graph).parse()
+    return graph
@@ -1,6 +1,6 @@
-import json
-from decimal import Decimal
+import json, os
 from math import log10
+from typing import TextIO
 
 
 def db_to_linear(db: float) -> float:
@@ -44,4 +44,101 @@ def load_config(filepath: str) -> dict:
 
 
 def format_6f(value: float) -> float:
-    return float(format(Decimal(value), ".6f"))
+    # Same result as rounding through Decimal: both round the exact binary
+    # value half-to-even.
+    return float(format(float(value), ".6f"))
+
+
+class AtomicWriter:
+    """
+    Write a file through a temporary file that replaces it on success.
+
+    With ``skip_unchanged``, the original file is left untouched when the new
+    content is identical. ``changed`` tells whether the file was replaced.
+    """
+
+    def __init__(self, filepath: str, skip_unchanged: bool = True):
+        self.filepath = filepath
+        self.skip_unchanged = skip_unchanged
+        self.changed = False
+
+    def __enter__(self) -> TextIO:
+        import tempfile
+
+        directory, name = os.path.split(os.path.abspath(self.filepath))
+        fd, self.tmp_path = tempfile.mkstemp(
+            prefix=f".{name}.", suffix=".tmp", dir=directory
+        )
+        self.file = os.fdopen(fd, "w")
+        return self.file
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.file.close()
+
+        if exc_type is not None or (
+            self.skip_unchanged and _same_content(self.tmp_path, self.filepath)
+        ):
+            os.unlink(self.tmp_path)
+            return
+
+        try:
+            os.chmod(self.tmp_path, _file_mode(self.filepath))
+            os.replace(self.tmp_path, self.filepath)
+        except BaseException:
+            os.unlink(self.tmp_path)
+            raise
+
+        self.changed = True
+
+
+def _same_content(path: str, other: str) -> bool:
+    import filecmp
+
+    try:
+        return filecmp.cmp(path, other, shallow=False)
+    except FileNotFoundError:
+        return False
+
+
+def _file_mode(filepath: str) -> int:
+    try:
+        return os.stat(filepath).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def atomic_write(filepath: str, data: str) -> None:
+    """
+    Write a file atomically by replacing it with a fully written temporary file.
+
+    :param filepath: path to the file to write
+    :param data: file content
+    :type filepath: str
+    :type data: str
+    """
+    with AtomicWriter(filepath, skip_unchanged=False) as f:
+        f.write(data)
+
+
+def write_if_changed(filepath: str, data: str) -> bool:
+    """
+    Write a file unless it already has exactly the given content.
+
+    :param filepath: path to the file to write
+    :param data: file content
+    :type filepath: str
+    :type data: str
+    :return: True if the file was written
+    :rtype: bool
+    """
+    try:
+        with open(filepath, "r") as f:
+            if f.read() == data:
+                return False
+    except (FileNotFoundError, UnicodeDecodeError):
+        pass
+
+    atomic_write(filepath, data)
+    return True
@@ -0,0 +1,242 @@
+import ctypes, ctypes.util, os, select, struct, threading, time
+from collections.abc import Callable
+
+from .batch import (
+    OUTPUT_SUFFIX,
+    PRESET_SUFFIX,
+    ConversionResult,
+    convert_one,
+    output_path,
+)
+from .cache import ConversionCache
+from .convert import ConversionOptions
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+INOTIFY_EVENT = struct.Struct("iIII")
+INOTIFY_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY
+
+DEBOUNCE_DELAY = 0.1
+POLL_INTERVAL = 0.25
+
+
+class InotifyWatcher:
+    """
+    Report files written or moved into a directory, using Linux inotify.
+    """
+
+    def __init__(self, directory: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+
+        self.directory = directory
+        self.fd: int = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        wd = libc.inotify_add_watch(self.fd, os.fsencode(directory), INOTIFY_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"cannot watch {directory}")
+
+    def poll(self, timeout: float) -> list[str]:
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+
+        try:
+            buffer = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        paths: list[str] = []
+        offset = 0
+
+        while offset < len(buffer):
+            _, _, _, length = INOTIFY_EVENT.unpack_from(buffer, offset)
+            offset += INOTIFY_EVENT.size
+            name = buffer[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if name:
+                paths.append(os.path.join(self.directory, os.fsdecode(name)))
+
+        return paths
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """
+    Report changed files in a directory by comparing mtimes and sizes.
+    """
+
+    def __init__(self, directory: str, interval: float = POLL_INTERVAL):
+        self.directory = directory
+        self.interval = interval
+        self.state = self._scan()
+
+    def _scan(self) -> dict[str, tuple[int, int]]:
+        state: dict[str, tuple[int, int]] = {}
+
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                state[entry.path] = (stat.st_mtime_ns, stat.st_size)
+
+        return state
+
+    def poll(self, timeout: float) -> list[str]:
+        time.sleep(min(timeout, self.interval))
+
+        state = self._scan()
+        changed = [
+            path for path, stamp in state.items() if self.state.get(path) != stamp
+        ]
+        self.state = state
+
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+def open_watcher(directory: str) -> InotifyWatcher | PollingWatcher:
+    """
+    Watch a directory with inotify, falling back to polling where unavailable.
+
+    :param directory: directory to watch
+    :type directory: str
+    :return: directory watcher
+    :rtype: InotifyWatcher | PollingWatcher
+    """
+    try:
+        return InotifyWatcher(directory)
+    except (OSError, AttributeError, TypeError):
+        return PollingWatcher(directory)
+
+
+class Debouncer:
+    """
+    Collapse bursts of events per path into one, once the path has been quiet
+    for ``delay`` seconds.
+    """
+
+    def __init__(
+        self,
+        delay: float = DEBOUNCE_DELAY,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.delay = delay
+        self.clock = clock
+        self.deadlines: dict[str, float] = {}
+
+    def touch(self, path: str) -> None:
+        self.deadlines[path] = self.clock() + self.delay
+
+    def timeout(self) -> float | None:
+        if not self.deadlines:
+            return None
+        return max(0.0, min(self.deadlines.values()) - self.clock())
+
+    def ready(self) -> list[str]:
+        now = self.clock()
+        paths = [path for path, deadline in self.deadlines.items() if deadline <= now]
+
+        for path in paths:
+            del self.deadlines[path]
+
+        return paths
+
+
+def watch(
+    directory: str,
+    outputs: Callable[[str], str | None],
+    options: ConversionOptions = ConversionOptions(),
+    cache: ConversionCache | None = None,
+    on_result: Callable[[ConversionResult], None] = print,
+    stop: threading.Event | None = None,
+    delay: float = DEBOUNCE_DELAY,
+) -> None:
+    """
+    Reconvert presets in a directory whenever they change.
+
+    Every watched preset is converted once at start. Outputs are replaced
+    atomically and only when their content changes.
+
+    :param directory: directory containing the EasyEffects presets
+    :param outputs: maps a preset path to its output path, or None to ignore it
+    :param options: conversion options, the filter chain name defaults to each
+        preset name
+    :param cache: conversion cache (if any)
+    :param on_result: called with the result of every conversion
+    :param stop: event that ends the watch loop when set
+    :param delay: quiet period before a changed preset is converted
+    :type directory: str
+    :type outputs: Callable[[str], str | None]
+    :type options: ConversionOptions
+    :type cache: ConversionCache | None
+    :type on_result: Callable[[ConversionResult], None]
+    :type stop: threading.Event | None
+    :type delay: float
+    """
+    stop = stop or threading.Event()
+    debouncer = Debouncer(delay)
+    watcher = open_watcher(directory)
+
+    def convert(preset: str) -> None:
+        output = outputs(preset)
+        if output is not None and os.path.isfile(preset):
+            on_result(convert_one(preset, output, options, cache))
+
+    try:
+        for entry in sorted(os.scandir(directory), key=lambda entry: entry.name):
+            convert(entry.path)
+
+        while not stop.is_set():
+            timeout = debouncer.timeout()
+
+            for path in watcher.poll(1.0 if timeout is None else timeout):
+                if outputs(path) is not None:
+                    debouncer.touch(path)
+
+            for path in debouncer.ready():
+                convert(path)
+    finally:
+        watcher.close()
+
+
+def directory_outputs(
+    output_dir: str, suffix: str = OUTPUT_SUFFIX
+) -> Callable[[str], str | None]:
+    """
+    Map every preset in a directory to an output file in ``output_dir``.
+    """
+
+    def outputs(preset: str) -> str | None:
+        if not preset.endswith(PRESET_SUFFIX) or os.path.basename(preset)[0] == ".":
+            return None
+        return output_path(preset, output_dir, suffix)
+
+    return outputs
+
+
+def file_outputs(preset: str, output: str) -> Callable[[str], str | None]:
+    """
+    Map a single preset to its output file, ignoring every other file.
+    """
+    preset = os.path.abspath(preset)
+
+    def outputs(path: str) -> str | None:
+        return output if os.path.abspath(path) == preset else None
+
+    return outputs
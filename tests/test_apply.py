@@ -0,0 +1,124 @@
+from ee2pw.apply import main, plan_apply
+from ee2pw.core import build
+from ee2pw.util import load_config
+
+import contextlib, io, unittest, json, os, stat, tempfile
+
+
+def write_stub(path, log):
+    with open(path, "w") as f:
+        f.write(f'#!/bin/sh\nprintf "%s\\n" "$*" >> "{log}"\n')
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+
+
+class TestApply(unittest.TestCase):
+    def setUp(self):
+        self.config = load_config("tests/data/Think.json")
+        self.objects = load_config("tests/data/pipewire/pw-dump.json")
+
+    def test_plan_unchanged(self):
+        plan = plan_apply(build(self.config, "Think"), "Think", self.objects)
+
+        self.assertEqual(plan.node_id, 71)
+        self.assertEqual(plan.changes, {})
+        self.assertFalse(plan.needs_reload)
+
+    def test_plan_control_change(self):
+        self.config["output"]["limiter#0"]["lookahead"] = 2.5
+        self.config["output"]["filter#0"]["frequency"] = 80.0
+
+        plan = plan_apply(build(self.config, "Think"), "Think", self.objects)
+
+        self.assertEqual(plan.changes, {"filter_0:f": 80.0, "limiter_0:lk": 2.5})
+        self.assertFalse(plan.needs_reload)
+
+    def test_plan_structure_change(self):
+        self.config["output"]["plugins_order"].remove("stereo_tools#0")
+
+        plan = plan_apply(build(self.config, "Think"), "Think", self.objects)
+
+        self.assertTrue(plan.needs_reload)
+
+    def test_plan_not_running(self):
+        plan = plan_apply(build(self.config, "Other"), "Other", self.objects)
+
+        self.assertIsNone(plan.node_id)
+        self.assertTrue(plan.needs_reload)
+
+    def test_plan_split(self):
+        plan = plan_apply(build(self.config, "Think", split=2), "Think", self.objects)
+
+        # The running chain was deployed in one piece.
+        self.assertIn("filter chain Think stage 2 is not running", plan.reload_reasons)
+        self.assertEqual(list(plan.updates), [71])
+
+    def test_main_with_options(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log = os.path.join(tmp, "commands.log")
+            pw_cli = os.path.join(tmp, "pw-cli")
+            preset = os.path.join(tmp, "Think.json")
+            output = os.path.join(tmp, "think.json")
+            pw_dump = os.path.join(tmp, "pw-dump.json")
+            write_stub(pw_cli, log)
+
+            with open(output, "w") as f:
+                json.dump(build(self.config, "Think", sparse=True), f)
+            with open(preset, "w") as f:
+                json.dump(self.config, f)
+
+            # The running threshold was lowered since, the preset keeps the
+            # LV2 default which the sparse config leaves out.
+            for node in self.objects:
+                for prop in node.get("info", {}).get("params", {}).get("Props", []):
+                    params = prop.get("params", [])
+                    if "limiter_0:th" in params:
+                        params[params.index("limiter_0:th") + 1] = 0.5
+            with open(pw_dump, "w") as f:
+                json.dump(self.objects, f)
+
+            args = ["-n", "Think", "-o", output, "--sparse", "--pw-dump", pw_dump]
+            stdout = io.StringIO()
+            with (
+                contextlib.redirect_stdout(stdout),
+                contextlib.redirect_stderr(io.StringIO()),
+            ):
+                main([preset, *args, "--pw-cli", pw_cli])
+
+            with open(log) as f:
+                commands = f.read().splitlines()
+
+            self.assertNotIn("reload required", stdout.getvalue())
+            self.assertEqual(
+                commands, ['set-param 71 Props {params=["limiter_0:th" 1.0]}']
+            )
+
+    def test_main_with_stub_pw_cli(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log = os.path.join(tmp, "commands.log")
+            pw_cli = os.path.join(tmp, "pw-cli")
+            reload = os.path.join(tmp, "reload")
+            preset = os.path.join(tmp, "Think.json")
+            write_stub(pw_cli, log)
+            write_stub(reload, log)
+
+            self.config["output"]["limiter#0"]["threshold"] = -1.0
+            with open(preset, "w") as f:
+                json.dump(self.config, f)
+
+            args = ["--pw-dump", "tests/data/pipewire/pw-dump.json", "--pw-cli", pw_cli]
+            stdout = io.StringIO()
+            with contextlib.redirect_stdout(stdout):
+                main([preset, *args, "--reload-command", reload])
+
+            with open(log) as f:
+                commands = f.read().splitlines()
+
+            self.assertEqual(
+                commands,
+                ['set-param 71 Props {params=["limiter_0:th" 0.891251]}'],
+            )
+            self.assertEqual(
+                stdout.getvalue(),
+                f"{pw_cli} set-param 71 Props "
+                "'{params=[\"limiter_0:th\" 0.891251]}'\n",
+            )
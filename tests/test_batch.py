@@ -0,0 +1,67 @@
+from ee2pw.__main__ import main
+from ee2pw.batch import collect_presets, convert_batch, format_result, is_batch
+from ee2pw.convert import ConversionOptions
+
+import contextlib, io, unittest, json, os, tempfile
+
+
+class TestBatch(unittest.TestCase):
+    def test_is_batch(self):
+        self.assertFalse(is_batch(["tests/data/Think.json"]))
+        self.assertTrue(is_batch(["tests/data"]))
+        self.assertTrue(is_batch(["tests/data/*.json"]))
+        self.assertTrue(is_batch(["a.json", "b.json"]))
+
+    def test_collect_presets(self):
+        presets = collect_presets(
+            ["tests/data", "tests/data/*.json", "tests/data/Think.json"]
+        )
+
+        self.assertEqual(presets, [os.path.join("tests", "data", "Think.json")])
+
+    def test_convert_batch(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            results = list(
+                convert_batch(
+                    ["tests/data/Think.json", "tests/data/Missing.json"],
+                    output_dir,
+                    jobs=2,
+                )
+            )
+
+            by_preset = {result.preset: result for result in results}
+
+            self.assertTrue(by_preset["tests/data/Think.json"].ok)
+            self.assertFalse(by_preset["tests/data/Missing.json"].ok)
+
+            with open(os.path.join(output_dir, "Think.json")) as f:
+                module = json.load(f)["context.modules"][0]
+
+            self.assertEqual(module["args"]["node.description"], "Think")
+
+    def test_convert_batch_reports(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            (result,) = convert_batch(
+                ["tests/data/Think.json"],
+                output_dir,
+                ConversionOptions(optimize=True, latency=True),
+            )
+
+        self.assertEqual(len(result.reports), 2)
+        self.assertTrue(result.reports[1].endswith("4.00 ms at 48000 Hz"))
+        self.assertTrue(format_result(result).endswith(result.reports[-1]))
+
+    def test_filter_chain_name_rejected(self):
+        with self.assertRaises(ValueError):
+            list(convert_batch(["a.json", "b.json"], "out", ConversionOptions("x")))
+
+        stderr = io.StringIO()
+        with (
+            tempfile.TemporaryDirectory() as output_dir,
+            contextlib.redirect_stderr(stderr),
+            self.assertRaises(SystemExit),
+        ):
+            main(
+                ["tests/data/Think.json", "extras/presets", "-n", "x", "-d", output_dir]
+            )
+        self.assertIn("cannot name several presets", stderr.getvalue())
@@ -0,0 +1,56 @@
+from benchmarks.__main__ import main
+from benchmarks.suite import compare, load_results, save_results
+
+import contextlib, io, unittest, os, tempfile
+from unittest import mock
+
+
+def results(**seconds):
+    return {"meta": {}, "results": seconds}
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_compare(self):
+        baseline = results(fast=1.0, slow=1.0, gone=1.0)
+        current = results(fast=0.5, slow=1.5, new=2.0)
+
+        self.assertEqual(compare(current, baseline), [("slow", 1.0, 1.5, 1.5)])
+
+    def test_compare_threshold(self):
+        baseline = results(a=1.0)
+
+        self.assertEqual(compare(results(a=1.1), baseline), [])
+        self.assertEqual(len(compare(results(a=1.11), baseline)), 1)
+        self.assertEqual(compare(results(a=1.5), baseline, threshold=0.5), [])
+        self.assertEqual(len(compare(results(a=1.01), baseline, threshold=0.0)), 1)
+
+    def test_compare_missing_baseline(self):
+        self.assertEqual(compare(results(a=1.0), {}), [])
+        self.assertEqual(compare(results(a=1.0), results(a=0.0)), [])
+
+    def test_main_with_baseline(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline = os.path.join(tmp, "baseline.json")
+            output = os.path.join(tmp, "results.json")
+            save_results(results(a=1.0, b=1.0), baseline)
+
+            stderr = io.StringIO()
+            with (
+                mock.patch("benchmarks.__main__.run", return_value=results(a=1.0)),
+                contextlib.redirect_stdout(io.StringIO()),
+                contextlib.redirect_stderr(stderr),
+            ):
+                self.assertEqual(main(["-b", baseline, "-o", output]), 0)
+            self.assertEqual(stderr.getvalue(), "")
+            self.assertEqual(load_results(output), results(a=1.0))
+
+            with (
+                mock.patch("benchmarks.__main__.run", return_value=results(b=2.0)),
+                contextlib.redirect_stdout(io.StringIO()),
+                contextlib.redirect_stderr(stderr),
+            ):
+                self.assertEqual(main(["-b", baseline]), 1)
+            self.assertEqual(
+                stderr.getvalue(),
+                "REGRESSION b: 1000.00 ms -> 2000.00 ms (2.00x)\n",
+            )
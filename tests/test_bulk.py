@@ -0,0 +1,89 @@
+from ee2pw.bulk import build_presets, convert_values, has_numpy, scatter
+from ee2pw.core import build, parse_chain
+from ee2pw.lv2_wrapper import FLOAT, FLOAT_DB, Deferred, Pending, deferred
+from ee2pw.util import load_config
+
+import glob, random, threading, unittest
+
+
+class TestBulk(unittest.TestCase):
+    def setUp(self):
+        self.presets = sorted(glob.glob("extras/presets/*.json"))
+        self.configs = [load_config(preset) for preset in self.presets]
+
+    def test_deferred(self):
+        with deferred() as pending:
+            chains = [parse_chain(config) for config in self.configs]
+
+        self.assertTrue(pending.values)
+        self.assertTrue(
+            any(
+                type(value) is Pending
+                for nodes in chains
+                for node in nodes
+                for value in node.control.values()
+            )
+        )
+
+        scatter(chains, convert_values(pending))
+
+        self.assertEqual(
+            [[node.to_dict() for node in nodes] for nodes in chains],
+            [
+                [node.to_dict() for node in parse_chain(config)]
+                for config in self.configs
+            ],
+        )
+
+    def test_deferred_per_thread(self):
+        chains = []
+        with deferred() as pending:
+            thread = threading.Thread(
+                target=lambda: chains.append(parse_chain(self.configs[0]))
+            )
+            thread.start()
+            thread.join()
+
+        # Only the thread that entered deferred() gathers values.
+        self.assertEqual(pending.values, [])
+        self.assertEqual(
+            [node.to_dict() for node in chains[0]],
+            [node.to_dict() for node in parse_chain(self.configs[0])],
+        )
+
+    def test_build_presets(self):
+        names = [f"preset {i}" for i in range(len(self.configs))]
+
+        self.assertEqual(
+            build_presets(self.configs, names, "dev", optimize=True),
+            [
+                build(config, name, "dev", optimize=True)
+                for config, name in zip(self.configs, names)
+            ],
+        )
+
+    @unittest.skipUnless(has_numpy(), "NumPy is not installed")
+    def test_vectorized_matches_scalar(self):
+        rng = random.Random(0)
+        pending = Deferred()
+
+        values = [rng.uniform(-120.0, 24.0) for _ in range(20000)]
+        # Half-way points, and values right next to them.
+        values += [0.0078125, 1.0000005, -2.5e-7, 7812.5e-6, 2000.0, -0.0]
+        values += [round(rng.uniform(-10, 10), 6) + 5e-7 for _ in range(2000)]
+
+        for value in values:
+            pending.add(value, FLOAT)
+            pending.add(value, FLOAT_DB)
+        pending.add(1e300, FLOAT)
+
+        converted = convert_values(pending)
+        expected = [pending.convert_scalar(i) for i in range(len(converted))]
+
+        self.assertEqual(
+            [value.hex() for value in converted], [value.hex() for value in expected]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+from ee2pw.cache import ConversionCache, cache_key
+from ee2pw.convert import ConversionOptions, convert_file
+from ee2pw import core
+
+import unittest, os, tempfile
+from unittest import mock
+
+
+class TestCache(unittest.TestCase):
+    def test_cache_key(self):
+        key = cache_key(b"{}", "Speaker", None)
+
+        self.assertEqual(key, cache_key(b"{}", "Speaker", None))
+        self.assertNotEqual(key, cache_key(b"{}", "Speaker", ""))
+        self.assertNotEqual(key, cache_key(b"{}", "Speaker", "alsa_output"))
+        self.assertNotEqual(key, cache_key(b"{ }", "Speaker", None))
+
+    def test_cache_key_sources(self):
+        key = cache_key(b"{}", "Speaker")
+
+        with mock.patch("ee2pw.cache.source_digest", return_value=b"changed"):
+            self.assertNotEqual(cache_key(b"{}", "Speaker"), key)
+
+    def test_convert_file_cached(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ConversionCache(os.path.join(tmp, "cache"))
+            output = os.path.join(tmp, "think.json")
+            think = ConversionOptions("Think")
+
+            self.assertTrue(convert_file("tests/data/Think.json", output, think, cache))
+
+            mtime = os.stat(output).st_mtime_ns
+
+            with mock.patch("ee2pw.convert.build") as build:
+                self.assertFalse(
+                    convert_file("tests/data/Think.json", output, think, cache)
+                )
+                build.assert_not_called()
+
+            self.assertEqual(os.stat(output).st_mtime_ns, mtime)
+
+            # Outputs cached by another version of the code are not reused.
+            with (
+                mock.patch("ee2pw.cache.source_digest", return_value=b"changed"),
+                mock.patch("ee2pw.convert.build", wraps=core.build) as patched,
+            ):
+                convert_file("tests/data/Think.json", output, think, cache)
+                patched.assert_called_once()
+
+            self.assertTrue(
+                convert_file(
+                    "tests/data/Think.json", output, ConversionOptions("Other"), cache
+                )
+            )
+
+    def test_convert_file_reports(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ConversionCache(os.path.join(tmp, "cache"))
+            output = os.path.join(tmp, "think.json")
+            think = ConversionOptions("Think", optimize=True)
+
+            convert_file("tests/data/Think.json", output, think, cache)
+
+            # A cache hit would leave the report empty.
+            report: dict = {}
+            convert_file("tests/data/Think.json", output, think, cache, report)
+            self.assertIn("optimizer", report)
+
+            with mock.patch("ee2pw.convert.build") as build:
+                convert_file("tests/data/Think.json", output, think, cache)
+                build.assert_not_called()
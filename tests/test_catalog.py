@@ -0,0 +1,111 @@
+from ee2pw.catalog import Catalog, Condition, main, parse_condition
+
+import contextlib, io, json, os, shutil, tempfile, unittest
+
+
+class TestCatalog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+        for name in ("Think", "Trees", "Nothing"):
+            shutil.copy(f"extras/presets/{name}.json", self.tmp)
+
+        self.think = os.path.join(self.tmp, "Think.json")
+        self.trees = os.path.join(self.tmp, "Trees.json")
+        self.presets = sorted(
+            os.path.join(self.tmp, name) for name in os.listdir(self.tmp)
+        )
+
+        self.catalog = Catalog(os.path.join(self.tmp, "catalog.sqlite"))
+        self.addCleanup(self.catalog.close)
+
+    def set_lookahead(self, path, lookahead):
+        with open(path) as f:
+            config = json.load(f)
+        config["output"]["limiter#0"]["lookahead"] = lookahead
+        with open(path, "w") as f:
+            json.dump(config, f)
+
+    def test_parse_condition(self):
+        self.assertEqual(
+            parse_condition("limiter:lk>5"), Condition("limiter", "lk", ">", 5.0)
+        )
+        self.assertEqual(
+            parse_condition("sum(multiband_compressor:cbe_*) >= 4"),
+            Condition("multiband_compressor", "cbe_*", ">=", 4.0, "sum"),
+        )
+
+        for expression in ("limiter>5", "limiter:lk>x", "avg(limiter:lk)>1"):
+            with self.assertRaises(ValueError):
+                parse_condition(expression)
+
+    def test_query(self):
+        self.set_lookahead(self.trees, 6.5)
+        self.catalog.update(self.presets)
+
+        self.assertEqual(self.catalog.query([]), self.presets)
+        self.assertEqual(
+            self.catalog.query([parse_condition("limiter:lk>5")]), [self.trees]
+        )
+        self.assertEqual(
+            self.catalog.query([parse_condition("sum(multiband_compressor:cbe_*)>4")]),
+            [self.think],
+        )
+        self.assertEqual(
+            self.catalog.query(
+                [parse_condition("limiter:lk>1"), parse_condition("*:cbe_[12]=1")]
+            ),
+            [self.think, self.trees],
+        )
+
+    def test_incremental(self):
+        stats = self.catalog.update(self.presets)
+        self.assertEqual(stats[:3], (3, 0, 0))
+
+        stats = self.catalog.update(self.presets)
+        self.assertEqual(stats[:3], (0, 3, 0))
+
+        # Same content, new mtime: only rehashed.
+        os.utime(self.think, ns=(0, 10**18))
+        self.assertEqual(self.catalog.update(self.presets)[:3], (0, 3, 0))
+
+        self.set_lookahead(self.think, 9.0)
+        self.assertEqual(self.catalog.update(self.presets)[:3], (1, 2, 0))
+        self.assertEqual(
+            self.catalog.query([parse_condition("limiter:lk=9")]), [self.think]
+        )
+
+        os.remove(self.trees)
+        with open(os.path.join(self.tmp, "Nothing.json"), "w") as f:
+            f.write("{")
+
+        stats = self.catalog.update(self.presets)
+        self.assertEqual(stats[:3], (0, 1, 1))
+        self.assertEqual(len(stats.failed), 1)
+        self.assertEqual(self.catalog.query([]), [self.think])
+
+    def test_export(self):
+        export = os.path.join(self.tmp, "matches.txt")
+        stderr = io.StringIO()
+
+        with contextlib.redirect_stderr(stderr):
+            main(
+                [
+                    self.tmp,
+                    "--db",
+                    os.path.join(self.tmp, "cli.sqlite"),
+                    "-w",
+                    "sum(multiband_compressor:cbe_*)<5",
+                    "--export",
+                    export,
+                ]
+            )
+
+        with open(export) as f:
+            self.assertEqual(f.read(), f"{self.trees}\n")
+        self.assertIn("3 indexed", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
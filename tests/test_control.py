@@ -0,0 +1,120 @@
+from ee2pw.apply import set_param_command
+from ee2pw.control import ControlSession, main, parse_assignment, set_param_line
+
+import unittest, io, os, stat, tempfile
+from unittest import mock
+
+PW_DUMP = "tests/data/pipewire/pw-dump.json"
+
+
+def write_fake_pw_cli(path, log):
+    """
+    Write a fake interactive pw-cli that logs its start and every command.
+    """
+    with open(path, "w") as f:
+        f.write(
+            "#!/bin/sh\n"
+            f'echo start >> "{log}"\n'
+            f'while IFS= read -r line; do printf "%s\\n" "$line" >> "{log}"; done\n'
+        )
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+
+
+class TestControl(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log = os.path.join(self.tmp.name, "log")
+        self.pw_cli = os.path.join(self.tmp.name, "pw-cli")
+        write_fake_pw_cli(self.pw_cli, self.log)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def commands(self):
+        with open(self.log) as f:
+            return f.read().splitlines()
+
+    def test_set_param_line(self):
+        changes = {"limiter_0:th": 0.5, "filter_0:f": 80.0}
+
+        # The interactive line and the apply command encode the same update.
+        self.assertEqual(
+            set_param_line(71, changes).split(" ", 3),
+            set_param_command(71, changes)[1:],
+        )
+
+    def test_session(self):
+        with ControlSession(71, self.pw_cli) as session:
+            session.set_input_gain(-6.0)
+            with session.batch():
+                for band in range(4):
+                    session.set_makeup_gain(band, 20.0)
+                session.set("limiter_0", "th", 0.5)
+
+        self.assertEqual(
+            self.commands(),
+            [
+                "start",
+                'set-param 71 Props {params=["multiband_compressor_0:g_in" 0.501187]}',
+                "set-param 71 Props {params=["
+                '"multiband_compressor_0:mk_0" 10.0 '
+                '"multiband_compressor_0:mk_1" 10.0 '
+                '"multiband_compressor_0:mk_2" 10.0 '
+                '"multiband_compressor_0:mk_3" 10.0 '
+                '"limiter_0:th" 0.5]}',
+            ],
+        )
+
+    def test_failed_batch_is_dropped(self):
+        with ControlSession(71, self.pw_cli, {"limiter_0:th"}) as session:
+            with self.assertRaises(KeyError):
+                with session.batch():
+                    session.set("limiter_0", "th", 0.5)
+                    session.set("limiter_0", "nope", 1.0)
+
+        self.assertFalse(os.path.exists(self.log))
+
+    def test_parse_assignment(self):
+        self.assertEqual(
+            parse_assignment("multiband_compressor_0:mk_2=-3dB"),
+            ("multiband_compressor_0", "mk_2", -3.0, True),
+        )
+        self.assertEqual(parse_assignment("limiter_0:th=0.5")[2:], (0.5, False))
+        with self.assertRaises(ValueError):
+            parse_assignment("limiter_0=0.5")
+
+    def test_main(self):
+        stdin = io.StringIO("filter_0:g_in=0dB\n\nfilter_0:f=120 filter_0:g=6dB\n")
+
+        with mock.patch("sys.stdin", stdin):
+            status = main(
+                [
+                    "-n",
+                    "Think",
+                    "--pw-dump",
+                    PW_DUMP,
+                    "--pw-cli",
+                    self.pw_cli,
+                    "limiter_0:th=-1dB",
+                    "-",
+                ]
+            )
+
+        self.assertEqual(status, 0)
+        self.assertEqual(
+            self.commands(),
+            [
+                "start",
+                'set-param 71 Props {params=["limiter_0:th" 0.891251]}',
+                'set-param 71 Props {params=["filter_0:g_in" 1.0]}',
+                'set-param 71 Props {params=["filter_0:f" 120.0 "filter_0:g" 1.995262]}',
+            ],
+        )
+
+    def test_main_unknown_control(self):
+        with mock.patch("sys.stderr", io.StringIO()), self.assertRaises(SystemExit):
+            main(
+                ["-n", "Think", "--pw-dump", PW_DUMP, "--pw-cli", self.pw_cli, "x:y=1"]
+            )
+
+        self.assertFalse(os.path.exists(self.log))
@@ -0,0 +1,94 @@
+from ee2pw.__main__ import main
+from ee2pw.cost import chain_cost, node_cost, rank_presets
+from ee2pw.filter import parse_filter
+from ee2pw.limiter import parse_limiter
+from ee2pw.multiband_compressor import parse_multiband_compressor
+from ee2pw.util import load_config
+
+import contextlib, io, json, os, tempfile, unittest
+
+
+class TestCost(unittest.TestCase):
+    def setUp(self):
+        self.output = load_config("tests/data/Think.json")["output"]
+
+    def test_filter(self):
+        iir = parse_filter({"slope": "x1"}, "filter_0")
+        steep = parse_filter({"slope": "x4"}, "filter_1")
+        fir = parse_filter({"slope": "x1", "equal-mode": "FIR"}, "filter_2")
+
+        self.assertEqual(node_cost(iir), 1.0)
+        self.assertEqual(node_cost(steep), 2.5)
+        self.assertEqual(node_cost(fir), 2.5)
+
+    def test_limiter_oversampling(self):
+        limiter = self.output["limiter#0"]
+        none = parse_limiter({**limiter, "oversampling": "None"}, "limiter_0")
+        x4 = parse_limiter({**limiter, "oversampling": "Full x4/24 bit"}, "limiter_0")
+        true_peak = parse_limiter(
+            {**limiter, "oversampling": "True Peak/24 bit"}, "limiter_0"
+        )
+
+        self.assertEqual(node_cost(none), 3.0)
+        self.assertEqual(node_cost(x4), 10.5)
+        self.assertEqual(node_cost(true_peak), node_cost(x4))
+
+    def test_multiband_compressor_bands(self):
+        config = self.output["multiband_compressor#0"]
+        bands = 1 + sum(
+            config[f"band{i}"].get("enable-band", False) for i in range(1, 8)
+        )
+        linear_phase = {**config, "compressor-mode": "Linear Phase"}
+
+        compressor = parse_multiband_compressor(config, "multiband_compressor_0")
+        self.assertEqual(node_cost(compressor), 0.5 + bands)
+
+        compressor = parse_multiband_compressor(linear_phase, "multiband_compressor_0")
+        self.assertEqual(node_cost(compressor), 0.5 + 2 * bands)
+
+    def test_chain_cost(self):
+        nodes = [parse_filter({}, "filter_0"), parse_filter({}, "filter_1")]
+        cost = chain_cost(nodes, "Two")
+
+        self.assertEqual(cost.total, 2.0)
+        self.assertEqual([node.name for node in cost.nodes], ["filter_0", "filter_1"])
+        self.assertIn("total for Two", cost.format())
+
+    def test_rank_presets(self):
+        costs = rank_presets(["extras/presets/Nothing.json", "tests/data/Think.json"])
+
+        self.assertEqual([cost.name for cost in costs], ["Think", "Nothing"])
+        self.assertEqual(costs[1].total, 0.0)
+
+    def test_rank_presets_errors(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            invalid = os.path.join(tmp, "Invalid.json")
+            with open(invalid, "w") as f:
+                json.dump(
+                    {
+                        "output": {
+                            "plugins_order": ["limiter#0"],
+                            "limiter#0": {"threshold": "x"},
+                        }
+                    },
+                    f,
+                )
+            presets = ["tests/data/Think.json", os.path.join(tmp, "Missing.json")]
+
+            with self.assertRaises(OSError):
+                rank_presets(presets)
+
+            errors: dict = {}
+            costs = rank_presets([*presets, invalid], errors)
+
+            stdout = io.StringIO()
+            with contextlib.redirect_stdout(stdout):
+                self.assertEqual(main([*presets, invalid, "--cost-report"]), 1)
+
+        self.assertEqual([cost.name for cost in costs], ["Think"])
+        self.assertEqual(list(errors), presets[1:] + [invalid])
+        self.assertTrue(errors[invalid].startswith("ValueError"))
+        self.assertEqual(
+            stdout.getvalue().splitlines()[-2:],
+            [f"[FAIL] {preset}: {errors[preset]}" for preset in errors],
+        )
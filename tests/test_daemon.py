@@ -0,0 +1,189 @@
+from ee2pw.daemon import (
+    SmartFilterSwitcher,
+    Switch,
+    main,
+    pw_metadata_set_disabled,
+    replay,
+)
+from ee2pw.pipewire import iter_pw_dump
+
+import asyncio, contextlib, io, os, stat, tempfile, unittest
+
+PW_DUMP_MONITOR = "tests/data/pipewire/pw-dump-monitor.json"
+SPEAKER = "alsa_output.pci-0000_73_00.6.HiFi__Speaker__sink"
+HEADPHONES = "alsa_output.usb-Headphones-00.analog-stereo"
+
+
+def recorded_updates():
+    with open(PW_DUMP_MONITOR) as f:
+        return list(iter_pw_dump(f))
+
+
+def filters_metadata(node_id, value):
+    return {
+        "id": 40,
+        "type": "PipeWire:Interface:Metadata",
+        "props": {"metadata.name": "filters"},
+        "metadata": [
+            {
+                "subject": node_id,
+                "key": "filter.smart.disabled",
+                "type": "Spa:String:JSON",
+                "value": value,
+            }
+        ],
+    }
+
+
+class TestDaemon(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.failing = False
+
+    async def set_disabled(self, node_id, disabled):
+        if self.failing:
+            raise RuntimeError("pw-metadata failed")
+        self.calls.append((node_id, disabled))
+
+    def switcher(self, **device_map):
+        return SmartFilterSwitcher(
+            device_map or {SPEAKER: "Think", HEADPHONES: "Headphones"},
+            self.set_disabled,
+        )
+
+    def test_replay(self):
+        switcher = self.switcher()
+
+        async def run():
+            return [await switcher.handle(update) for update in recorded_updates()]
+
+        switches = asyncio.run(run())
+
+        # Enabled for the speakers, untouched while nodes come and go, then
+        # disabled when the headphones, which have no filter running, become
+        # the default sink.
+        self.assertEqual(
+            switches,
+            [[Switch("Think", 71, False)], [], [], [Switch("Think", 71, True)]],
+        )
+        self.assertEqual(self.calls, [(71, False), (71, True)])
+
+    def test_run(self):
+        asyncio.run(self.switcher().run(replay(recorded_updates())))
+
+        self.assertEqual(self.calls, [(71, False), (71, True)])
+
+    def test_metadata_in_effect(self):
+        switcher = self.switcher()
+        first, *_ = recorded_updates()
+
+        asyncio.run(switcher.handle(first + [filters_metadata(71, "false")]))
+
+        self.assertEqual(self.calls, [])
+
+    def test_metadata_changed_behind(self):
+        switcher = self.switcher()
+        first, *_ = recorded_updates()
+
+        async def run():
+            return [
+                await switcher.handle(update)
+                for update in (
+                    first,
+                    # PipeWire reports the write.
+                    [filters_metadata(71, "false")],
+                    # Something else disables the filter.
+                    [filters_metadata(71, "true")],
+                )
+            ]
+
+        self.assertEqual(
+            asyncio.run(run()),
+            [[Switch("Think", 71, False)], [], [Switch("Think", 71, False)]],
+        )
+
+    def test_node_id_reused(self):
+        switcher = self.switcher()
+        first, *_ = recorded_updates()
+        think = next(obj for obj in first if obj["id"] == 71)
+
+        async def run():
+            return [
+                await switcher.handle(update)
+                for update in (
+                    first,
+                    # The chain restarts with the same id and no metadata.
+                    [{"id": 71, "info": None}],
+                    [think],
+                )
+            ]
+
+        self.assertEqual(
+            asyncio.run(run()),
+            [[Switch("Think", 71, False)], [], [Switch("Think", 71, False)]],
+        )
+
+    def test_retry_after_failure(self):
+        switcher = self.switcher()
+        first, second, *_ = recorded_updates()
+
+        self.failing = True
+        self.assertEqual(asyncio.run(switcher.handle(first)), [])
+
+        self.failing = False
+        asyncio.run(switcher.handle(second))
+        self.assertEqual(self.calls, [(71, False)])
+
+    def test_split_stages(self):
+        switcher = self.switcher()
+        first, *_ = recorded_updates()
+        stage = {
+            "id": 90,
+            "type": "PipeWire:Interface:Node",
+            "info": {
+                "props": {
+                    "node.name": "input.think_stage_2",
+                    "media.class": "Audio/Sink",
+                }
+            },
+        }
+
+        switches = asyncio.run(switcher.handle(first + [stage]))
+
+        self.assertEqual(
+            switches, [Switch("Think", 71, False), Switch("Think", 90, False)]
+        )
+
+    def test_pw_metadata(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log = os.path.join(tmp, "log")
+            pw_metadata = os.path.join(tmp, "pw-metadata")
+            with open(pw_metadata, "w") as f:
+                f.write(f'#!/bin/sh\nprintf "%s\\n" "$*" >> "{log}"\n')
+            os.chmod(pw_metadata, os.stat(pw_metadata).st_mode | stat.S_IEXEC)
+
+            asyncio.run(pw_metadata_set_disabled(71, True, pw_metadata))
+
+            with open(log) as f:
+                self.assertEqual(
+                    f.read(),
+                    "-n filters 71 filter.smart.disabled true Spa:String:JSON\n",
+                )
+
+    def test_main_dry_run(self):
+        stderr = io.StringIO()
+
+        with contextlib.redirect_stderr(stderr):
+            main(["--pw-dump", PW_DUMP_MONITOR, "--dry-run", "-m", f"{SPEAKER}=Think"])
+
+        self.assertEqual(
+            [line.split(" in ")[0] for line in stderr.getvalue().splitlines()],
+            [
+                f"enabled Think (node 71) for {SPEAKER}",
+                f"disabled Think (node 71) for {HEADPHONES}",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
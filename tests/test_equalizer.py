@@ -0,0 +1,94 @@
+from ee2pw.cost import node_cost
+from ee2pw.equalizer import parse_equalizer
+
+import unittest
+
+
+def band(**settings):
+    return {
+        "type": "Bell",
+        "mode": "RLC (BT)",
+        "slope": "x1",
+        "solo": False,
+        "mute": False,
+        "frequency": 1000.0,
+        "q": 4.36,
+        "width": 4.0,
+        "gain": 0.0,
+        **settings,
+    }
+
+
+class TestEqualizer(unittest.TestCase):
+    def setUp(self):
+        self.config = {
+            "bypass": False,
+            "input-gain": 0.0,
+            "output-gain": -6.0,
+            "mode": "IIR",
+            "num-bands": 10,
+            "split-channels": False,
+            "balance": 0.0,
+            "pitch-left": 0.0,
+            "pitch-right": 0.0,
+            "left": {f"band{i}": band(frequency=30.0 * 2**i) for i in range(32)},
+            "right": {f"band{i}": band(gain=3.0) for i in range(32)},
+        }
+        self.config["left"]["band1"] = band(
+            type="Hi-shelf", mode="BWC (MT)", slope="x2", gain=-6.0, mute=True
+        )
+
+    def test_stereo(self):
+        node = parse_equalizer(self.config, "equalizer_0")
+
+        self.assertEqual(
+            node.plugin, "http://lsp-plug.in/plugins/lv2/para_equalizer_x16_stereo"
+        )
+        self.assertEqual(node.control["enabled"], 1.0)
+        self.assertEqual(node.control["g_out"], 0.501187)
+        self.assertEqual(node.control["f_0"], 30.0)
+        self.assertEqual(
+            [node.control[f"{port}_1"] for port in ("ft", "fm", "s", "xm", "g")],
+            [3.0, 3.0, 1.0, 1.0, 0.501187],
+        )
+        self.assertEqual(node.control["ft_9"], 1.0)
+
+        # Bands past num-bands are turned off, never emitted as nodes.
+        for i in range(10, 16):
+            self.assertEqual(node.control[f"ft_{i}"], 0.0)
+            self.assertNotIn(f"f_{i}", node.control)
+        self.assertNotIn("ft_16", node.control)
+        self.assertFalse(any(port.startswith("ftl_") for port in node.control))
+
+    def test_split_channels(self):
+        node = parse_equalizer(
+            {**self.config, "split-channels": True, "num-bands": 32}, "equalizer_0"
+        )
+
+        self.assertEqual(
+            node.plugin, "http://lsp-plug.in/plugins/lv2/para_equalizer_x32_lr"
+        )
+        self.assertEqual(node.control["ftl_1"], 3.0)
+        self.assertEqual(node.control["gl_0"], 1.0)
+        self.assertEqual(node.control["ftr_1"], 1.0)
+        self.assertEqual(node.control["gr_0"], 1.412538)
+        self.assertNotIn("ft_0", node.control)
+
+        # Splitting the same bands over both channels costs the same.
+        mirrored = {**self.config, "right": self.config["left"]}
+        self.assertEqual(
+            node_cost(parse_equalizer({**mirrored, "split-channels": True}, "eq")),
+            node_cost(parse_equalizer(mirrored, "eq")),
+        )
+
+    def test_pitch(self):
+        node = parse_equalizer({**self.config, "pitch-right": 2.0}, "equalizer_0")
+
+        self.assertTrue(node.plugin.endswith("_x16_lr"))
+        self.assertEqual((node.control["frqs_l"], node.control["frqs_r"]), (0.0, 2.0))
+        # Without split channels both sides use the left bands.
+        self.assertEqual(node.control["ftr_1"], 3.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+from ee2pw.core import build_chain, parse_chain
+from ee2pw.ir import FilterChain, Link, Node, Port, as_node
+from ee2pw.links import create_inputs, create_links, create_outputs
+from ee2pw.util import load_config
+
+import unittest
+
+
+class TestIR(unittest.TestCase):
+    def setUp(self):
+        self.config = load_config("tests/data/Think.json")
+
+    def test_parse_chain(self):
+        nodes = parse_chain(self.config)
+
+        self.assertTrue(all(isinstance(node, Node) for node in nodes))
+        self.assertEqual(nodes[0].name, "filter_0")
+        self.assertEqual(
+            nodes[0].plugin, "http://lsp-plug.in/plugins/lv2/filter_stereo"
+        )
+        self.assertEqual(
+            list(nodes[0].to_dict()), ["type", "name", "plugin", "control"]
+        )
+
+    def test_serial_matches_links(self):
+        chain = build_chain(self.config)
+        names = [node.name for node in chain.nodes]
+        graph = chain.to_dict()
+
+        self.assertEqual(graph["links"], create_links(names))
+        self.assertEqual(graph["inputs"], create_inputs(names))
+        self.assertEqual(graph["outputs"], create_outputs(names))
+        self.assertEqual(
+            chain.links[0],
+            Link(Port("filter_0", "out_l"), Port("bass_enhancer_0", "in_l")),
+        )
+
+    def test_interned_ports(self):
+        a, b = Node("lv2", "x_0").port("in_l"), Port("".join(["x_", "0"]), "in_l")
+
+        self.assertIs(a.node, b.node)
+        self.assertEqual(a, b)
+        self.assertEqual(str(a), "x_0:in_l")
+
+    def test_passthrough(self):
+        chain = FilterChain.passthrough(["copy_l", "copy_r"])
+
+        self.assertEqual(
+            chain.to_dict()["nodes"],
+            [
+                {"type": "builtin", "name": "copy_l", "label": "copy"},
+                {"type": "builtin", "name": "copy_r", "label": "copy"},
+            ],
+        )
+
+    def test_as_node(self):
+        data = {
+            "type": "ladspa",
+            "name": "echo_0",
+            "plugin": "echo",
+            "label": "echo_mono",
+            "control": {"time": 1.0},
+            "config": {"mode": 1},
+        }
+
+        node = as_node(data)
+
+        self.assertEqual(node.extra, {"config": {"mode": 1}})
+        self.assertEqual(node.to_dict(), data)
+        self.assertIsNone(as_node({}))
+        self.assertIs(as_node(node), node)
+
+
+if __name__ == "__main__":
+    unittest.main()
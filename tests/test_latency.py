@@ -0,0 +1,71 @@
+from ee2pw.core import build
+from ee2pw.latency import apply_latency_budget, node_latency
+from ee2pw.limiter import parse_limiter
+from ee2pw.multiband_compressor import parse_multiband_compressor
+from ee2pw.util import load_config
+
+import unittest
+
+
+class TestLatency(unittest.TestCase):
+    def setUp(self):
+        self.config = load_config("tests/data/Think.json")
+        self.output = self.config["output"]
+
+    def nodes(self):
+        return [
+            parse_limiter({**self.output["limiter#0"], **limiter}, f"limiter_{i}")
+            for i, limiter in enumerate(
+                (
+                    {"lookahead": 5.0, "oversampling": "Half x2/16 bit"},
+                    {"lookahead": 1.0},
+                )
+            )
+        ] + [
+            parse_multiband_compressor(
+                {
+                    **self.output["multiband_compressor#0"],
+                    "compressor-mode": "Linear Phase",
+                },
+                "multiband_compressor_0",
+            )
+        ]
+
+    def test_node_latency(self):
+        limiter, _, compressor = self.nodes()
+
+        self.assertEqual(node_latency(limiter).samples, 240 + 8)
+        self.assertEqual(node_latency(limiter, 44100).samples, 221 + 8)
+        self.assertEqual(node_latency(compressor).sources, [("linear phase", 4096)])
+
+    def test_report_only(self):
+        report = {}
+        result = build(self.config, "Think", latency=True, report=report)
+
+        self.assertGreater(report["latency"].total_samples, 0)
+        # node.latency would request a quantum, not describe the plugin delay.
+        self.assertEqual(result, build(self.config, "Think"))
+
+    def test_budget_fail(self):
+        with self.assertRaises(ValueError):
+            apply_latency_budget(self.nodes(), max_latency=10.0)
+
+        report = apply_latency_budget(self.nodes(), max_latency=100.0)
+        self.assertEqual(report.total_samples, 248 + 48 + 4096)
+        self.assertEqual(report.downgrades, [])
+
+    def test_budget_downgrade(self):
+        nodes = self.nodes()
+
+        report = apply_latency_budget(nodes, max_latency=5.5, policy="downgrade")
+
+        self.assertEqual(nodes[2].control["mode"], 1.0)
+        self.assertEqual(nodes[0].control["ovs"], 0.0)
+        self.assertEqual(nodes[0].control["lk"], 4.5)
+        self.assertEqual(nodes[1].control["lk"], 1.0)
+        self.assertEqual(report.total_samples, 264)
+        self.assertEqual(len(report.downgrades), 3)
+
+    def test_budget_downgrade_not_enough(self):
+        with self.assertRaises(ValueError):
+            apply_latency_budget(self.nodes(), max_latency=0.1, policy="downgrade")
@@ -0,0 +1,165 @@
+from ee2pw.convert import ConversionOptions, convert_config
+from ee2pw.core import build
+from ee2pw.lv2_index import LV2Index, scan_bundle, shared_index, validate_config
+from ee2pw.turtle import RDF_TYPE, parse
+from ee2pw.util import load_config
+
+import os, shutil, tempfile, unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+LV2_DIR = "tests/data/lv2"
+LIMITER_URI = "http://lsp-plug.in/plugins/lv2/sc_limiter_stereo"
+
+
+class TestLV2Index(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+        self.lv2 = os.path.join(self.tmp, "lv2")
+        shutil.copytree(LV2_DIR, self.lv2)
+        self.bundle = os.path.join(self.lv2, "lsp-plugins.lv2")
+        self.index_path = os.path.join(self.tmp, "index.json")
+
+        config = load_config("tests/data/Think.json")
+        config["output"]["plugins_order"] = ["limiter#0"]
+        self.result = build(config, "Think")
+
+    def index(self):
+        index = LV2Index([self.lv2, os.path.join(self.tmp, "missing")], self.index_path)
+        return index, index.refresh()
+
+    def test_turtle(self):
+        graph = parse(
+            "@prefix ex: <http://example.org/> .\n"
+            "PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>\n"
+            '<a> a ex:Thing, ex:Other ; ex:n -1.5e1 ; ex:s "x\\"y"@en ;;\n'
+            '  ex:list (1 2) ; ex:b [ ex:i 3 ] ; rdfs:label """two\nlines""" .\n'
+            "[] ex:flag true .",
+            "file:///base/",
+        )
+        subject = graph["file:///base/a"]
+
+        self.assertEqual(
+            subject[RDF_TYPE], ["http://example.org/Thing", "http://example.org/Other"]
+        )
+        self.assertEqual(subject["http://example.org/n"], [-15.0])
+        self.assertEqual(subject["http://example.org/s"], ['x"y'])
+        self.assertEqual(subject["http://example.org/list"], [[1, 2]])
+        (blank,) = subject["http://example.org/b"]
+        self.assertEqual(graph[blank]["http://example.org/i"], [3])
+
+    def test_scan_bundle(self):
+        ports = scan_bundle(self.bundle)[LIMITER_URI]
+
+        self.assertEqual(ports["lk"].kind, "control")
+        self.assertEqual((ports["lk"].minimum, ports["lk"].default), (0.1, 5.0))
+        self.assertFalse(ports["out_l"].input)
+        self.assertFalse(ports["grl"].input)
+
+    def test_validate(self):
+        index, _ = self.index()
+        self.assertTrue(validate_config(self.result, index).ok)
+
+        graph = self.result["context.modules"][0]["args"]["filter.graph"]
+        graph["nodes"][0]["control"]["alr_att"] = 5.0
+        graph["nodes"][0]["control"]["grl"] = 1.0
+        graph["nodes"][0]["control"]["lk"] = 50.0
+        graph["outputs"] = ["limiter_0:out_x", "limiter_0:in_r"]
+
+        report = validate_config(self.result, index)
+        self.assertEqual(
+            report.errors,
+            [
+                f"limiter_0: {LIMITER_URI} has no port alr_att",
+                "limiter_0: grl is not a control input",
+                "limiter_0: out_x is not an audio output",
+                "limiter_0: in_r is not an audio output",
+            ],
+        )
+        self.assertEqual(report.warnings, ["limiter_0: lk = 50 outside 0.1 .. 20.0"])
+
+        graph["nodes"][0]["plugin"] = LIMITER_URI + "_x"
+        self.assertEqual(len(validate_config(self.result, index).errors), 1)
+
+    def test_sparse_installed_defaults(self):
+        ttl = os.path.join(self.bundle, "sc_limiter_stereo.ttl")
+        with open(ttl) as f:
+            text = f.read()
+        # An installed version whose attack defaults to the preset's 2 ms.
+        attack = '"at" ;\n\t\tlv2:name "Attack time" ;\n'
+        with open(ttl, "w") as f:
+            f.write(text.replace(attack, attack + "\t\tlv2:default 2.0 ;\n"))
+
+        config = load_config("tests/data/Think.json")
+        config["output"]["plugins_order"] = ["limiter#0"]
+        options = ConversionOptions("Think", sparse=True, validate=True)
+        env = {"LV2_PATH": self.lv2, "XDG_CACHE_HOME": self.tmp}
+
+        with (
+            mock.patch.dict(os.environ, env),
+            mock.patch("ee2pw.lv2_index._shared", None),
+        ):
+            result = convert_config(config, options)
+
+        def limiter_control(result):
+            return result["context.modules"][0]["args"]["filter.graph"]["nodes"][0][
+                "control"
+            ]
+
+        self.assertNotIn("at", limiter_control(result))
+        self.assertIn("at", limiter_control(build(config, "Think", sparse=True)))
+
+    def test_cache_invalidation(self):
+        self.assertEqual(self.index()[1], 1)
+        self.assertEqual(self.index()[1], 0)
+
+        # A new manifest invalidates the bundle.
+        manifest = os.path.join(self.bundle, "manifest.ttl")
+        os.utime(manifest, ns=(0, 10**18))
+        index, scanned = self.index()
+        self.assertEqual(scanned, 1)
+        self.assertIsNotNone(index.ports(LIMITER_URI))
+
+        shutil.rmtree(self.bundle)
+        index, scanned = self.index()
+        self.assertEqual((scanned, index.plugins), (0, {}))
+
+    def test_concurrent_refresh(self):
+        index, _ = self.index()
+        manifest = os.path.join(self.bundle, "manifest.ttl")
+
+        def validate(i):
+            # Every other call rebuilds the plugin table.
+            if i % 2:
+                os.utime(manifest, ns=(0, 10**18 + i))
+            index.refresh()
+            return validate_config(self.result, index).ok
+
+        with ThreadPoolExecutor(8) as pool:
+            self.assertTrue(all(pool.map(validate, range(64))))
+
+        env = {"LV2_PATH": self.lv2, "XDG_CACHE_HOME": self.tmp}
+        with (
+            mock.patch.dict(os.environ, env),
+            mock.patch("ee2pw.lv2_index._shared", None),
+            ThreadPoolExecutor(8) as pool,
+        ):
+            indexes = set(pool.map(lambda _: id(shared_index()), range(16)))
+        self.assertEqual(len(indexes), 1)
+
+    def test_invalid_bundle(self):
+        broken = os.path.join(self.lv2, "broken.lv2")
+        os.mkdir(broken)
+        with open(os.path.join(broken, "manifest.ttl"), "w") as f:
+            f.write("<a> <b> .")
+
+        index, _ = self.index()
+
+        self.assertEqual(list(index.errors), [os.path.abspath(broken)])
+        self.assertIsNotNone(index.ports(LIMITER_URI))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -29,3 +29,40 @@ class TestLv2Wrapper(unittest.TestCase):
         self.assertEqual(
             expected_default_inverted, parse_bool(config, "nonexistent_key", True, True)
         )
+
+    def test_compile_controls(self):
+        convert = compile_controls(
+            (
+                Control("enabled", "bypass", INVERTED_BOOL, False),
+                Control("g_in", "input-gain", FLOAT_DB, 0.0),
+                Control("g_out", "output-gain", FLOAT_DB, 0.0),
+                Control("lk", "lookahead", FLOAT, 5.0),
+                Control("mode", "mode", ENUM, "A", {"A": 0.0, "B": 1.0}, 2.0),
+            )
+        )
+
+        config = {
+            "bypass": True,
+            "input-gain": -6.0,
+            "output-gain": -120.0,
+            "mode": "C",
+        }
+
+        self.assertEqual(
+            convert(config),
+            {
+                "enabled": parse_bool(config, "bypass", False, True),
+                "g_in": parse_float_db(config, "input-gain", 0.0),
+                "g_out": 0.0,
+                "lk": 5.0,
+                "mode": 2.0,
+            },
+        )
+        self.assertEqual(
+            list(convert(config)), ["enabled", "g_in", "g_out", "lk", "mode"]
+        )
+        self.assertEqual(convert(config)["g_in"], 0.501187)
+
+    def test_compile_controls_invalid_kind(self):
+        with self.assertRaises(ValueError):
+            compile_controls((Control("x", "x", "unknown", 0.0),))
@@ -0,0 +1,139 @@
+from ee2pw.core import build
+from ee2pw.util import load_config
+
+import unittest
+
+
+def graph(config, optimize=True, report=None):
+    result = build(config, "Think", optimize=optimize, report=report)
+    return result["context.modules"][0]["args"]["filter.graph"]
+
+
+class TestOptimizer(unittest.TestCase):
+    def setUp(self):
+        self.config = load_config("tests/data/Think.json")
+        self.output = self.config["output"]
+
+    def test_unchanged(self):
+        report = {}
+
+        self.assertEqual(graph(self.config, False), graph(self.config, True, report))
+        self.assertEqual(report["optimizer"].changes, [])
+
+    def test_remove_bypassed(self):
+        self.output["filter#0"]["bypass"] = True
+        self.output["bass_enhancer#0"]["bypass"] = True
+        report = {}
+
+        optimized = graph(self.config, report=report)
+
+        self.assertEqual(
+            [node["name"] for node in optimized["nodes"]],
+            ["multiband_compressor_0", "stereo_tools_0", "limiter_0"],
+        )
+        self.assertEqual(
+            optimized["inputs"],
+            ["multiband_compressor_0:in_l", "multiband_compressor_0:in_r"],
+        )
+        self.assertEqual(len(optimized["links"]), 4)
+        # x3 slope filter (0.5 + 3 * 0.5) and bass enhancer (1.5)
+        self.assertEqual(report["optimizer"].saved_cost, 3.5)
+
+    def test_fold_gain(self):
+        self.output["stereo_tools#0"] = {"input-gain": -6.0, "output-gain": 0.0}
+
+        optimized = graph(self.config)
+        nodes = {node["name"]: node for node in optimized["nodes"]}
+
+        self.assertNotIn("stereo_tools_0", nodes)
+        self.assertEqual(
+            nodes["multiband_compressor_0"]["control"]["g_out"],
+            graph(self.config, False)["nodes"][3]["control"]["level_in"],
+        )
+        self.assertIn(
+            {"output": "multiband_compressor_0:out_l", "input": "limiter_0:in_l"},
+            optimized["links"],
+        )
+
+    def test_empty_chain_passthrough(self):
+        empty = graph(load_config("extras/presets/Nothing.json"), False)
+
+        self.assertEqual([node["label"] for node in empty["nodes"]], ["copy", "copy"])
+        self.assertEqual(empty["links"], [])
+        self.assertEqual(empty["inputs"], ["copy_l:In", "copy_r:In"])
+        self.assertEqual(empty["outputs"], ["copy_l:Out", "copy_r:Out"])
+
+
+class TestFuseFilters(unittest.TestCase):
+    def setUp(self):
+        config = load_config("tests/data/Think.json")
+        self.filter = config["output"]["filter#0"]
+
+    def chain(self, *filters):
+        output = {"plugins_order": []}
+        for i, ee_config in enumerate(filters):
+            output["plugins_order"].append(f"filter#{i}")
+            output[f"filter#{i}"] = {**self.filter, **ee_config}
+        return {"output": output}
+
+    def fused(self, config, report=None):
+        result = build(config, "Think", fuse_filters=True, report=report)
+        return result["context.modules"][0]["args"]["filter.graph"]
+
+    def test_fuse(self):
+        config = self.chain(
+            {"type": "Bell", "gain": 3.0, "input-gain": -6.0},
+            {"type": "Hi-pass", "frequency": 30.0, "output-gain": -6.0},
+            {"type": "Lo-shelf", "slope": "x4"},
+        )
+        separate = graph(config, False)["nodes"]
+        report = {}
+
+        fused = self.fused(config, report)
+        nodes = fused["nodes"]
+
+        self.assertEqual(len(nodes), 1)
+        self.assertEqual(
+            nodes[0]["plugin"],
+            "http://lsp-plug.in/plugins/lv2/para_equalizer_x8_stereo",
+        )
+        self.assertEqual(fused["inputs"], ["filter_0:in_l", "filter_0:in_r"])
+
+        control = nodes[0]["control"]
+        self.assertEqual(
+            [control[f"ft_{i}"] for i in range(8)],
+            [1.0, 2.0, 5.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+        )
+        self.assertEqual(control["f_1"], 30.0)
+        self.assertEqual(control["g_0"], separate[0]["control"]["g"])
+        self.assertEqual(control["s_2"], 3.0)
+        self.assertEqual(control["g_in"], separate[0]["control"]["g_in"])
+        self.assertEqual(control["g_out"], separate[1]["control"]["g_out"])
+        self.assertEqual(
+            [change.name for change in report["fusion"].changes],
+            ["filter_1", "filter_2"],
+        )
+        self.assertEqual(report["fusion"].saved_cost, 1.0)
+
+    def test_fall_back(self):
+        config = self.chain(
+            {"equal-mode": "IIR"},
+            {"equal-mode": "FIR"},
+            {"equal-mode": "FIR", "slope": "x8"},
+            {"equal-mode": "FIR", "balance": 10.0},
+            {"equal-mode": "FIR", "bypass": True},
+        )
+
+        self.assertEqual(self.fused(config), graph(config, False))
+
+    def test_split_long_runs(self):
+        config = self.chain(*({"frequency": 100.0 + i} for i in range(40)))
+
+        nodes = self.fused(config)["nodes"]
+
+        self.assertEqual(
+            [node["plugin"].rpartition("/")[2] for node in nodes],
+            ["para_equalizer_x32_stereo", "para_equalizer_x8_stereo"],
+        )
+        self.assertEqual(nodes[1]["name"], "filter_32")
+        self.assertEqual(nodes[1]["control"]["f_7"], 139.0)
@@ -0,0 +1,74 @@
+from ee2pw.apply import find_filter_chain
+from ee2pw.pipewire import PwDumpIndex, iter_pw_dump, load_pw_dump, main
+
+import unittest, io
+from contextlib import redirect_stdout
+
+PW_DUMP = "tests/data/pipewire/pw-dump.json"
+PW_DUMP_MONITOR = "tests/data/pipewire/pw-dump-monitor.json"
+
+
+class TestPwDumpIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = PwDumpIndex.load(PW_DUMP)
+
+    def test_lookup(self):
+        self.assertEqual(self.index.node_id("output.think"), 72)
+        self.assertIsNone(self.index.node_id("output.other"))
+        self.assertEqual(
+            [node["id"] for node in self.index.nodes("Audio/Sink")], [58, 71]
+        )
+        self.assertEqual(
+            [node["id"] for node in self.index.filter_chain("Think")], [71, 72]
+        )
+        self.assertEqual(self.index.metadata()["id"], 32)
+
+    def test_find_filter_chain(self):
+        node_id, controls = find_filter_chain(self.index, "Think")
+
+        self.assertEqual(node_id, 71)
+        self.assertEqual(controls["filter_0:f"], 100.0)
+
+    def test_monitor_updates(self):
+        with open(PW_DUMP_MONITOR) as f:
+            updates = list(iter_pw_dump(f))
+
+        self.assertEqual(len(updates), 4)
+        self.assertEqual(updates[0], load_pw_dump(PW_DUMP))
+
+        index = PwDumpIndex()
+        self.assertTrue(index.update(updates[0]))
+        self.assertFalse(index.update(updates[0]))
+        self.assertEqual(index.generation, 1)
+
+        index.update(updates[1])
+        self.assertEqual(
+            index.node_id("alsa_output.usb-Headphones-00.analog-stereo"), 90
+        )
+
+        index.update(updates[2])
+        self.assertIsNone(index.node_id("Firefox"))
+        self.assertEqual(index.node("output.think")["info"]["state"], "idle")
+        self.assertEqual(
+            index.node("output.think")["info"]["props"]["node.link-group"],
+            "filter-chain-1201-24",
+        )
+
+        index.update(updates[3])
+        self.assertEqual(
+            index.metadata()["metadata"][0]["value"]["name"],
+            "alsa_output.usb-Headphones-00.analog-stereo",
+        )
+        self.assertEqual(index.generation, 4)
+
+    def test_truncated(self):
+        with self.assertRaises(ValueError):
+            list(iter_pw_dump(io.StringIO('[\n  {"id": 1}\n')))
+
+    def test_main(self):
+        out = io.StringIO()
+        with redirect_stdout(out):
+            status = main(["--pw-dump", PW_DUMP, "--id", "input.think", "--id", "Nope"])
+
+        self.assertEqual(status, 1)
+        self.assertEqual(out.getvalue(), "71\n")
@@ -0,0 +1,95 @@
+from ee2pw.core import builder
+from ee2pw.profile import config_chains, parse_pw_top, profile
+
+import contextlib, io, json, os, tempfile, unittest
+
+PW_TOP = "tests/data/pipewire/pw-top-batch.txt"
+
+
+class TestProfile(unittest.TestCase):
+    def setUp(self):
+        with open(PW_TOP, "r") as f:
+            self.samples = parse_pw_top(f)
+
+    def test_parse_pw_top(self):
+        self.assertEqual(len(self.samples), 3)
+        self.assertEqual(
+            [row.name for row in self.samples[1]],
+            [
+                "Dummy-Driver",
+                "alsa_output.pci-0000_73_00.6.HiFi__Speaker__sink",
+                "input.think",
+                "output.think",
+                "Firefox",
+            ],
+        )
+
+        inactive, driver, capture = self.samples[0][2], *self.samples[2][1:3]
+        self.assertIsNone(inactive.busy)
+        self.assertIsNone(inactive.busy_quantum)
+        self.assertEqual(capture.busy, 2300.0)
+        self.assertEqual(capture.busy_quantum, 0.11)
+        self.assertEqual(capture.errors, 2)
+        # Followers run within the quantum of their driver.
+        self.assertAlmostEqual(driver.quantum or 0.0, 1e6 * 1024 / 48000)
+        self.assertEqual(capture.quantum, driver.quantum)
+
+        with self.assertRaises(ValueError):
+            parse_pw_top(["R   71      0"])
+
+    def test_profile(self):
+        chains = config_chains(builder("tests/data/Think.json", "think"))
+        self.assertEqual(chains[0].nodes, ["input.think", "output.think"])
+
+        (result,) = profile(self.samples[1:], chains)
+        self.assertEqual(result.busy, [1920.5, 2319.7])
+        self.assertAlmostEqual(result.utilisation[1], 2319.7 * 48000 / 1024e6)
+        self.assertEqual(result.errors, 2)
+
+        shares = dict((plugin.name, share) for plugin, share in result.plugin_shares())
+        self.assertAlmostEqual(sum(shares.values()), 1.0)
+        self.assertEqual(max(shares, key=shares.__getitem__), "multiband_compressor_0")
+
+    def test_split_stages(self):
+        chains = config_chains(builder("tests/data/Think.json", "think", split=2))
+        self.assertEqual(len(chains), 2)
+
+        # Only the first stage shows up in this capture.
+        profiles = profile(self.samples, chains)
+        self.assertEqual(len(profiles[0].busy), 2)
+        self.assertEqual(profiles[1].busy, [])
+        self.assertIn("not running", profiles[1].format())
+
+    def test_main(self):
+        from ee2pw.profile import main
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with tempfile.TemporaryDirectory() as tmp:
+            config = os.path.join(tmp, "think.json")
+            with open(config, "w") as f:
+                json.dump(builder("tests/data/Think.json", "think"), f)
+
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                self.assertEqual(main([PW_TOP, "-c", config]), 0)
+
+        self.assertEqual(stderr.getvalue(), "2 samples\n")
+        self.assertIn("multiband_compressor_0", stdout.getvalue())
+
+    def test_main_conf(self):
+        from ee2pw.convert import dump
+        from ee2pw.profile import main
+
+        stderr = io.StringIO()
+        with tempfile.TemporaryDirectory() as tmp:
+            config = os.path.join(tmp, "think.conf")
+            with open(config, "w") as f:
+                dump(builder("tests/data/Think.json", "think"), f, "conf")
+
+            with contextlib.redirect_stderr(stderr), self.assertRaises(SystemExit):
+                main([PW_TOP, "-c", config])
+
+        self.assertIn("think.conf: not a JSON config", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+from ee2pw import registry
+from ee2pw.core import build
+from ee2pw.registry import get_parser, plugin_base_name, register_parser
+
+import unittest, warnings
+from unittest import mock
+
+
+def parse_echo(ee_config, pw_node_name):
+    return {
+        "type": "lv2",
+        "name": pw_node_name,
+        "plugin": "urn:test:echo",
+        "control": {"time": float(ee_config.get("time", 0.0))},
+    }
+
+
+class TestRegistry(unittest.TestCase):
+    def test_plugin_base_name(self):
+        self.assertEqual(
+            plugin_base_name("multiband_compressor#0"), "multiband_compressor"
+        )
+        self.assertEqual(
+            plugin_base_name("multiband_compressor_12"), "multiband_compressor"
+        )
+        self.assertEqual(plugin_base_name("stereo_tools"), "stereo_tools")
+
+    def test_builtin_parser(self):
+        from ee2pw.limiter import parse_limiter
+
+        self.assertIs(get_parser("limiter"), parse_limiter)
+        self.assertIsNone(get_parser("no_such_plugin"))
+
+    def test_register_parser(self):
+        # Keep the registration out of the tests that run after this one.
+        for patcher in (
+            mock.patch.dict(registry._targets),
+            mock.patch.dict(registry._parsers),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        register_parser("test_echo", "test_registry:parse_echo")
+
+        config = {
+            "output": {
+                "plugins_order": ["test_echo#0", "unknown#0"],
+                "test_echo#0": {"time": 3},
+                "unknown#0": {},
+            }
+        }
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            graph = build(config, "Test")["context.modules"][0]["args"]["filter.graph"]
+
+        self.assertEqual(len(caught), 1)
+        self.assertEqual([node["name"] for node in graph["nodes"]], ["test_echo_0"])
+        self.assertEqual(graph["nodes"][0]["control"], {"time": 3.0})
+        self.assertEqual(graph["links"], [])
+        self.assertEqual(graph["outputs"], ["test_echo_0:out_l", "test_echo_0:out_r"])
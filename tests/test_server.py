@@ -0,0 +1,156 @@
+from ee2pw.client import main as client_main, request
+from ee2pw.convert import serialize
+from ee2pw.core import builder
+from ee2pw.server import ConversionServer, handle_request
+
+import asyncio, contextlib, io, json, os, shutil, socket, tempfile, unittest
+from unittest import mock
+
+PRESET = os.path.abspath("tests/data/Think.json")
+
+
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.socket_path = os.path.join(self.tmp, "ee2pw.sock")
+
+    def serve(self, client):
+        """
+        Run ``client`` in a thread against a server running in this one.
+        """
+
+        async def run():
+            server = ConversionServer(self.socket_path, jobs=2)
+            await server.start()
+            try:
+                return await asyncio.to_thread(client)
+            finally:
+                await server.close()
+
+        return asyncio.run(run())
+
+    def test_handle_request(self):
+        response = handle_request({"id": 1, "preset": PRESET, "name": "Think"})
+
+        self.assertEqual(response["id"], 1)
+        self.assertTrue(response["ok"])
+        self.assertEqual(response["text"], serialize(builder(PRESET, "Think")))
+
+        for message in (
+            {"preset": "tests/data/Think.json"},
+            {"preset": PRESET, "unknown": True},
+            {"name": "Think"},
+        ):
+            response = handle_request(message)
+            self.assertFalse(response["ok"], message)
+            self.assertIn("Error", response["error"])
+
+    def test_round_trip(self):
+        output = os.path.join(self.tmp, "think.conf")
+        with open(PRESET) as f:
+            config = json.load(f)
+
+        def client():
+            return (
+                request(
+                    {"config": config, "name": "Think", "target": "dev"},
+                    self.socket_path,
+                ),
+                request(
+                    {"preset": PRESET, "output": output, "format": "conf"},
+                    self.socket_path,
+                ),
+                request(
+                    {"preset": PRESET, "output": output, "format": "conf"},
+                    self.socket_path,
+                ),
+            )
+
+        inline, written, unchanged = self.serve(client)
+
+        self.assertEqual(inline["text"], serialize(builder(PRESET, "Think", "dev")))
+        self.assertEqual((written["changed"], unchanged["changed"]), (True, False))
+        with open(output) as f:
+            self.assertEqual(f.read(), serialize(builder(PRESET, "Think"), "conf"))
+
+    def test_concurrent_requests(self):
+        def client():
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(self.socket_path)
+                for i in range(8):
+                    message = {"id": i, "preset": PRESET, "sparse": i % 2 == 0}
+                    sock.sendall(json.dumps(message).encode() + b"\n")
+                sock.sendall(b"not json\n")
+                sock.shutdown(socket.SHUT_WR)
+                with sock.makefile("rb") as f:
+                    return [json.loads(line) for line in f]
+
+        responses = self.serve(client)
+
+        self.assertEqual(sorted(r["id"] for r in responses if r["ok"]), list(range(8)))
+        self.assertEqual(
+            [r["error"][:15] for r in responses if not r["ok"]], ["invalid request"]
+        )
+
+    def test_large_requests(self):
+        with open(PRESET) as f:
+            config = json.load(f)
+        # Past the 64 KiB line limit of asyncio streams.
+        config["padding"] = "x" * 200_000
+
+        def client():
+            return request({"config": config, "name": "Think"}, self.socket_path)
+
+        self.assertTrue(self.serve(client)["ok"])
+
+        # Small enough to be sent in full before the server hangs up.
+        config["padding"] = "x" * 8192
+        with mock.patch("ee2pw.server.MAX_REQUEST_SIZE", 4096):
+            response = self.serve(client)
+        self.assertFalse(response["ok"])
+        self.assertIn("longer than 4096 bytes", response["error"])
+
+    def test_stale_socket(self):
+        with open(self.socket_path, "w"):
+            pass
+
+        with self.assertRaises(OSError):
+            self.serve(lambda: None)
+
+        os.unlink(self.socket_path)
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.socket_path)
+        stale.close()
+
+        self.assertIsNone(self.serve(lambda: None))
+
+        def second_server():
+            asyncio.run(ConversionServer(self.socket_path).start())
+
+        with self.assertRaises(OSError):
+            self.serve(second_server)
+
+    def test_client_main(self):
+        stdout, stderr = io.StringIO(), io.StringIO()
+
+        def client():
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                return client_main(
+                    [PRESET, "-n", "Think", "--sparse", "--socket", self.socket_path]
+                )
+
+        self.assertEqual(self.serve(client), 0)
+        self.assertEqual(
+            json.loads(stdout.getvalue())["context.modules"][0]["args"]["media.name"],
+            "Think",
+        )
+        self.assertIn("omitted", stderr.getvalue())
+
+        with contextlib.redirect_stderr(io.StringIO()):
+            status = client_main([PRESET, "--socket", self.socket_path])
+        self.assertEqual(status, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+from ee2pw.spa_json import dumps
+
+import unittest
+
+
+class TestSpaJson(unittest.TestCase):
+    def test_dumps_pretty(self):
+        config = {
+            "context.modules": [
+                {
+                    "name": "libpipewire-module-filter-chain",
+                    "args": {
+                        "node.description": "Internal Speaker",
+                        "inputs": ["filter_0:in_l"],
+                        "control": {"g_in": 1.0, "true": 2},
+                        "audio.position": [],
+                        "filter.smart": True,
+                        "target.object": None,
+                    },
+                }
+            ]
+        }
+
+        expected = """context.modules = [
+    {
+        name = libpipewire-module-filter-chain
+        args = {
+            node.description = "Internal Speaker"
+            inputs = [
+                "filter_0:in_l"
+            ]
+            control = {
+                g_in = 1.0
+                "true" = 2
+            }
+            audio.position = []
+            filter.smart = true
+            target.object = null
+        }
+    }
+]
+"""
+
+        self.assertEqual(dumps(config), expected)
+
+    def test_dumps_compact(self):
+        config = {"a": {"b": [1, "x y", 'q"'], "c": {}}, "d": False}
+
+        self.assertEqual(
+            dumps(config, indent=None), 'a={b=[1 "x y" "q\\""] c={}} d=false'
+        )
+
+    def test_dumps_rejects_nan(self):
+        with self.assertRaises(ValueError):
+            dumps({"a": float("nan")})
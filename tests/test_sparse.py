@@ -0,0 +1,114 @@
+from ee2pw.core import build_chain, parse_chain
+from ee2pw.equalizer import parse_equalizer
+from ee2pw.lv2_index import LV2Index, PortInfo
+from ee2pw.sparse import (
+    BAND_SUFFIX,
+    LIMITER_URI,
+    installed_defaults,
+    plugin_defaults,
+    sparse_controls,
+)
+from ee2pw.util import load_config
+
+import os, tempfile, unittest
+from unittest import mock
+
+LV2_DIR = "tests/data/lv2"
+
+
+class TestSparse(unittest.TestCase):
+    def setUp(self):
+        self.config = load_config("tests/data/Think.json")
+
+    def assertEquivalent(self, full, sparse):
+        for before, after in zip(full, sparse, strict=True):
+            defaults = plugin_defaults(before.plugin)
+            restored = {
+                port: after.control.get(port, defaults.get(BAND_SUFFIX.sub("", port)))
+                for port in before.control
+            }
+            self.assertEqual(restored, before.control, before.name)
+
+    def test_equivalent(self):
+        nodes = parse_chain(self.config)
+        report = sparse_controls(nodes)
+
+        self.assertGreater(report.omitted, 0)
+        self.assertEqual(
+            report.total, sum(len(n.control) for n in parse_chain(self.config))
+        )
+        self.assertEquivalent(parse_chain(self.config), nodes)
+
+    def node(self, name):
+        return next(node for node in parse_chain(self.config) if node.name == name)
+
+    def test_unknown_defaults_kept(self):
+        limiter = self.node("limiter_0")
+        full = dict(limiter.control)
+        sparse_controls([limiter])
+
+        self.assertNotIn("enabled", limiter.control)
+        self.assertNotIn("slink", limiter.control)
+        self.assertEqual(
+            {port: full[port] for port in limiter.control},
+            limiter.control,
+        )
+
+        # No default is assumed for the ports missing from the table.
+        compressor = self.node("multiband_compressor_0")
+        controls = set(compressor.control)
+        sparse_controls([compressor])
+        self.assertLessEqual(
+            {
+                BAND_SUFFIX.sub("", port)
+                for port in controls
+                if port not in compressor.control
+            },
+            {"enabled", "g_in", "g_out", "g_dry", "g_wet", "bs", "bm"},
+        )
+
+    def test_limiter_defaults_match_ttl(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            index = LV2Index([LV2_DIR], os.path.join(tmp, "index.json"))
+            index.refresh()
+
+        self.assertEqual(
+            plugin_defaults(LIMITER_URI), installed_defaults(LIMITER_URI, index)
+        )
+
+    def test_installed_defaults(self):
+        index = mock.Mock()
+        index.ports.return_value = {
+            "cr_0": PortInfo("control", True, 1.0, 100.0, 4.0),
+            "sla_0": PortInfo("control", True, 0.0, 20.0, 0.0),
+            "rl_0": PortInfo("control", False),
+        }
+        compressor = self.node("multiband_compressor_0")
+        compressor.control.update(cr_0=4.0, sla_0=0.0)
+
+        sparse_controls([compressor], index)
+
+        self.assertNotIn("cr_0", compressor.control)
+        self.assertNotIn("sla_0", compressor.control)
+        # The table still covers the ports the index does not declare.
+        self.assertNotIn("enabled", compressor.control)
+
+    def test_equalizer_bands(self):
+        node = parse_equalizer({"num-bands": 8}, "equalizer_0")
+        full = dict(node.control)
+        sparse_controls([node])
+
+        self.assertNotIn("xs_0", node.control)
+        self.assertNotIn("xm_7", node.control)
+        self.assertEqual(node.control["ft_0"], full["ft_0"])
+
+    def test_build_option(self):
+        report = {}
+        chain = build_chain(self.config, sparse=True, report=report)
+
+        self.assertIn("sparse", report)
+        self.assertEquivalent(build_chain(self.config).nodes, chain.nodes)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+from ee2pw.core import build, build_chain
+from ee2pw.split import partition, split_chain, stage_loop
+from ee2pw.util import load_config
+
+import unittest
+
+
+class TestSplit(unittest.TestCase):
+    def setUp(self):
+        self.config = load_config("tests/data/Think.json")
+
+    def test_partition(self):
+        self.assertEqual(partition([1.0, 1.0, 1.0, 1.0], 2), [0, 2])
+        self.assertEqual(partition([1.0, 6.0, 1.0, 2.0], 3), [0, 1, 2])
+        # A third stage would not make the heaviest one cheaper.
+        self.assertEqual(partition([8.0, 1.0, 1.0], 3), [0, 1])
+        self.assertEqual(partition([2.0], 4), [0])
+        self.assertEqual(partition([], 2), [0])
+
+    def test_split_chain(self):
+        chain = build_chain(self.config)
+        stages, report = split_chain(chain, 2, "Think")
+
+        self.assertEqual(
+            [node.name for stage in stages for node in stage.nodes],
+            [node.name for node in chain.nodes],
+        )
+        self.assertEqual(len(stages), len(report.stages))
+        self.assertEqual(report.loops, [None, None])
+        # The multiband compressor alone outweighs everything around it.
+        self.assertEqual(max(stage.total for stage in report.stages), 10.0)
+
+    def test_cascade(self):
+        report = {}
+        result = build(self.config, "Think", split=2, data_loops=2, report=report)
+        first, second = (module["args"] for module in result["context.modules"])
+
+        self.assertIn("split", report)
+        self.assertEqual(first["capture.props"]["node.name"], "input.think")
+        self.assertEqual(
+            first["playback.props"]["target.object"], "input.think_stage_2"
+        )
+        self.assertEqual(second["playback.props"]["node.name"], "output.think_stage_2")
+        self.assertEqual(first["capture.props"]["node.loop.name"], "data-loop.0")
+        self.assertEqual(second["playback.props"]["node.loop.name"], "data-loop.1")
+        # Only the first stage is offered as a sink.
+        self.assertEqual(first["capture.props"]["media.class"], "Audio/Sink")
+        self.assertEqual(second["capture.props"]["media.class"], "Stream/Input/Audio")
+        self.assertIs(second["capture.props"]["node.autoconnect"], False)
+        self.assertEqual(
+            first["filter.graph"]["outputs"],
+            ["bass_enhancer_0:out_l", "bass_enhancer_0:out_r"],
+        )
+
+    def test_data_loops(self):
+        self.assertIsNone(stage_loop(1, None))
+        self.assertEqual(stage_loop(2, 2), "data-loop.0")
+
+        # Without a loop count, PipeWire places the stages itself.
+        result = build(self.config, "Think", split=2)
+        for module in result["context.modules"]:
+            self.assertNotIn("node.loop.name", module["args"]["capture.props"])
+
+        # Fewer loops than stages: the stages share them.
+        result = build(self.config, "Think", split=2, data_loops=1)
+        self.assertEqual(
+            [
+                m["args"]["playback.props"]["node.loop.name"]
+                for m in result["context.modules"]
+            ],
+            ["data-loop.0", "data-loop.0"],
+        )
+
+    def test_smart_filter_order(self):
+        result = build(self.config, "Think", "dev", split=2)
+        first, second = (module["args"] for module in result["context.modules"])
+
+        self.assertEqual(
+            first["capture.props"]["filter.smart.before"], ["Think stage 2"]
+        )
+        self.assertEqual(second["capture.props"]["filter.smart.name"], "Think stage 2")
+        self.assertEqual(second["playback.props"]["target.object"], "dev")
+
+    def test_no_split(self):
+        self.assertEqual(
+            build(self.config, "Think", split=1), build(self.config, "Think")
+        )
+        self.assertEqual(build({}, "Nothing", split=3), build({}, "Nothing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
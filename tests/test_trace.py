@@ -0,0 +1,110 @@
+from ee2pw import trace
+from ee2pw.__main__ import main
+from ee2pw.core import build
+from ee2pw.util import load_config
+
+import unittest, io, json, os, tempfile
+from contextlib import contextmanager
+from unittest import mock
+
+
+class TestTrace(unittest.TestCase):
+    def test_disabled(self):
+        self.assertIs(trace.span("parse"), trace.span("dump", format="json"))
+
+    def test_timings(self):
+        clock = iter([0.0, 1.0, 1.5, 4.0]).__next__
+        timings = trace.Timings(clock)
+
+        with trace.hooked(timings):
+            with trace.span("build"):
+                with trace.span("parse", plugin="limiter"):
+                    pass
+
+        self.assertEqual(
+            timings.spans,
+            [
+                trace.SpanRecord("build", {}, 0.0, 4.0, 0),
+                trace.SpanRecord("parse", {"plugin": "limiter"}, 1.0, 0.5, 1),
+            ],
+        )
+        self.assertEqual(timings.stages(), {"build": 4.0, "parse": 0.5})
+        self.assertIs(trace.span("build"), trace.span("parse"))
+
+    def test_hook_around_build(self):
+        events = []
+
+        @contextmanager
+        def hook(name, attrs):
+            events.append(("start", name, attrs.get("plugin")))
+            yield
+            events.append(("end", name, attrs.get("plugin")))
+
+        with trace.hooked(hook):
+            build(load_config("tests/data/Think.json"), "Think")
+
+        self.assertEqual(
+            [plugin for event, name, plugin in events if event == "start"],
+            [
+                "filter",
+                "bass_enhancer",
+                "multiband_compressor",
+                "stereo_tools",
+                "limiter",
+                None,
+            ],
+        )
+        self.assertEqual(events[-1], ("end", "links", None))
+
+    def test_hook_sees_errors(self):
+        exited = []
+
+        @contextmanager
+        def hook(name, attrs):
+            try:
+                yield
+            finally:
+                exited.append(name)
+
+        with trace.hooked(hook), self.assertRaises(ValueError):
+            with trace.span("parse"):
+                raise ValueError
+
+        self.assertEqual(exited, ["parse"])
+
+    def test_timings_json(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            timings = os.path.join(tmp, "timings.json")
+
+            with mock.patch("sys.stderr", io.StringIO()) as stderr:
+                main(
+                    [
+                        "tests/data/Think.json",
+                        "-o",
+                        os.path.join(tmp, "think.json"),
+                        "--timings",
+                        "--timings-json",
+                        timings,
+                    ]
+                )
+
+            with open(timings) as f:
+                data = json.load(f)
+
+        self.assertIn("dump format=json", stderr.getvalue())
+        self.assertEqual(
+            [
+                span["attrs"]["plugin"]
+                for span in data["spans"]
+                if span["name"] == "parse"
+            ],
+            [
+                "filter",
+                "bass_enhancer",
+                "multiband_compressor",
+                "stereo_tools",
+                "limiter",
+            ],
+        )
+        for stage in ("read", "load_config", "build", "parse", "links", "dump"):
+            self.assertIn(stage, data["stages"])
@@ -0,0 +1,79 @@
+from ee2pw.watch import Debouncer, PollingWatcher, directory_outputs, watch
+
+import unittest, os, shutil, tempfile, threading
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestWatch(unittest.TestCase):
+    def test_debouncer(self):
+        clock = FakeClock()
+        debouncer = Debouncer(0.1, clock)
+
+        self.assertIsNone(debouncer.timeout())
+
+        debouncer.touch("a.json")
+        clock.now = 0.05
+        debouncer.touch("a.json")
+        clock.now = 0.1
+
+        self.assertEqual(debouncer.ready(), [])
+        self.assertAlmostEqual(debouncer.timeout(), 0.05)
+
+        clock.now = 0.16
+
+        self.assertEqual(debouncer.ready(), ["a.json"])
+        self.assertIsNone(debouncer.timeout())
+
+    def test_polling_watcher(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            preset = os.path.join(tmp, "Think.json")
+            shutil.copy("tests/data/Think.json", preset)
+
+            watcher = PollingWatcher(tmp, interval=0)
+
+            self.assertEqual(watcher.poll(0), [])
+
+            os.utime(preset, ns=(0, 0))
+
+            self.assertEqual(watcher.poll(0), [preset])
+
+    def test_watch(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            presets = os.path.join(tmp, "presets")
+            outputs = os.path.join(tmp, "outputs")
+            os.makedirs(presets)
+            os.makedirs(outputs)
+
+            stop = threading.Event()
+            results = []
+
+            def on_result(result):
+                results.append(result)
+                if len(results) == 1:
+                    shutil.copy(
+                        "tests/data/Think.json", os.path.join(presets, "Copy.json")
+                    )
+                else:
+                    stop.set()
+
+            shutil.copy("tests/data/Think.json", os.path.join(presets, "Think.json"))
+
+            thread = threading.Thread(
+                target=watch,
+                args=(presets, directory_outputs(outputs)),
+                kwargs={"on_result": on_result, "stop": stop, "delay": 0.01},
+            )
+            thread.start()
+            thread.join(timeout=10)
+            stop.set()
+
+            self.assertEqual(len(results), 2)
+            self.assertTrue(all(result.ok for result in results))
+            self.assertTrue(os.path.isfile(os.path.join(outputs, "Copy.json")))